@@ -0,0 +1,194 @@
+"""Bounded, instrumented cache shared by the RecipeDB, FlavorDB and LLM adapters
+
+``BoundedCache`` is an LRU bounded by entry count and, optionally, by total
+weight in bytes as measured by a caller-supplied ``weigher``. Entries carry a TTL, hits / misses / evictions are counted,
+and ``get_or_load`` makes concurrent callers of a cold key share one load.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class BoundedCache:
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        weigher: Optional[Callable[[Any], int]] = None,
+    ):
+        if max_bytes is not None and weigher is None:
+            # sys.getsizeof would only see the outer object (a tuple's pointers,
+            # not the strings and arrays it holds), so there is no safe default.
+            raise ValueError("max_bytes needs a weigher that measures the whole value")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.weigher = weigher
+        self._lock = threading.Lock()
+        # key -> (expires_at or None, weight, value)
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, weight, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._drop(key, weight)
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        weight = self.weigher(value) if self.max_bytes is not None else 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (expires_at, weight, value)
+            self._bytes += weight
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes and len(self._entries) > 1
+            ):
+                oldest, (_, oldest_weight, _) = next(iter(self._entries.items()))
+                self._drop(oldest, oldest_weight)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._drop(key, entry[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Synchronous read-through helper (no single-flight)."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Return the cached value or await ``loader()`` to fill it
+
+        Concurrent callers for the same cold key wait on the first caller's
+        load instead of starting their own. The load runs in its own task and
+        every caller, the first included, awaits it through ``asyncio.shield``,
+        so cancelling one caller never cancels the load the others share. A
+        failed load is not cached and its exception is raised to every waiter.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(key, loader, ttl))
+            # Mark the exception retrieved when every caller was cancelled.
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._inflight[key] = pending
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(pending)
+
+    async def get_or_load_many(
+        self,
+        keys: Iterable[Hashable],
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        ttl: Optional[float] = None,
+    ) -> Dict[Hashable, Any]:
+        """
+        Bulk ``get_or_load``: one ``loader(keys)`` call fills every cold key
+
+        Keys already being loaded (by ``get_or_load`` or another bulk call)
+        are waited on rather than passed to ``loader``, which must return a
+        value for each key it is given; mapping a key to an exception fails
+        that key alone. The result maps each key to its value, or to the
+        exception its load raised, so one failed key does not discard the rest.
+        """
+        waiting: Dict[Hashable, Any] = {}
+        cold: List[Hashable] = []
+        for key in dict.fromkeys(keys):
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                waiting[key] = value
+            elif key in self._inflight:
+                waiting[key] = self._inflight[key]
+                self.coalesced += 1
+            else:
+                cold.append(key)
+
+        if cold:
+            batch = asyncio.ensure_future(loader(cold))
+            for key in cold:
+                pending = asyncio.ensure_future(self._load(key, functools.partial(_pick, batch, key), ttl))
+                pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+                self._inflight[key] = waiting[key] = pending
+
+        futures = {k: v for k, v in waiting.items() if isinstance(v, asyncio.Future)}
+        outcomes = await asyncio.gather(*(asyncio.shield(f) for f in futures.values()), return_exceptions=True)
+        waiting.update(zip(futures, outcomes))
+        return waiting
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]) -> Any:
+        try:
+            value = await loader()
+            self.set(key, value, ttl)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> dict:
+        """Counters in the shape ``metrics.REGISTRY.register_cache`` expects."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions + self.expirations,
+            "size": len(self._entries),
+        }
+
+    def _drop(self, key: Hashable, weight: int) -> None:
+        del self._entries[key]
+        self._bytes -= weight
+
+
+async def _pick(batch: "asyncio.Future[Dict[Hashable, Any]]", key: Hashable) -> Any:
+    value = (await batch)[key]
+    if isinstance(value, BaseException):
+        raise value
+    return value
@@ -1,4 +1,62 @@
-"""Adapter: FlavorDB client (placeholder)"""
+"""Adapter: FlavorDB client
+
+Thin httpx client over the FlavorDB API: a change feed (``list_changes``)
+for incremental sync and per-entity compound lookups, parsed through
+``compound_parser.parse_compounds``.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+import httpx
+
+from .compound_parser import parse_compounds
+
+
 class FlavorDBClient:
+    def __init__(self, base_url: str = "https://cosylab.iiitd.edu.in/flavordb", max_connections: int = 8,
+                 timeout: float = 10.0, retries: int = 2):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._async_client: Optional[httpx.AsyncClient] = None
+
     def get_compounds(self, ingredient_name: str):
-        return {}
+        """Blocking lookup of one entity; {} when FlavorDB does not know it."""
+        with httpx.Client(base_url=self.base_url, timeout=self.timeout) as client:
+            response = client.get(f"/entities/{ingredient_name}/compounds")
+        if response.status_code == 404:
+            return {}
+        response.raise_for_status()
+        return parse_compounds(response.json())
+
+    async def fetch_compounds(self, ingredient_name: str) -> dict:
+        response = await self._get(f"/entities/{ingredient_name}/compounds")
+        return {} if response is None else parse_compounds(response.json())
+
+    async def list_changes(self, since: int, limit: int = 100) -> List[dict]:
+        """Entities changed after version ``since``, oldest first."""
+        response = await self._get("/entities", params={"since": since, "limit": limit})
+        return [] if response is None else response.json()["entities"]
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def _get(self, path: str, params: Optional[dict] = None) -> Optional[httpx.Response]:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(base_url=self.base_url, limits=self._limits, timeout=self.timeout)
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._async_client.get(path, params=params)
+                if response.status_code == 404:
+                    return None
+                response.raise_for_status()
+                return response
+            except (httpx.TransportError, httpx.HTTPStatusError):
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(0.1 * (2 ** attempt))
@@ -1,3 +1,29 @@
-"""Compound parser for FlavorDB responses"""
+"""Compound parser for FlavorDB responses
+
+FlavorDB describes an entity by its molecules, each with an ``@``-separated
+``flavor_profile`` string. The parser normalizes that into compound records
+plus a flavor profile: the share of the entity's compounds carrying each note.
+"""
+from collections import Counter
+
+
 def parse_compounds(raw: dict) -> dict:
-    return raw
+    compounds = []
+    notes = Counter()
+    for molecule in raw.get("molecules", []):
+        molecule_notes = sorted({
+            n.strip().lower() for n in (molecule.get("flavor_profile") or "").split("@") if n.strip()
+        })
+        notes.update(molecule_notes)
+        compounds.append({
+            "id": int(molecule["pubchem_id"]),
+            "name": molecule.get("common_name", ""),
+            "notes": molecule_notes,
+        })
+    total = len(compounds) or 1
+    return {
+        "name": raw.get("entity", "").lower(),
+        "version": int(raw.get("version", 0)),
+        "compounds": compounds,
+        "flavor_profile": {note: count / total for note, count in sorted(notes.items())},
+    }
@@ -0,0 +1,134 @@
+"""Local fake FlavorDB API for tests and sync benchmarks
+
+    GET /entities?since=V&limit=N     -> {"entities": [{"name", "version"}...]}
+                                         entities changed after version V, oldest first
+    GET /entities/{name}/compounds    -> {"entity", "version", "molecules": [...]}
+
+Compound data is generated deterministically from the entity name. ``touch``
+bumps entities' version and ``remove`` deletes them (the feed still lists a
+removed entity, its compounds answer 404) so incremental syncs can be
+exercised. The feed reports names as first given, in their original case.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+NOTES = (
+    "sweet", "bitter", "sour", "salty", "umami", "fruity", "floral", "green",
+    "nutty", "earthy", "spicy", "smoky", "creamy", "herbal", "citrus", "savory",
+)
+
+
+def _molecules(name: str, version: int, per_entity: int = 12) -> list:
+    digest = hashlib.sha256(f"{name}:{version}".encode()).digest()
+    molecules = []
+    for i in range(per_entity):
+        byte = digest[i % len(digest)]
+        compound_id = 1000 + (byte * 7 + i * 13) % 400
+        notes = [NOTES[(byte + k * 5) % len(NOTES)] for k in range(1 + byte % 3)]
+        molecules.append({
+            "pubchem_id": compound_id,
+            "common_name": f"compound-{compound_id}",
+            "flavor_profile": "@".join(notes),
+        })
+    return molecules
+
+
+class FakeFlavorDBServer:
+    def __init__(self, entities: Iterable[str], latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self._lock = threading.Lock()
+        self._clock = 0
+        self.versions = {}
+        self.display = {}
+        self.removed = set()
+        for name in entities:
+            self.touch(name)
+        self.latency = latency
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def touch(self, *names: str) -> int:
+        """Create or modify entities, giving them all the next version number."""
+        with self._lock:
+            self._clock += 1
+            for name in names:
+                self.versions[name.lower()] = self._clock
+                self.display.setdefault(name.lower(), name)
+                self.removed.discard(name.lower())
+            return self._clock
+
+    def remove(self, name: str) -> int:
+        """Delete an entity; it shows up in the feed once more at the next version."""
+        version = self.touch(name)
+        with self._lock:
+            self.removed.add(name.lower())
+        return version
+
+    def start(self) -> "FakeFlavorDBServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeFlavorDBServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _route(self, path: str, query: dict):
+        if path == "/entities":
+            since = int(query.get("since", ["0"])[0])
+            limit = int(query.get("limit", ["100"])[0])
+            with self._lock:
+                changed = sorted((v, n) for n, v in self.versions.items() if v > since)[:limit]
+            return 200, {"entities": [{"name": self.display[n], "version": v} for v, n in changed]}
+        if path.startswith("/entities/") and path.endswith("/compounds"):
+            name = unquote(path[len("/entities/"):-len("/compounds")]).lower()
+            version = self.versions.get(name)
+            if version is None or name in self.removed:
+                return 404, {"detail": "unknown entity"}
+            return 200, {"entity": name, "version": version, "molecules": _molecules(name, version)}
+        return 404, {"detail": "not found"}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+                parts = urlsplit(self.path)
+                status, payload = fake._route(parts.path, parse_qs(parts.query))
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
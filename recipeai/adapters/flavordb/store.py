@@ -0,0 +1,152 @@
+"""Adapter: local SQLite compound store implementing FlavorRepository
+
+Layout: integer-keyed ``ingredients``, ``compounds`` and ``notes`` tables,
+link tables ``ingredient_compounds`` and ``ingredient_notes`` (WITHOUT ROWID,
+clustered on the ingredient id) and a ``sync_state`` key/value table holding
+the change-feed watermark. Profiles are read through a per-thread connection
+and memoized in a bounded cache, so lookups stay local and in microseconds.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ...core.ports.flavor_repository import FlavorRepository
+from ..cache import BoundedCache
+
+DEFAULT_STORE_PATH = Path(__file__).resolve().parents[2] / "ai_pipeline" / "models" / "flavor_store.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingredients (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS compounds (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, note TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS ingredient_compounds (
+    ingredient_id INTEGER NOT NULL, compound_id INTEGER NOT NULL,
+    PRIMARY KEY (ingredient_id, compound_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ingredient_notes (
+    ingredient_id INTEGER NOT NULL, note_id INTEGER NOT NULL, weight REAL NOT NULL,
+    PRIMARY KEY (ingredient_id, note_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+PROFILE_SQL = """
+SELECT n.note, p.weight FROM ingredients i
+JOIN ingredient_notes p ON p.ingredient_id = i.id
+JOIN notes n ON n.id = p.note_id
+WHERE i.name = ?
+"""
+
+
+class FlavorStore(FlavorRepository):
+    def __init__(self, path: Path = DEFAULT_STORE_PATH, cache_size: int = 50_000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.cache = BoundedCache(max_entries=cache_size)
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._pool_lock:
+                self._connections.append(conn)
+        return conn
+
+    # -- FlavorRepository ----------------------------------------------------
+
+    def get_flavor_profile(self, ingredient_name: str) -> Dict[str, float]:
+        name = ingredient_name.strip().lower()
+        return self.cache.get_or_compute(
+            name, lambda: dict(self._conn().execute(PROFILE_SQL, (name,)).fetchall())
+        )
+
+    # -- sync support --------------------------------------------------------
+
+    def versions(self, names: Iterable[str]) -> Dict[str, int]:
+        names = list(names)
+        if not names:
+            return {}
+        marks = ",".join("?" * len(names))
+        rows = self._conn().execute(f"SELECT name, version FROM ingredients WHERE name IN ({marks})", names)
+        return dict(rows.fetchall())
+
+    def upsert(self, parsed: Iterable[dict], watermark: Optional[int] = None, deleted: Iterable[str] = ()) -> int:
+        """
+        Write parsed entities and drop ``deleted`` ones in one transaction,
+        optionally advancing the watermark
+
+        Committing the batch and the watermark together is what makes an
+        interrupted sync resumable: a restart picks up after the last page.
+        """
+        count = 0
+        with self._write_lock, self._conn() as conn:
+            for name in deleted:
+                row = conn.execute("SELECT id FROM ingredients WHERE name = ?", (name,)).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM ingredient_compounds WHERE ingredient_id = ?", row)
+                    conn.execute("DELETE FROM ingredient_notes WHERE ingredient_id = ?", row)
+                    conn.execute("DELETE FROM ingredients WHERE id = ?", row)
+                self.cache.delete(name)
+            for entity in parsed:
+                conn.execute(
+                    "INSERT INTO ingredients(name, version) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET version = excluded.version",
+                    (entity["name"], entity["version"]),
+                )
+                (ingredient_id,) = conn.execute(
+                    "SELECT id FROM ingredients WHERE name = ?", (entity["name"],)
+                ).fetchone()
+                conn.execute("DELETE FROM ingredient_compounds WHERE ingredient_id = ?", (ingredient_id,))
+                conn.execute("DELETE FROM ingredient_notes WHERE ingredient_id = ?", (ingredient_id,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO compounds(id, name) VALUES (?, ?)",
+                    [(c["id"], c["name"]) for c in entity["compounds"]],
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO ingredient_compounds VALUES (?, ?)",
+                    [(ingredient_id, c["id"]) for c in entity["compounds"]],
+                )
+                for note, weight in entity["flavor_profile"].items():
+                    conn.execute("INSERT OR IGNORE INTO notes(note) VALUES (?)", (note,))
+                    conn.execute(
+                        "INSERT INTO ingredient_notes SELECT ?, id, ? FROM notes WHERE note = ?",
+                        (ingredient_id, weight, note),
+                    )
+                self.cache.delete(entity["name"])
+                count += 1
+            if watermark is not None:
+                conn.execute(
+                    "INSERT INTO sync_state VALUES ('watermark', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (str(watermark),),
+                )
+        return count
+
+    def watermark(self) -> int:
+        row = self._conn().execute("SELECT value FROM sync_state WHERE key = 'watermark'").fetchone()
+        return int(row[0]) if row else 0
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM ingredients").fetchone()[0]
+
+    def close(self) -> None:
+        """Close every per-thread connection (call once no other thread is using the store)."""
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,63 @@
+"""Adapter: caching, coalescing and rate-limiting wrapper for LLM providers"""
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+from ...core.ports.llm_provider import AsyncLLMProvider
+from .completion_cache import CompletionCache, completion_key
+
+
+class CachedLLMProvider(AsyncLLMProvider):
+    """
+    Wraps an AsyncLLMProvider with three layers, cheapest first:
+
+    1. the completion cache (memory, then disk in a worker thread);
+    2. single-flight through ``BoundedCache.get_or_load``: identical prompts
+       already in flight share one upstream call, and cancelling any one
+       caller (the first included) leaves the shared call running;
+    3. a semaphore capping concurrent upstream calls; excess callers queue FIFO.
+    """
+
+    def __init__(
+        self,
+        upstream: AsyncLLMProvider,
+        cache: Optional[CompletionCache] = None,
+        max_concurrency: int = 8,
+    ):
+        self.upstream = upstream
+        self.cache = cache if cache is not None else CompletionCache()
+        self._limiter = asyncio.Semaphore(max_concurrency)
+        self.disk_hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+
+    async def complete(self, prompt: str, **kwargs) -> str:
+        key = completion_key(prompt, kwargs)
+        # get_or_load does the memory lookup; its hits are counted by the cache itself.
+        return await self.cache.get_or_load(key, lambda: self._fetch(key, prompt, kwargs))
+
+    async def _fetch(self, key: str, prompt: str, params: dict) -> str:
+        if self.cache.disk_dir is not None:
+            stored = await asyncio.to_thread(self.cache.load, key)
+            if stored is not None:
+                self.disk_hits += 1
+                return stored
+
+        self.misses += 1
+        async with self._limiter:
+            self.upstream_calls += 1
+            result = await self.upstream.complete(prompt, **params)
+        if self.cache.disk_dir is not None:
+            await asyncio.to_thread(self.cache.persist, key, result)
+        return result
+
+    def stats(self) -> dict:
+        """Counters in the shape ``metrics.REGISTRY.register_cache`` expects."""
+        return {
+            "hits": self.cache.memory.hits + self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.cache.memory.coalesced,
+            "upstream_calls": self.upstream_calls,
+            "size": len(self.cache),
+        }
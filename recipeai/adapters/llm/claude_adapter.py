@@ -1,6 +1,17 @@
 """Adapter: Claude LLM adapter (placeholder)"""
-from ....core.ports.llm_provider import LLMProvider
+import asyncio
+
+from ...core.ports.llm_provider import AsyncLLMProvider, LLMProvider
 
 class ClaudeAdapter(LLMProvider):
     def complete(self, prompt: str, **kwargs) -> str:
         return "(claude) response"
+
+class AsyncClaudeAdapter(AsyncLLMProvider):
+    """Runs the blocking adapter in a worker thread so the event loop stays free."""
+
+    def __init__(self, adapter: ClaudeAdapter | None = None):
+        self.adapter = adapter or ClaudeAdapter()
+
+    async def complete(self, prompt: str, **kwargs) -> str:
+        return await asyncio.to_thread(self.adapter.complete, prompt, **kwargs)
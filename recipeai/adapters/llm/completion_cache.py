@@ -0,0 +1,78 @@
+"""Content-addressed cache for LLM completions
+
+Entries are keyed by a SHA-256 of the prompt plus the model parameters, held
+in an in-memory LRU with a TTL and optionally mirrored to a directory of
+small JSON files so completions survive restarts.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Tuple
+
+from ..cache import BoundedCache
+
+
+def completion_key(prompt: str, params: dict) -> str:
+    payload = json.dumps({"prompt": prompt, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0, disk_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self.memory = BoundedCache(max_entries=max_entries, ttl=ttl)
+
+    def get(self, key: str) -> Optional[str]:
+        """Memory lookup only; never blocks on I/O."""
+        return self.memory.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[str]]) -> str:
+        """Memory lookup, else one shared ``loader()`` per key (see ``BoundedCache.get_or_load``)."""
+        return await self.memory.get_or_load(key, loader)
+
+    def load(self, key: str) -> Optional[str]:
+        """Blocking disk lookup; does not touch the in-memory LRU."""
+        if self.disk_dir is None:
+            return None
+        entry = self._read_disk(key)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1]
+
+    def persist(self, key: str, value: str) -> None:
+        """Blocking write to the disk store, if one is configured."""
+        if self.disk_dir is not None:
+            self._write_disk(key, (time.time() + self.ttl, value))
+
+    def __len__(self) -> int:
+        return len(self.memory)
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, str]]:
+        try:
+            with self._path(key).open() as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data["expires_at"], data["response"]
+
+    def _write_disk(self, key: str, entry: Tuple[float, str]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"expires_at": entry[0], "response": entry[1]}, f)
+        os.replace(tmp, path)
@@ -0,0 +1,18 @@
+"""Adapter: deterministic local LLM stand-in for tests and benchmarks"""
+import asyncio
+import hashlib
+
+from ...core.ports.llm_provider import AsyncLLMProvider
+
+class FakeLLMProvider(AsyncLLMProvider):
+    """Answers after a fixed ``latency`` with a response derived from the prompt."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.calls = 0
+
+    async def complete(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        digest = hashlib.sha1(repr((prompt, sorted(kwargs.items()))).encode()).hexdigest()[:12]
+        return f"(fake) {digest}"
@@ -1,4 +1,174 @@
-"""Nutrition calculator adapter (placeholder)"""
-class NutritionCalculator:
-    def estimate(self, ingredients):
-        return {"calories": 0}
+"""Nutrition calculator adapter
+
+Nutrients per gram live in one ``(n_ingredients, n_nutrients)`` float64
+matrix (``knowledge/nutrition.json``, stored per 100 g) indexed by ingredient
+id. Quantities are converted to grams with ``knowledge/unit_conversions.json``
+(mass units, volume units times per-ingredient density, and per-piece weights
+such as a garlic clove). A recipe total is its gram vector times the
+gathered matrix rows. It is computed once per distinct ingredient list and
+remembered in a ``BoundedCache``, so ``estimate_batch`` over already-seen
+recipes costs one cache lookup per recipe rather than a name lookup and a
+quantity parse per ingredient.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ...core.domain_services.QuantityParser import canonical_unit, parse_quantity
+from ...core.ports.nutrition_repository import NutritionRepository
+from ..cache import BoundedCache
+
+KNOWLEDGE_DIR = Path(__file__).resolve().parents[2] / "knowledge"
+
+
+def _load(name: str) -> dict:
+    path = KNOWLEDGE_DIR / f"{name}.json"
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _parts(item) -> Tuple[str, str, str]:
+    """``(name, quantity, unit)`` from an Ingredient, a mapping or a bare name."""
+    if isinstance(item, str):
+        return item, "", ""
+    if isinstance(item, Mapping):
+        return item.get("name", ""), str(item.get("quantity") or ""), item.get("unit") or ""
+    return item.name, str(getattr(item, "quantity", "") or ""), getattr(item, "unit", "") or ""
+
+
+def _recipe_key(ingredients: Iterable) -> tuple:
+    """Memo key for an ingredient list: the items themselves, or their parts when unhashable (dicts)."""
+    key = tuple(ingredients)
+    try:
+        hash(key)
+    except TypeError:
+        key = tuple(_parts(item) for item in key)
+    return key
+
+
+def parse_amount(quantity: str) -> Optional[float]:
+    """Numeric value of a bare quantity string ("2", "0.5", "1/2", "1 1/2", "2-3"); None otherwise."""
+    parsed = parse_quantity(quantity)
+    return parsed.value if not parsed.unit else None
+
+
+class NutritionCalculator(NutritionRepository):
+    def __init__(
+        self,
+        nutrition: Optional[Mapping] = None,
+        conversions: Optional[Mapping] = None,
+        cache_size: int = 20_000,
+    ):
+        nutrition = _load("nutrition") if nutrition is None else nutrition
+        conversions = _load("unit_conversions") if conversions is None else conversions
+        self.nutrients: Tuple[str, ...] = tuple(nutrition.get("nutrients", ("calories",)))
+        table = nutrition.get("per_100g", {})
+        self.ids: Dict[str, int] = {name.lower(): i for i, name in enumerate(table)}
+        self.matrix = np.array(list(table.values()), dtype=np.float64).reshape(len(table), len(self.nutrients)) / 100.0
+
+        self.default_grams = float(conversions.get("default_grams", 100))
+        self.mass = {canonical_unit(u): float(g) for u, g in conversions.get("mass_grams", {}).items()}
+        self.volume = {canonical_unit(u): float(ml) for u, ml in conversions.get("volume_ml", {}).items()}
+        densities = dict(conversions.get("density_g_per_ml", {}))
+        self.default_density = float(densities.pop("default", 1.0))
+        self.density = {k.lower(): float(v) for k, v in densities.items()}
+        pieces = {k.lower(): v for k, v in conversions.get("piece_grams", {}).items()}
+        self.default_pieces = {canonical_unit(u): float(g) for u, g in pieces.pop("default", {}).items()}
+        self.pieces = {name: {canonical_unit(u): float(g) for u, g in units.items()} for name, units in pieces.items()}
+        # ingredient list -> (matrix rows, grams, unknown names)
+        self.encoded = BoundedCache(max_entries=cache_size)
+
+    # -- NutritionRepository -------------------------------------------------
+
+    def get_nutrition(self, ingredient_name: str) -> Dict[str, float]:
+        """Nutrients per 100 g; {} when the ingredient is not in the table."""
+        row = self.ids.get(ingredient_name.strip().lower())
+        if row is None:
+            return {}
+        return dict(zip(self.nutrients, (self.matrix[row] * 100.0).round(3).tolist()))
+
+    # -- conversion ----------------------------------------------------------
+
+    def grams(self, name: str, quantity: str = "", unit: str = "") -> float:
+        """
+        Grams for ``quantity`` ``unit`` of ``name``; bare or unparseable amounts use a default portion
+
+        Ranges count as their midpoint, and a unit written into the quantity
+        ("2 cups") wins over ``unit``.
+        """
+        name = name.strip().lower()
+        parsed = parse_quantity(quantity, unit)
+        amount, unit = parsed.value, parsed.unit
+        if amount is None:
+            if not quantity and not unit:
+                return self.default_grams
+            amount = 1.0
+        if unit in self.mass:
+            return amount * self.mass[unit]
+        if unit in self.volume:
+            return amount * self.volume[unit] * self.density.get(name, self.default_density)
+        per_piece = self.pieces.get(name, {}).get(unit, self.default_pieces.get(unit))
+        return amount * (per_piece if per_piece is not None else self.default_grams)
+
+    # -- estimation ----------------------------------------------------------
+
+    def estimate(self, ingredients) -> dict:
+        """Nutrient totals for one ingredient list (plus the names not in the table)."""
+        return self.estimate_batch([ingredients])[0]
+
+    def totals(self, recipes: Sequence[Iterable]) -> Tuple[np.ndarray, List[List[str]]]:
+        """
+        ``(n_recipes, n_nutrients)`` totals and, per recipe, the unknown ingredient names
+
+        A recipe's total is its grams vector times its gathered nutrient rows,
+        computed once per distinct ingredient list and kept in ``encoded``;
+        only lists not seen before are walked item by item.
+        """
+        encoded = []
+        for ingredients in recipes:
+            key = _recipe_key(ingredients)
+            encoded.append(self.encoded.get_or_compute(key, lambda: self._encode(key)))
+        totals = np.array([e[0] for e in encoded], dtype=np.float64).reshape(len(encoded), len(self.nutrients))
+        return totals, [list(e[1]) for e in encoded]
+
+    def _encode(self, ingredients: tuple) -> Tuple[np.ndarray, Tuple[str, ...]]:
+        rows: List[int] = []
+        grams: List[float] = []
+        unknown: List[str] = []
+        for item in ingredients:
+            name, quantity, unit = item if isinstance(item, tuple) else _parts(item)
+            row = self.ids.get(name.strip().lower())
+            if row is None:
+                unknown.append(name)
+                continue
+            rows.append(row)
+            grams.append(self.grams(name, quantity, unit))
+        total = np.array(grams, dtype=np.float64) @ self.matrix[np.array(rows, dtype=np.int64)]
+        total.flags.writeable = False
+        return total, tuple(unknown)
+
+    def estimate_batch(self, recipes: Sequence[Iterable]) -> List[dict]:
+        """``estimate`` for many ingredient lists in one vectorized pass."""
+        totals, unknown = self.totals(recipes)
+        return [self._as_dict(row, missing) for row, missing in zip(totals, unknown)]
+
+    def compare_batch(self, pairs: Sequence[Tuple[Iterable, Iterable]]) -> List[dict]:
+        """Before/after/delta nutrition for (original, customized) ingredient-list pairs."""
+        totals, unknown = self.totals([side for pair in pairs for side in pair])
+        results = []
+        for i in range(len(pairs)):
+            before, after = totals[2 * i], totals[2 * i + 1]
+            results.append({
+                "before": self._as_dict(before, unknown[2 * i]),
+                "after": self._as_dict(after, unknown[2 * i + 1]),
+                "delta": dict(zip(self.nutrients, (after - before).round(1).tolist())),
+            })
+        return results
+
+    def _as_dict(self, row: np.ndarray, unknown: List[str]) -> dict:
+        result = dict(zip(self.nutrients, row.round(1).tolist()))
+        result["unknown_ingredients"] = unknown
+        return result
@@ -1,8 +1,9 @@
-"""Simple cache for recipe adapter (placeholder)"""
-class SimpleCache:
-    def __init__(self):
-        self._store = {}
-    def get(self, key):
-        return self._store.get(key)
-    def set(self, key, value):
-        self._store[key] = value
+"""Cache for the recipe adapter
+
+Kept as a name for existing callers; the implementation is the shared
+size-bounded, TTL-aware ``BoundedCache``.
+"""
+from ..cache import BoundedCache
+
+class SimpleCache(BoundedCache):
+    pass
@@ -1,4 +1,198 @@
-"""Adapter: RecipeDB client (placeholder)"""
-class RecipeDBClient:
-    def fetch(self, recipe_id: str):
-        return None
+"""Adapter: RecipeDB client
+
+Async, pooled HTTP client for the RecipeDB API. ``fetch_many`` splits ids
+into bulk requests (``/recipes?ids=...``) that run with bounded concurrency,
+so a thousand ids cost ``ceil(1000 / batch_size)`` round trips over a few
+kept-alive connections. Transient failures (connection errors, 429, 5xx)
+are retried with jittered exponential backoff. The synchronous
+``RecipeRepository`` methods use a separate pooled client with the same
+retry policy.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+from ...core.entities.Recipe import Recipe
+from ...core.ports.recipe_repository import RecipeRepository
+from .cache import SimpleCache
+from .mapper import map_external_to_domain
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY = object()
+_MISSING = object()  # not cached; a cached None means RecipeDB does not know the id
+
+
+class RecipeDBError(RuntimeError):
+    pass
+
+
+class RecipeDBBatchError(RecipeDBError):
+    """Some ``fetch_many`` batches failed; ``recipes`` holds what the others returned."""
+
+    def __init__(self, recipes: Dict[str, Recipe], failed_ids: List[str]):
+        super().__init__(f"RecipeDB lookup failed for {len(failed_ids)} id(s): {', '.join(failed_ids[:10])}")
+        self.recipes = recipes
+        self.failed_ids = failed_ids
+
+
+class RecipeDBClient(RecipeRepository):
+    def __init__(
+        self,
+        base_url: str,
+        batch_size: int = 100,
+        max_concurrency: int = 8,
+        retries: int = 3,
+        backoff: float = 0.1,
+        timeout: float = 5.0,
+        cache: Optional[SimpleCache] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache if cache is not None else SimpleCache(max_entries=10_000, ttl=300)
+        self._limits = httpx.Limits(
+            max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+        )
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+
+    # -- async API ---------------------------------------------------------
+
+    async def fetch(self, recipe_id: str) -> Optional[Recipe]:
+        async def load():
+            response = await self._request_async(f"/recipes/{recipe_id}")
+            return None if response is None else map_external_to_domain(response.json())
+
+        return await self.cache.get_or_load(("recipe", str(recipe_id)), load)
+
+    async def fetch_many(self, recipe_ids: Iterable[str]) -> Dict[str, Recipe]:
+        """
+        Fetch recipes by id; ids RecipeDB does not know are absent from the result
+
+        Unknown ids are cached as None, like a 404 from ``fetch``, so they are
+        not requested again until the entry expires. Ids another ``fetch`` or
+        ``fetch_many`` is already loading are awaited, not requested twice.
+        When a batch fails the other batches are still cached, and
+        ``RecipeDBBatchError`` carries both the recipes found and the failed ids.
+        """
+        limiter = asyncio.Semaphore(self.max_concurrency)
+
+        async def load_batch(batch: List[str]) -> List[Recipe]:
+            async with limiter:
+                response = await self._request_async("/recipes", params={"ids": ",".join(batch)})
+            if response is None:
+                raise RecipeDBError("RecipeDB answered 404 for a bulk lookup")
+            return [map_external_to_domain(r) for r in response.json()["recipes"]]
+
+        async def load(keys: List[tuple]) -> Dict[tuple, object]:
+            ids = [recipe_id for _, recipe_id in keys]
+            batches = [ids[i:i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+            outcomes = await asyncio.gather(*(load_batch(b) for b in batches), return_exceptions=True)
+            loaded: Dict[tuple, object] = {}
+            for batch, recipes in zip(batches, outcomes):
+                if isinstance(recipes, BaseException):
+                    loaded.update((("recipe", recipe_id), recipes) for recipe_id in batch)
+                else:
+                    by_id = {recipe.id: recipe for recipe in recipes}
+                    loaded.update((("recipe", recipe_id), by_id.get(recipe_id)) for recipe_id in batch)
+            return loaded
+
+        keys = [("recipe", str(i)) for i in recipe_ids]
+        results = await self.cache.get_or_load_many(keys, load)
+        found = {key[1]: value for key, value in results.items() if isinstance(value, Recipe)}
+        errors = {key[1]: value for key, value in results.items() if isinstance(value, BaseException)}
+        if errors:
+            raise RecipeDBBatchError(found, list(errors)) from next(iter(errors.values()))
+        return found
+
+    async def search_async(self, query: str) -> List[Recipe]:
+        response = await self._request_async("/recipes/search", params={"q": query})
+        return [] if response is None else [map_external_to_domain(r) for r in response.json()["recipes"]]
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def _request_async(self, path: str, params: Optional[dict] = None) -> Optional[httpx.Response]:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url, limits=self._limits, timeout=self.timeout
+            )
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._async_client.get(path, params=params)
+            except httpx.TransportError as exc:
+                error: Exception = exc
+            else:
+                outcome = self._classify(response)
+                if outcome is not _RETRY:
+                    return outcome
+                error = RecipeDBError(f"RecipeDB answered {response.status_code} for {path}")
+            if attempt < self.retries:
+                await asyncio.sleep(self._delay(attempt))
+        raise RecipeDBError(f"RecipeDB request {path} failed after {self.retries + 1} attempts") from error
+
+    # -- RecipeRepository (sync) -------------------------------------------
+
+    def get(self, recipe_id: str) -> Recipe | None:
+        key = ("recipe", str(recipe_id))
+        recipe = self.cache.get(key, _MISSING)
+        if recipe is _MISSING:
+            response = self._request_sync(f"/recipes/{recipe_id}")
+            recipe = None if response is None else map_external_to_domain(response.json())
+            self.cache.set(key, recipe)
+        return recipe
+
+    def search(self, query: str) -> List[Recipe]:
+        response = self._request_sync("/recipes/search", params={"q": query})
+        return [] if response is None else [map_external_to_domain(r) for r in response.json()["recipes"]]
+
+    def close(self) -> None:
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    def _request_sync(self, path: str, params: Optional[dict] = None) -> Optional[httpx.Response]:
+        if self._sync_client is None:
+            self._sync_client = httpx.Client(
+                base_url=self.base_url, limits=self._limits, timeout=self.timeout
+            )
+        for attempt in range(self.retries + 1):
+            try:
+                response = self._sync_client.get(path, params=params)
+            except httpx.TransportError as exc:
+                error: Exception = exc
+            else:
+                outcome = self._classify(response)
+                if outcome is not _RETRY:
+                    return outcome
+                error = RecipeDBError(f"RecipeDB answered {response.status_code} for {path}")
+            if attempt < self.retries:
+                time.sleep(self._delay(attempt))
+        raise RecipeDBError(f"RecipeDB request {path} failed after {self.retries + 1} attempts") from error
+
+    # -- shared ------------------------------------------------------------
+
+    def _classify(self, response: httpx.Response):
+        """Return the response, None for 404, or ``_RETRY`` for a transient failure."""
+        if response.status_code == 404:
+            return None
+        if response.status_code in RETRY_STATUSES:
+            return _RETRY
+        if response.is_error:
+            raise RecipeDBError(f"RecipeDB answered {response.status_code}: {response.text[:200]}")
+        return response
+
+    def _delay(self, attempt: int) -> float:
+        # "Equal jitter": half the exponential step fixed, half random.
+        step = self.backoff * (2 ** attempt)
+        return step / 2 + random.uniform(0, step / 2)
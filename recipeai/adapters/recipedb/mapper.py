@@ -1,5 +1,23 @@
 """Mapper: external recipe -> domain recipe"""
-from ....core.entities.Recipe import Recipe  # relative import placeholder
+from ...core.entities.Recipe import Ingredient, Recipe
 
-def map_external_to_domain(data: dict) -> dict:
-    return data
+def map_ingredient(data) -> Ingredient:
+    """RecipeDB sends either a bare name or an object with quantity details."""
+    if isinstance(data, str):
+        return Ingredient(data, "", "", [])
+    return Ingredient(
+        name=data.get("name", ""),
+        quantity=str(data.get("quantity", "") or ""),
+        unit=data.get("unit", "") or "",
+        categories=list(data.get("categories", [])),
+    )
+
+def map_external_to_domain(data: dict) -> Recipe:
+    return Recipe(
+        id=str(data["id"]),
+        name=data.get("name", ""),
+        ingredients=[map_ingredient(i) for i in data.get("ingredients", [])],
+        instructions=list(data.get("instructions") or data.get("steps") or []),
+        cuisine=data.get("cuisine", "") or "",
+        dietary_tags=list(data.get("dietary_tags", [])),
+    )
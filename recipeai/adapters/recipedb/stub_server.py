@@ -0,0 +1,109 @@
+"""Local stand-in for the RecipeDB HTTP API, for tests and benchmarks
+
+Serves a recipe list over HTTP/1.1 with keep-alive:
+
+    GET /recipes/{id}          -> recipe object, or 404
+    GET /recipes?ids=1,2,3     -> {"recipes": [...]} (unknown ids are omitted)
+    GET /recipes/search?q=...  -> {"recipes": [...]} (name substring match)
+
+``fail_every`` makes every n-th request answer 503 so retry paths can be
+exercised; ``latency`` adds a fixed delay per request.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+RECIPES_PATH = Path(__file__).resolve().parents[2] / "knowledge" / "recipes.json"
+
+
+class RecipeDBStubServer:
+    def __init__(
+        self,
+        recipes: Optional[Iterable[dict]] = None,
+        latency: float = 0.0,
+        fail_every: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        if recipes is None:
+            with RECIPES_PATH.open() as f:
+                recipes = json.load(f)
+        self.recipes = {str(r["id"]): r for r in recipes}
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "RecipeDBStubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "RecipeDBStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _count(self) -> int:
+        with self._lock:
+            self.requests += 1
+            return self.requests
+
+    def _route(self, path: str, query: dict):
+        if path == "/recipes":
+            ids = [i for chunk in query.get("ids", []) for i in chunk.split(",") if i]
+            return 200, {"recipes": [self.recipes[i] for i in ids if i in self.recipes]}
+        if path == "/recipes/search":
+            needle = query.get("q", [""])[0].lower()
+            return 200, {"recipes": [r for r in self.recipes.values() if needle in r["name"].lower()]}
+        if path.startswith("/recipes/"):
+            recipe = self.recipes.get(path[len("/recipes/"):])
+            return (200, recipe) if recipe is not None else (404, {"detail": "not found"})
+        return 404, {"detail": "not found"}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def do_GET(self):
+                number = stub._count()
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if stub.fail_every and number % stub.fail_every == 0:
+                    status, payload = 503, {"detail": "try again"}
+                else:
+                    parts = urlsplit(self.path)
+                    status, payload = stub._route(parts.path, parse_qs(parts.query))
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,297 @@
+"""Adapter: columnar in-memory recipe store implementing RecipeRepository
+
+One row per recipe, no per-recipe Python objects:
+
+    ids, names            UTF-8 string buffers with int64 offsets
+    ingredient_indptr     int64 (n + 1) CSR row pointers into
+    ingredient_indices    int32 ingredient ids (unique per recipe, in recipe order)
+    cuisine_codes         int32 (n,) index into the cuisine dictionary, -1 for none
+    tag_indptr/indices    int64 / int32 CSR over the tag dictionary
+    instruction_indptr    int64 (n + 1) CSR into the instruction string column
+
+The ingredient, cuisine and tag dictionaries are small and decoded once. An
+ingredient reference costs four bytes, so millions of recipes fit in tens of
+bytes per reference. ``scan`` answers "containing X and not Y" style queries
+over the whole corpus with one gather per criterion over the CSR arrays; ``get`` finds a
+row by binary search over an id permutation sorted at build time.
+
+On-disk format (a directory, ``FORMAT_VERSION`` 1): ``meta.json`` plus one
+``.npy`` per array, opened with ``mmap_mode='r'``.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ...core.entities.Recipe import Ingredient, Recipe
+from ...core.ports.recipe_repository import RecipeRepository
+from ...storage import atomic_directory
+
+FORMAT_NAME = "recipeai.columnar_recipes"
+FORMAT_VERSION = 1
+DEFAULT_STORE_DIR = Path(__file__).resolve().parents[2] / "ai_pipeline" / "models" / "recipe_store"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_ALNUM = np.frombuffer(b"abcdefghijklmnopqrstuvwxyz0123456789", dtype=np.uint8)
+_ARRAYS = (
+    "id_buffer", "id_offsets", "id_order", "name_buffer", "name_offsets",
+    "ingredient_indptr", "ingredient_indices", "cuisine_codes", "tag_indptr", "tag_indices",
+    "instruction_indptr", "instruction_buffer", "instruction_offsets",
+)
+
+
+def _encode(strings: Iterable[str]):
+    """``(uint8 buffer, int64 offsets)`` for a string column."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8).copy(), offsets
+
+
+def _decode(buffer: np.ndarray, offsets: np.ndarray, i: int) -> str:
+    return bytes(buffer[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+
+def _csr(rows: Sequence[Sequence[int]]):
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(r) for r in rows])
+    indices = np.fromiter((i for r in rows for i in r), dtype=np.int32, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def _code(codes: Dict[str, int], names: List[str], value: str) -> int:
+    """Dictionary code of ``value``, case-insensitively; the first spelling seen is the one kept."""
+    code = codes.get(value.lower())
+    if code is None:
+        code = codes[value.lower()] = len(names)
+        names.append(value)
+    return code
+
+
+def _row_counts(indptr: np.ndarray, indices: np.ndarray, ids: Sequence[int], size: int) -> np.ndarray:
+    """Per row, how many of its entries are in ``ids``: a lookup-table gather, then hits binned by row."""
+    wanted = np.zeros(size, dtype=bool)
+    wanted[list(ids)] = True
+    positions = np.flatnonzero(wanted[indices])
+    rows = np.searchsorted(indptr, positions, side="right") - 1
+    return np.bincount(rows, minlength=len(indptr) - 1)
+
+
+class ColumnarRecipeStore(RecipeRepository):
+    def __init__(
+        self,
+        arrays: Mapping[str, np.ndarray],
+        ingredients: Sequence[str],
+        cuisines: Sequence[str],
+        tags: Sequence[str],
+        categories: Optional[Mapping[str, Iterable[str]]] = None,
+    ):
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+        self.ingredients: List[str] = list(ingredients)  # ingredient id -> name
+        self.cuisines: List[str] = list(cuisines)
+        self.tags: List[str] = list(tags)
+        self.ingredient_ids: Dict[str, int] = {name.lower(): i for i, name in enumerate(self.ingredients)}
+        self.cuisine_ids: Dict[str, int] = {c.lower(): i for i, c in enumerate(self.cuisines)}
+        self.tag_ids: Dict[str, int] = {t.lower(): i for i, t in enumerate(self.tags)}
+        # Ingredient categories for the domain entities; {} leaves them empty.
+        self.categories = categories or {}
+        self._names_folded: Optional[bytes] = None
+
+    @classmethod
+    def from_recipes(
+        cls, recipes: Iterable[Mapping], categories: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> "ColumnarRecipeStore":
+        """Encode recipes.json-style dicts (id, name, cuisine, ingredients, dietary_tags, instructions)."""
+        ingredient_ids: Dict[str, int] = {}
+        cuisine_ids: Dict[str, int] = {}
+        tag_ids: Dict[str, int] = {}
+        cuisine_names: List[str] = []
+        tag_names: List[str] = []
+        ids, names, ingredient_rows, cuisine_codes, tag_rows, instruction_rows, instructions = [], [], [], [], [], [], []
+        for recipe in recipes:
+            ids.append(str(recipe["id"]))
+            names.append(recipe.get("name", ""))
+            ingredient_rows.append(list(dict.fromkeys(
+                ingredient_ids.setdefault(name.lower(), len(ingredient_ids))
+                for name in recipe.get("ingredients", [])
+            )))
+            cuisine = recipe.get("cuisine") or ""
+            cuisine_codes.append(_code(cuisine_ids, cuisine_names, cuisine) if cuisine else -1)
+            tag_rows.append(list(dict.fromkeys(
+                _code(tag_ids, tag_names, tag) for tag in recipe.get("dietary_tags", [])
+            )))
+            steps = list(recipe.get("instructions", []))
+            instruction_rows.append(len(steps))
+            instructions.extend(steps)
+
+        arrays: Dict[str, np.ndarray] = {}
+        arrays["id_buffer"], arrays["id_offsets"] = _encode(ids)
+        arrays["id_order"] = np.array(sorted(range(len(ids)), key=ids.__getitem__), dtype=np.int64)
+        arrays["name_buffer"], arrays["name_offsets"] = _encode(names)
+        arrays["ingredient_indptr"], arrays["ingredient_indices"] = _csr(ingredient_rows)
+        arrays["cuisine_codes"] = np.array(cuisine_codes, dtype=np.int32)
+        arrays["tag_indptr"], arrays["tag_indices"] = _csr(tag_rows)
+        arrays["instruction_indptr"] = np.concatenate(([0], np.cumsum(instruction_rows, dtype=np.int64)))
+        arrays["instruction_buffer"], arrays["instruction_offsets"] = _encode(instructions)
+        return cls(arrays, list(ingredient_ids), cuisine_names, tag_names, categories)
+
+    @classmethod
+    def load(
+        cls, path: Path = DEFAULT_STORE_DIR, categories: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> "ColumnarRecipeStore":
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        if meta.get("format") != FORMAT_NAME or meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recipe store format in {path}: {meta}")
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+        return cls(arrays, meta["ingredients"], meta["cuisines"], meta["tags"], categories)
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        with atomic_directory(path) as staging:
+            for name in _ARRAYS:
+                np.save(staging / f"{name}.npy", np.asarray(getattr(self, name)))
+            meta = {
+                "format": FORMAT_NAME,
+                "version": FORMAT_VERSION,
+                "count": len(self),
+                "ingredient_refs": int(len(self.ingredient_indices)),
+                "ingredients": self.ingredients,
+                "cuisines": self.cuisines,
+                "tags": self.tags,
+            }
+            (staging / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    def __len__(self) -> int:
+        return len(self.id_offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the columns (mapped or not), excluding the small dictionaries."""
+        return sum(np.asarray(getattr(self, name)).nbytes for name in _ARRAYS)
+
+    # -- RecipeRepository ----------------------------------------------------
+
+    def get(self, recipe_id: str) -> Recipe | None:
+        row = self.row(recipe_id)
+        return None if row is None else self.recipe(row)
+
+    def search(self, query: str) -> List[Recipe]:
+        """Recipes whose name has a word starting with every query token, in corpus order."""
+        return [self.recipe(row) for row in self.search_rows(query)]
+
+    # -- columnar API --------------------------------------------------------
+
+    def row(self, recipe_id: str) -> Optional[int]:
+        """Row of ``recipe_id`` by binary search over the sorted id permutation."""
+        target = str(recipe_id)
+        lo, hi = 0, len(self.id_order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _decode(self.id_buffer, self.id_offsets, int(self.id_order[mid])) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.id_order):
+            row = int(self.id_order[lo])
+            if _decode(self.id_buffer, self.id_offsets, row) == target:
+                return row
+        return None
+
+    def recipe_id(self, row: int) -> str:
+        return _decode(self.id_buffer, self.id_offsets, row)
+
+    def name(self, row: int) -> str:
+        return _decode(self.name_buffer, self.name_offsets, row)
+
+    def ingredient_names(self, row: int) -> List[str]:
+        start, end = self.ingredient_indptr[row], self.ingredient_indptr[row + 1]
+        return [self.ingredients[i] for i in self.ingredient_indices[start:end]]
+
+    def recipe(self, row: int) -> Recipe:
+        """Materialize one row as a domain ``Recipe``."""
+        cuisine = int(self.cuisine_codes[row])
+        tags = self.tag_indices[self.tag_indptr[row]:self.tag_indptr[row + 1]]
+        steps = range(int(self.instruction_indptr[row]), int(self.instruction_indptr[row + 1]))
+        return Recipe(
+            id=self.recipe_id(row),
+            name=self.name(row),
+            ingredients=[
+                Ingredient(name, "", "", sorted(self.categories.get(name, ())))
+                for name in self.ingredient_names(row)
+            ],
+            instructions=[_decode(self.instruction_buffer, self.instruction_offsets, i) for i in steps],
+            cuisine=self.cuisines[cuisine] if cuisine >= 0 else "",
+            dietary_tags=[self.tags[t] for t in tags],
+        )
+
+    def scan(
+        self,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        cuisines: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        match: str = "all",
+    ) -> np.ndarray:
+        """
+        Rows (ascending) containing the ``include`` ingredients and none of ``exclude``
+
+        ``match`` decides whether every included ingredient and tag is
+        required ("all") or any one of them is enough ("any"); several
+        cuisines are OR-ed. Each criterion is one vectorized pass over a
+        column.
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"match must be 'all' or 'any', got {match!r}")
+        keep = np.ones(len(self), dtype=bool)
+        for names, ids, indptr, indices in (
+            (include, self.ingredient_ids, self.ingredient_indptr, self.ingredient_indices),
+            (tags, self.tag_ids, self.tag_indptr, self.tag_indices),
+        ):
+            wanted = {name.lower() for name in names}
+            if not wanted:
+                continue
+            known = [ids[name] for name in wanted if name in ids]
+            if match == "all" and len(known) < len(wanted):
+                return np.zeros(0, dtype=np.int64)
+            counts = _row_counts(indptr, indices, known, len(ids))
+            keep &= counts == len(known) if match == "all" else counts > 0
+        excluded = [self.ingredient_ids[n.lower()] for n in exclude if n.lower() in self.ingredient_ids]
+        if excluded:
+            keep &= _row_counts(self.ingredient_indptr, self.ingredient_indices, excluded, len(self.ingredients)) == 0
+        cuisines = [c.lower() for c in cuisines]
+        if cuisines:
+            cuisine_ids = [self.cuisine_ids[c] for c in cuisines if c in self.cuisine_ids]
+            keep &= np.isin(self.cuisine_codes, cuisine_ids)
+        return np.flatnonzero(keep)
+
+    def search_rows(self, query: str) -> np.ndarray:
+        """Rows whose name has a word starting with every token of ``query``."""
+        tokens = _TOKEN_RE.findall(query.lower())
+        if not tokens:
+            return np.arange(len(self))
+        if self._names_folded is None:
+            self._names_folded = bytes(self.name_buffer).lower()
+        buffer, offsets = self._names_folded, np.asarray(self.name_offsets)
+        keep = None
+        for token in tokens:
+            needle = token.encode("utf-8")
+            # Lookahead, so overlapping occurrences are all found: a match that runs across a
+            # name boundary must not swallow a real word start in the next name.
+            pattern = b"(?=" + re.escape(needle) + b")"
+            starts = np.fromiter((m.start() for m in re.finditer(pattern, buffer)), dtype=np.int64)
+            rows = np.searchsorted(offsets, starts, side="right") - 1
+            # A word start: the name's first byte, or preceded by a non-alphanumeric byte.
+            previous = np.frombuffer(buffer, dtype=np.uint8)[np.maximum(starts - 1, 0)]
+            at_word = (starts == offsets[rows]) | ~np.isin(previous, _ALNUM)
+            fits = starts + len(needle) <= offsets[rows + 1]
+            hit = np.zeros(len(self), dtype=bool)
+            hit[rows[at_word & fits]] = True
+            keep = hit if keep is None else keep & hit
+        return np.flatnonzero(keep)
+
@@ -0,0 +1,392 @@
+"""Adapter: SQLite + FTS5 recipe store implementing RecipeRepository
+
+For corpora that should not live in RAM. Layout:
+
+    recipes             id (rowid), recipe_id UNIQUE, name, cuisine_key (indexed),
+                        diet_mask (category/allergen bits, see diet_bits), body (JSON)
+    recipe_ingredients  (ingredient, recipe_rowid) WITHOUT ROWID, for exact filters
+    recipe_tags         (tag, recipe_rowid) WITHOUT ROWID
+    recipes_fts         FTS5 over name and ingredients, rowid = recipes.id
+    diet_bits           bit -> CategoryRegistry name, so masks survive process restarts
+    store_meta          key -> value; ``diet_source`` names the knowledge files the
+                        diet masks were computed from
+
+``find`` takes the same arguments and returns the same shape as
+``RecipeSearchIndex.search``, except that text queries are ranked by BM25
+(name weighted over ingredients) instead of corpus order. Every thread gets
+its own connection (WAL, so readers never block each other or the importer);
+queries are built from a fixed set of shapes so sqlite3's per-connection
+statement cache keeps them prepared.
+
+``generation`` changes whenever the database or its WAL file changes on
+disk (checked at most once per ``check_interval`` seconds, like the
+knowledge-base files), so callers caching query results can key on it and
+see imports made by another process. The diet bit layout is re-read when it
+moves, so masks written by another importer are understood too.
+
+Diet masks are computed at import time. After the knowledge files that feed
+them change (``KnowledgeBase.diet_fingerprint``), ``find`` refuses diet
+filtering when given the new fingerprint until the corpus is re-imported.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ...core.domain_services.CategoryRegistry import category_names
+from ...core.domain_services.RecipeSearchIndex import NAME_MATCHES, tokenize
+from ...core.entities.Recipe import Ingredient, Recipe
+from ...core.ports.recipe_repository import RecipeRepository
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[2] / "ai_pipeline" / "models" / "recipes.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY, recipe_id TEXT NOT NULL UNIQUE, name TEXT NOT NULL,
+    cuisine_key TEXT NOT NULL, diet_mask INTEGER NOT NULL DEFAULT 0, body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recipes_cuisine ON recipes(cuisine_key);
+CREATE TABLE IF NOT EXISTS recipe_ingredients (
+    ingredient TEXT NOT NULL, recipe_rowid INTEGER NOT NULL, PRIMARY KEY (ingredient, recipe_rowid)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS recipe_tags (
+    tag TEXT NOT NULL, recipe_rowid INTEGER NOT NULL, PRIMARY KEY (tag, recipe_rowid)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(name, ingredients, prefix='2 3');
+CREATE TABLE IF NOT EXISTS diet_bits (bit INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+MAX_DIET_BITS = 63  # SQLite integers are signed 64-bit
+
+
+def _key(value: str) -> str:
+    return " ".join(tokenize(value))
+
+
+def normalize_recipe(data: Mapping) -> dict:
+    """
+    A recipes.json-shaped dict from a recipes.json entry or a RecipeDB record
+
+    RecipeDB ingredients may be objects with quantity details; their names go
+    to ``ingredients`` and the objects to ``ingredient_details``.
+    """
+    names, details = [], []
+    for item in data.get("ingredients", []):
+        if isinstance(item, str):
+            names.append(item)
+            details.append({"name": item, "quantity": "", "unit": ""})
+        else:
+            names.append(item.get("name", ""))
+            details.append({
+                "name": item.get("name", ""),
+                "quantity": str(item.get("quantity", "") or ""),
+                "unit": item.get("unit", "") or "",
+            })
+    recipe = {
+        "id": str(data["id"]),
+        "name": data.get("name", ""),
+        "cuisine": data.get("cuisine", "") or "",
+        "ingredients": names,
+        "dietary_tags": list(data.get("dietary_tags", [])),
+    }
+    instructions = data.get("instructions") or data.get("steps")
+    if instructions:
+        recipe["instructions"] = list(instructions)
+    if data.get("servings"):
+        recipe["servings"] = data["servings"]
+    if any(d["quantity"] or d["unit"] for d in details):
+        recipe["ingredient_details"] = details
+    return recipe
+
+
+class SQLiteRecipeStore(RecipeRepository):
+    def __init__(
+        self,
+        path: Path = DEFAULT_DB_PATH,
+        categories: Optional[Mapping[str, Iterable[str]]] = None,
+        cached_statements: int = 256,
+        check_interval: float = 1.0,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Ingredient categories for the domain entities; {} leaves them empty.
+        self.categories = categories or {}
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.check_interval = check_interval
+        self._signature: tuple = ()
+        self._generation = 0
+        self._checked_at = 0.0
+        self._conn().executescript(SCHEMA)
+        # (generation, diet bits by category name, diet_source) as last read from the database
+        self._layout: Tuple[int, Dict[str, int], Optional[str]] = (-1, {}, None)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=self.cached_statements)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._pool_lock:
+                self._connections.append(conn)
+        return conn
+
+    def generation(self) -> int:
+        """A counter that moves whenever the database files change on disk."""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            signature = self._file_signature()
+            if signature != self._signature:
+                self._signature = signature
+                self._generation += 1
+        return self._generation
+
+    def _file_signature(self) -> tuple:
+        signature = []
+        for path in (self.path, self.path.with_name(self.path.name + "-wal")):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    # -- import --------------------------------------------------------------
+
+    def import_recipes(
+        self,
+        recipes: Iterable[Mapping],
+        diet_mask: Optional[Callable[[str], int]] = None,
+        batch_size: int = 5000,
+        diet_source: Optional[str] = None,
+    ) -> int:
+        """
+        Upsert recipes (recipes.json entries or RecipeDB records) in batched transactions
+
+        ``diet_mask`` maps an ingredient name to its CategoryRegistry bits
+        (``KnowledgeBase.diet_mask``); without it ``find(blocked=...)`` is
+        unavailable for the imported rows. ``diet_source`` records which
+        knowledge files produced those bits (``KnowledgeBase.diet_fingerprint``).
+        """
+        count = 0
+        batch: List[dict] = []
+        for data in recipes:
+            batch.append(normalize_recipe(data))
+            if len(batch) >= batch_size:
+                count += self._write(batch, diet_mask)
+                batch = []
+        if batch:
+            count += self._write(batch, diet_mask)
+        if diet_mask is not None and diet_source is not None:
+            with self._write_lock, self._conn() as conn:
+                conn.execute(
+                    "INSERT INTO store_meta VALUES ('diet_source', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (diet_source,),
+                )
+        self._checked_at = 0.0  # our own writes show up in the next generation() call
+        return count
+
+    def _write(self, batch: Sequence[dict], diet_mask: Optional[Callable[[str], int]]) -> int:
+        with self._write_lock, self._conn() as conn:
+            # Take the database write lock before reading the bit layout, so two
+            # importers (even in different processes) never claim the same bit.
+            conn.execute("BEGIN IMMEDIATE")
+            bits: Dict[str, int] = dict(conn.execute("SELECT name, bit FROM diet_bits").fetchall())
+            for recipe in batch:
+                mask = 0
+                if diet_mask is not None:
+                    for name in recipe["ingredients"]:
+                        mask |= diet_mask(name.lower())
+                old = conn.execute("SELECT id FROM recipes WHERE recipe_id = ?", (recipe["id"],)).fetchone()
+                if old is not None:
+                    conn.execute("DELETE FROM recipe_ingredients WHERE recipe_rowid = ?", old)
+                    conn.execute("DELETE FROM recipe_tags WHERE recipe_rowid = ?", old)
+                    conn.execute("DELETE FROM recipes_fts WHERE rowid = ?", old)
+                    conn.execute("DELETE FROM recipes WHERE id = ?", old)
+                rowid = conn.execute(
+                    "INSERT INTO recipes(recipe_id, name, cuisine_key, diet_mask, body) VALUES (?, ?, ?, ?, ?)",
+                    (recipe["id"], recipe["name"], _key(recipe["cuisine"]), self._store_mask(conn, bits, mask),
+                     json.dumps(recipe, ensure_ascii=False)),
+                ).lastrowid
+                conn.executemany(
+                    "INSERT OR IGNORE INTO recipe_ingredients VALUES (?, ?)",
+                    [(_key(name), rowid) for name in recipe["ingredients"]],
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO recipe_tags VALUES (?, ?)",
+                    [(_key(tag), rowid) for tag in recipe["dietary_tags"]],
+                )
+                conn.execute(
+                    "INSERT INTO recipes_fts(rowid, name, ingredients) VALUES (?, ?, ?)",
+                    (rowid, recipe["name"], " ".join(recipe["ingredients"])),
+                )
+        return len(batch)
+
+    def _store_mask(self, conn: sqlite3.Connection, bits: Dict[str, int], mask: int) -> int:
+        """Re-express a process mask in this database's own bit layout, adding bits as needed."""
+        stored = 0
+        for name in category_names(mask):
+            bit = bits.get(name)
+            if bit is None:
+                bit = max(bits.values(), default=-1) + 1
+                if bit >= MAX_DIET_BITS:
+                    raise ValueError(f"Too many diet categories for {self.path}")
+                conn.execute("INSERT INTO diet_bits VALUES (?, ?)", (bit, name))
+                bits[name] = bit
+            stored |= 1 << bit
+        return stored
+
+    def _diet_layout(self) -> Tuple[Dict[str, int], Optional[str]]:
+        """The diet bit layout and ``diet_source``, re-read whenever ``generation`` moves."""
+        generation = self.generation()
+        layout = self._layout
+        if layout[0] != generation:
+            conn = self._conn()
+            bits = dict(conn.execute("SELECT name, bit FROM diet_bits").fetchall())
+            row = conn.execute("SELECT value FROM store_meta WHERE key = 'diet_source'").fetchone()
+            layout = self._layout = (generation, bits, row[0] if row else None)
+        return layout[1], layout[2]
+
+    def diet_source(self) -> Optional[str]:
+        """The ``diet_source`` recorded by the last import with diet masks, if any."""
+        return self._diet_layout()[1]
+
+    # -- RecipeRepository ----------------------------------------------------
+
+    def get(self, recipe_id: str) -> Recipe | None:
+        raw = self.get_raw(recipe_id)
+        return None if raw is None else self.to_recipe(raw)
+
+    def to_recipe(self, raw: Mapping) -> Recipe:
+        """Domain ``Recipe`` for a stored body, with quantities from its ingredient details."""
+        details = raw.get("ingredient_details") or [{"name": n, "quantity": "", "unit": ""} for n in raw["ingredients"]]
+        return Recipe(
+            id=raw["id"],
+            name=raw["name"],
+            ingredients=[
+                Ingredient(d["name"], d["quantity"], d["unit"], sorted(self.categories.get(d["name"].lower(), ())))
+                for d in details
+            ],
+            instructions=list(raw.get("instructions", [])),
+            cuisine=raw["cuisine"],
+            dietary_tags=list(raw["dietary_tags"]),
+        )
+
+    def search(self, query: str) -> List[Recipe]:
+        """Recipes matching ``query`` in their name or ingredients, best ranked first."""
+        return [self.get(r["id"]) for r in self.find(query)["recipes"]]
+
+    # -- lookups -------------------------------------------------------------
+
+    def get_raw(self, recipe_id: str) -> Optional[dict]:
+        row = self._conn().execute("SELECT body FROM recipes WHERE recipe_id = ?", (str(recipe_id),)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def find(
+        self,
+        query: str = "",
+        ingredients: Iterable[str] = (),
+        cuisines: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        match: str = "all",
+        offset: int = 0,
+        limit: Optional[int] = None,
+        blocked: int = 0,
+        name_match: str = "words",
+        diet_source: Optional[str] = None,
+    ) -> dict:
+        """
+        ``RecipeSearchIndex.search`` against the database
+
+        Query tokens are prefix-matched by FTS5 against names and
+        ingredients; ``name_match="start"`` instead matches the start of the
+        name, unranked. Filters are exact, on normalized values. With
+        ``diet_source``, ``blocked`` is refused unless the stored masks were
+        imported from that same knowledge (see ``import_recipes``).
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"match must be 'all' or 'any', got {match!r}")
+        if name_match not in NAME_MATCHES:
+            raise ValueError(f"name_match must be 'words' or 'start', got {name_match!r}")
+        where: List[str] = []
+        params: List[object] = []
+        tokens = tokenize(query) if name_match == "words" else []
+        prefix = query.strip().lower() if name_match == "start" else ""
+        if prefix:
+            source, order = "recipes r", "r.id"
+            where.append("lower(r.name) LIKE ? ESCAPE '\\'")
+            params.append(prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        elif tokens:
+            source = "recipes_fts JOIN recipes r ON r.id = recipes_fts.rowid"
+            where.append("recipes_fts MATCH ?")
+            params.append(" AND ".join(f'"{token}"*' for token in tokens))
+            order = "bm25(recipes_fts, 2.0, 1.0), r.id"
+        else:
+            source, order = "recipes r", "r.id"
+
+        for table, column, values in (
+            ("recipe_ingredients", "ingredient", ingredients),
+            ("recipe_tags", "tag", tags),
+        ):
+            keys = list(dict.fromkeys(_key(v) for v in values))
+            if not keys:
+                continue
+            marks = ",".join("?" * len(keys))
+            if match == "all":
+                where.append(
+                    f"r.id IN (SELECT recipe_rowid FROM {table} WHERE {column} IN ({marks}) "
+                    f"GROUP BY recipe_rowid HAVING COUNT(*) = ?)"
+                )
+                params.extend(keys + [len(keys)])
+            else:
+                where.append(f"r.id IN (SELECT recipe_rowid FROM {table} WHERE {column} IN ({marks}))")
+                params.extend(keys)
+
+        cuisine_keys = list(dict.fromkeys(_key(c) for c in cuisines))
+        if cuisine_keys:
+            where.append(f"r.cuisine_key IN ({','.join('?' * len(cuisine_keys))})")
+            params.extend(cuisine_keys)
+
+        if blocked:
+            bits, imported_from = self._diet_layout()
+            if not bits:
+                raise ValueError("blocked filtering needs recipes imported with diet_mask")
+            if diet_source is not None and imported_from != diet_source:
+                raise ValueError(
+                    "diet masks in the recipe store predate the current knowledge files; re-run import_recipes"
+                )
+            mask = sum(1 << bits[name] for name in category_names(blocked) if name in bits)
+            if mask:
+                where.append("(r.diet_mask & ?) = 0")
+                params.append(mask)
+
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        conn = self._conn()
+        (total,) = conn.execute(f"SELECT COUNT(*) FROM {source}{clause}", params).fetchone()
+        rows = conn.execute(
+            f"SELECT r.body FROM {source}{clause} ORDER BY {order} LIMIT ? OFFSET ?",
+            params + [-1 if limit is None else limit, max(offset, 0)],
+        ).fetchall()
+        return {"total": total, "recipes": [json.loads(body) for (body,) in rows]}
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def close(self) -> None:
+        """Close every pooled connection (call once no other thread is using the store)."""
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,196 @@
+"""IVF approximate nearest-neighbour index over the ingredient vector store
+
+Rows of the (L2-normalized) vector store are clustered with spherical
+k-means; each row is filed under its nearest centroid. A query scores the
+centroids, scans only the ``nprobe`` best inverted lists and returns the top
+``k`` by cosine similarity. ``nprobe == n_lists`` is an exact scan.
+
+On-disk format (a directory next to the vector store, ``FORMAT_VERSION`` 1):
+
+    meta.json        format name/version, n_lists, count, dim, vectors meta
+    centroids.npy    float32 (n_lists, dim), L2-normalized
+    list_offsets.npy int64 (n_lists + 1) CSR offsets into list_rows.npy
+    list_rows.npy    int32 (count,) vector-store rows grouped by list
+
+All arrays are opened with ``mmap_mode='r'``.
+"""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..storage import atomic_directory
+from .vector_store import DEFAULT_VECTORS_DIR, IngredientVectors, load_vectors
+
+FORMAT_NAME = "recipeai.ivf_index"
+FORMAT_VERSION = 1
+DEFAULT_INDEX_DIR = DEFAULT_VECTORS_DIR.with_name("ingredient_ivf")
+DEFAULT_NPROBE = 4
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.where(norms == 0, 1.0, norms)
+
+
+def kmeans(vectors: np.ndarray, n_lists: int, iterations: int = 20, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Spherical k-means; returns ``(centroids, assignment)``."""
+    rng = np.random.default_rng(seed)
+    n_lists = max(1, min(n_lists, len(vectors)))
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].astype(np.float32)
+    assignment = np.zeros(len(vectors), dtype=np.int64)
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        empty = np.bincount(assignment, minlength=n_lists) == 0
+        # Re-seed empty lists with the rows worst served by their centroid.
+        if empty.any():
+            fit = np.einsum("ij,ij->i", vectors, centroids[assignment])
+            sums[empty] = vectors[np.argsort(fit)[: int(empty.sum())]]
+        updated = _normalize(sums)
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+    return centroids, np.argmax(vectors @ centroids.T, axis=1)
+
+
+def build_ivf(path: Path, vectors: IngredientVectors, n_lists: Optional[int] = None, seed: int = 0) -> None:
+    """Cluster ``vectors`` and write the index atomically to ``path``."""
+    data = np.asarray(vectors.vectors, dtype=np.float32)
+    if n_lists is None:
+        n_lists = max(1, int(np.sqrt(len(data))))
+    centroids, assignment = kmeans(data, n_lists, seed=seed)
+    rows = np.argsort(assignment, kind="stable").astype(np.int32)
+    offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(assignment, minlength=len(centroids)))
+
+    path = Path(path)
+    with atomic_directory(path) as staging:
+        np.save(staging / "centroids.npy", centroids.astype(np.float32))
+        np.save(staging / "list_offsets.npy", offsets)
+        np.save(staging / "list_rows.npy", rows)
+        meta = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "n_lists": len(centroids),
+            "count": len(data),
+            "dim": int(data.shape[1]),
+            "vectors": vectors.meta,
+        }
+        (staging / "meta.json").write_text(json.dumps(meta, indent=2))
+
+
+class IVFIndex:
+    def __init__(self, path: Path = DEFAULT_INDEX_DIR, vectors: Optional[IngredientVectors] = None):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        if self.meta.get("format") != FORMAT_NAME or self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported ANN index format in {self.path}: {self.meta}")
+        self.vectors = vectors if vectors is not None else load_vectors()
+        # The whole vectors meta, fingerprint included: a rebuilt store of the same
+        # size but another row order would otherwise map lists to the wrong names.
+        if (
+            self.meta["count"] != len(self.vectors)
+            or self.meta["dim"] != self.vectors.dim
+            or self.meta.get("vectors") != self.vectors.meta
+        ):
+            raise ValueError(f"ANN index {self.path} was built for a different vector store; rebuild it")
+        self.centroids = np.load(self.path / "centroids.npy", mmap_mode="r")
+        self._offsets = np.load(self.path / "list_offsets.npy", mmap_mode="r")
+        self._rows = np.load(self.path / "list_rows.npy", mmap_mode="r")
+
+    @property
+    def n_lists(self) -> int:
+        return self.centroids.shape[0]
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = DEFAULT_NPROBE,
+               exclude: Iterable[int] = ()) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top ``k`` rows for one query vector as ``(rows, scores)``, best first
+
+        ``nprobe`` trades recall for latency: how many inverted lists to scan.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        nprobe = max(1, min(nprobe, self.n_lists))
+        coarse = self.centroids @ query
+        probe = np.argpartition(-coarse, nprobe - 1)[:nprobe]
+        candidates = np.concatenate([self._rows[self._offsets[i]:self._offsets[i + 1]] for i in probe])
+        excluded = np.fromiter(exclude, dtype=np.int64)
+        if len(excluded):
+            candidates = candidates[~np.isin(candidates, excluded)]
+        return self._top(candidates, query, k)
+
+    def search_exact(self, query: np.ndarray, k: int = 10, exclude: Iterable[int] = ()) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force reference: scans every row."""
+        candidates = np.arange(len(self.vectors))
+        excluded = np.fromiter(exclude, dtype=np.int64)
+        if len(excluded):
+            candidates = candidates[~np.isin(candidates, excluded)]
+        return self._top(candidates, np.asarray(query, dtype=np.float32), k)
+
+    def _top(self, candidates: np.ndarray, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(candidates) or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        scores = self.vectors.vectors[candidates] @ query
+        k = min(k, len(candidates))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return candidates[best].astype(np.int64), scores[best]
+
+    def neighbours(self, name: str, k: int = 10, nprobe: int = DEFAULT_NPROBE) -> List[Tuple[str, float]]:
+        """Nearest other ingredients to ``name``; [] when it has no vector."""
+        row = self.vectors.row(name)
+        if row is None:
+            return []
+        rows, scores = self.search(self.vectors.vectors[row], k, nprobe, exclude=(row,))
+        return [(self.vectors.name(int(r)), float(s)) for r, s in zip(rows, scores)]
+
+
+def recall_report(index: IVFIndex, k: int = 10, nprobes: Sequence[int] = (1, 2, 4, 8)) -> List[Dict]:
+    """recall@k of ``search`` against ``search_exact``, querying with every stored row."""
+    report = []
+    exact = [set(index.search_exact(index.vectors.vectors[r], k, exclude=(r,))[0].tolist())
+             for r in range(len(index.vectors))]
+    for nprobe in sorted({max(1, min(n, index.n_lists)) for n in nprobes}):
+        hits = total = 0
+        started = time.perf_counter()
+        for r, truth in enumerate(exact):
+            found = index.search(index.vectors.vectors[r], k, nprobe, exclude=(r,))[0]
+            hits += len(truth.intersection(found.tolist()))
+            total += len(truth)
+        elapsed = time.perf_counter() - started
+        report.append({
+            "nprobe": nprobe,
+            "recall_at_k": round(hits / total, 4) if total else 1.0,
+            "us_per_query": round(1e6 * elapsed / max(1, len(exact)), 1),
+        })
+    return report
+
+
+_opened: dict = {}
+
+
+def load_index(path: Path = DEFAULT_INDEX_DIR, vectors: Optional[IngredientVectors] = None) -> IVFIndex:
+    """Process-wide shared handle, reopened when the index or vectors are rebuilt."""
+    path = Path(path).absolute()
+    vectors = vectors if vectors is not None else load_vectors()
+    generation = path.resolve()
+    stat = (generation / "meta.json").stat()
+    stamp = (generation, stat.st_ino, stat.st_mtime_ns, id(vectors))
+    cached = _opened.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _opened[path] = (stamp, IVFIndex(generation, vectors))
+    return cached[1]
+
+
+def default_index() -> Optional[IVFIndex]:
+    """The shipped index, or None when it (or its vector store) has not been built."""
+    try:
+        return load_index()
+    except (FileNotFoundError, ValueError):
+        return None
@@ -1,8 +1,181 @@
-"""Orchestrator: runs the pipeline end-to-end"""
-from .stages import enrichment, intent_parser
+"""Orchestrator: runs the pipeline end-to-end
+
+Stages declare the context keys they read and write; the orchestrator runs
+them as an asyncio DAG, starting each stage as soon as its inputs exist, so
+independent branches (enrichment, nutrition, substitution) overlap and
+end-to-end latency follows the critical path. Blocking stages run in a
+thread or process pool; every stage gets a timeout and a recorded duration.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from ..application.knowledge_base import get_knowledge_base
+from ..metrics import PIPELINE_STAGE_SECONDS
+from .stages import (
+    enrichment,
+    instruction_rewriter,
+    intent_parser,
+    seasoning_balancer,
+    substitution,
+    transformation,
+    validator,
+)
+
+INLINE, THREAD, PROCESS = "inline", "thread", "process"
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    executor: str = THREAD  # inline | thread | process (func must be picklable)
+    timeout: float = 5.0
+
+
+class StageFailed(RuntimeError):
+    def __init__(self, stage: str, reason: str, timings: Dict[str, dict]):
+        super().__init__(f"Stage '{stage}' failed: {reason}")
+        self.stage = stage
+        self.timings = timings
+
+
+def estimate_nutrition(recipe) -> dict:
+    return get_knowledge_base().nutrition.estimate(getattr(recipe, "ingredients", None) or [])
+
+
+DEFAULT_INPUTS = ("user_input", "recipe", "preferences", "target_style", "steps")
+
+DEFAULT_STAGES = (
+    Stage("intent", intent_parser.parse_intent, ("user_input",), ("intent",), INLINE),
+    Stage("enrichment", enrichment.enrich, ("intent",), ("enriched",)),
+    Stage("nutrition", estimate_nutrition, ("recipe",), ("nutrition",)),
+    Stage("substitution", substitution.substitute, ("recipe", "preferences"), ("substituted",)),
+    Stage("transformation", transformation.transform, ("substituted", "target_style"), ("transformed",)),
+    Stage("seasoning", seasoning_balancer.balance, ("transformed",), ("balanced",)),
+    Stage("instructions", instruction_rewriter.rewrite_instructions, ("steps",), ("instructions",)),
+    Stage("validation", validator.validate, ("balanced",), ("valid",)),
+)
+
 
 class Orchestrator:
-    def run(self, user_input: str):
-        intent = intent_parser.parse_intent(user_input)
-        enriched = enrichment.enrich(intent)
-        return enriched
+    def __init__(
+        self,
+        stages: Sequence[Stage] = DEFAULT_STAGES,
+        inputs: Iterable[str] = DEFAULT_INPUTS,
+        max_workers: int = 4,
+    ):
+        self.stages = tuple(stages)
+        self.inputs = frozenset(inputs)
+        self.max_workers = max_workers
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._check_graph()
+
+    def run(self, user_input: str, **inputs) -> dict:
+        """Synchronous entry point; use ``run_async`` from inside an event loop."""
+        return asyncio.run(self.run_async(user_input, **inputs))
+
+    async def run_async(self, user_input: str, **inputs) -> dict:
+        """
+        Execute every stage and return the final context
+
+        The result holds each stage output plus ``timings`` (per-stage
+        wall-clock seconds) and ``total_seconds`` for the whole run.
+        """
+        recipe = inputs.get("recipe")
+        context: Dict[str, Any] = {name: None for name in self.inputs}
+        context["steps"] = list(getattr(recipe, "instructions", None) or [])
+        context.update(inputs, user_input=user_input)
+
+        timings: Dict[str, dict] = {}
+        waiting = list(self.stages)
+        running: Dict[asyncio.Task, Stage] = {}
+        started = time.perf_counter()
+        try:
+            while waiting or running:
+                for stage in [s for s in waiting if all(k in context for k in s.inputs)]:
+                    waiting.remove(stage)
+                    task = asyncio.create_task(self._run_stage(stage, context, timings))
+                    running[task] = stage
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = running.pop(task)
+                    outputs = task.result()
+                    context.update(zip(stage.outputs, outputs))
+        finally:
+            for task in running:
+                task.cancel()
+
+        context["timings"] = timings
+        context["total_seconds"] = time.perf_counter() - started
+        return context
+
+    async def _run_stage(self, stage: Stage, context: Dict[str, Any], timings: Dict[str, dict]) -> tuple:
+        call = partial(stage.func, *(context[k] for k in stage.inputs))
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            if stage.executor == INLINE:
+                result = call()
+            else:
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(self._executor(stage.executor), call)
+                # A timed-out thread keeps running in the background; its result is discarded.
+                result = await asyncio.wait_for(future, stage.timeout)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise StageFailed(stage.name, f"timed out after {stage.timeout}s", timings) from None
+        except Exception as exc:
+            status = "error"
+            raise StageFailed(stage.name, repr(exc), timings) from exc
+        finally:
+            elapsed = time.perf_counter() - start
+            timings[stage.name] = {"seconds": elapsed, "status": status}
+            PIPELINE_STAGE_SECONDS.labels(stage.name, status).observe(elapsed)
+        return (result,) if len(stage.outputs) == 1 else tuple(result)
+
+    def _executor(self, kind: str) -> Executor:
+        if kind == PROCESS:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="pipeline"
+            )
+        return self._thread_pool
+
+    def close(self) -> None:
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = self._process_pool = None
+
+    def _check_graph(self) -> None:
+        available = set(self.inputs)
+        remaining = list(self.stages)
+        seen_outputs = set()
+        for stage in self.stages:
+            if stage.executor not in (INLINE, THREAD, PROCESS):
+                raise ValueError(f"Stage '{stage.name}' has unknown executor {stage.executor!r}")
+            duplicate = seen_outputs.intersection(stage.outputs)
+            if duplicate:
+                raise ValueError(f"Stage '{stage.name}' redefines {sorted(duplicate)}")
+            seen_outputs.update(stage.outputs)
+        # Kahn-style sweep: every stage must become runnable from the declared inputs.
+        while remaining:
+            ready = [s for s in remaining if available.issuperset(s.inputs)]
+            if not ready:
+                names = ", ".join(s.name for s in remaining)
+                raise ValueError(f"Unsatisfiable or cyclic stage inputs: {names}")
+            for stage in ready:
+                remaining.remove(stage)
+                available.update(stage.outputs)
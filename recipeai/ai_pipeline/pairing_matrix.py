@@ -0,0 +1,156 @@
+"""Sparse ingredient pairing matrix (pure-NumPy CSR)
+
+Ingredient ids are the rows of the ingredient vector store, so names resolve
+through ``IngredientVectors.row``. Entry ``(a, b)`` is the positive PMI of
+``a`` and ``b`` appearing in the same recipe; the matrix is symmetric.
+
+On-disk format (a directory next to the vector store, ``FORMAT_VERSION`` 1):
+
+    meta.json     format name/version, count, nnz, vectors meta
+    indptr.npy    int64 (count + 1)
+    indices.npy   int32 (nnz,) column ids, sorted within each row
+    data.npy      float32 (nnz,)
+
+All arrays are opened with ``mmap_mode='r'``.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from ..storage import atomic_directory
+from .vector_store import DEFAULT_VECTORS_DIR, IngredientVectors, load_vectors
+
+FORMAT_NAME = "recipeai.pairing_matrix"
+FORMAT_VERSION = 1
+DEFAULT_PAIRING_DIR = DEFAULT_VECTORS_DIR.with_name("pairing_matrix")
+
+
+class PairingMatrix:
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                 vectors: Optional[IngredientVectors] = None):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.vectors = vectors
+
+    @classmethod
+    def from_recipes(cls, recipes: Iterable[Sequence[str]], vectors: IngredientVectors) -> "PairingMatrix":
+        """PPMI over within-recipe co-occurrence; names without a vector are skipped."""
+        n = len(vectors)
+        codes = []
+        for ingredients in recipes:
+            rows = np.unique(vectors.rows(ingredients))
+            rows = rows[rows >= 0]
+            a, b = np.meshgrid(rows, rows, indexing="ij")
+            off_diagonal = a != b
+            codes.append(a[off_diagonal] * n + b[off_diagonal])
+        pairs, counts = np.unique(np.concatenate(codes) if codes else np.zeros(0, np.int64), return_counts=True)
+        rows, cols = pairs // n, pairs % n
+        counts = counts.astype(np.float64)
+        marginals = np.bincount(rows, weights=counts, minlength=n)
+        total = counts.sum()
+        with np.errstate(divide="ignore"):
+            pmi = np.log(counts * total / (marginals[rows] * marginals[cols]))
+        keep = pmi > 0
+        rows, cols, pmi = rows[keep], cols[keep], pmi[keep]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(rows, minlength=n))
+        # np.unique sorted the codes, so entries are already row-major with sorted columns.
+        return cls(indptr, cols.astype(np.int32), pmi.astype(np.float32), vectors)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_PAIRING_DIR, vectors: Optional[IngredientVectors] = None) -> "PairingMatrix":
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        if meta.get("format") != FORMAT_NAME or meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported pairing matrix format in {path}: {meta}")
+        vectors = vectors if vectors is not None else load_vectors()
+        # Compare the whole vectors meta (its fingerprint covers the row order), not just the count.
+        if meta["count"] != len(vectors) or meta.get("vectors") != vectors.meta:
+            raise ValueError(f"Pairing matrix {path} was built for a different vector store; rebuild it")
+        return cls(
+            np.load(path / "indptr.npy", mmap_mode="r"),
+            np.load(path / "indices.npy", mmap_mode="r"),
+            np.load(path / "data.npy", mmap_mode="r"),
+            vectors,
+        )
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        with atomic_directory(path) as staging:
+            np.save(staging / "indptr.npy", np.asarray(self.indptr, dtype=np.int64))
+            np.save(staging / "indices.npy", np.asarray(self.indices, dtype=np.int32))
+            np.save(staging / "data.npy", np.asarray(self.data, dtype=np.float32))
+            meta = {
+                "format": FORMAT_NAME,
+                "version": FORMAT_VERSION,
+                "count": len(self.indptr) - 1,
+                "nnz": int(len(self.indices)),
+                "vectors": self.vectors.meta if self.vectors is not None else None,
+            }
+            (staging / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def pairing(self, a: int, b: int) -> float:
+        start, end = self.indptr[a], self.indptr[a + 1]
+        pos = start + np.searchsorted(self.indices[start:end], b)
+        return float(self.data[pos]) if pos < end and self.indices[pos] == b else 0.0
+
+    def score(self, candidates: np.ndarray, context: np.ndarray) -> np.ndarray:
+        """
+        Summed pairing of each candidate row with the context rows
+
+        One gather over the candidates' CSR rows: every stored entry is tagged
+        with its candidate's position, entries whose column is in the context
+        are kept, and ``bincount`` sums them per candidate.
+        """
+        candidates = np.asarray(candidates, dtype=np.int64)
+        context = np.asarray(context, dtype=np.int64)
+        if not len(candidates) or not len(context):
+            return np.zeros(len(candidates), dtype=np.float64)
+        starts = np.asarray(self.indptr[candidates])
+        lengths = np.asarray(self.indptr[candidates + 1]) - starts
+        owner = np.repeat(np.arange(len(candidates)), lengths)
+        positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths - starts, lengths)
+        hit = np.isin(self.indices[positions], context)
+        return np.bincount(owner[hit], weights=self.data[positions[hit]], minlength=len(candidates))
+
+    def score_names(self, candidates: Sequence[str], context: Iterable[str]) -> np.ndarray:
+        """``score`` by name; unknown candidates score 0, unknown context names are ignored."""
+        rows = self.vectors.rows(candidates)
+        context_rows = self.vectors.rows(context)
+        scores = np.zeros(len(rows))
+        known = rows >= 0
+        scores[known] = self.score(rows[known], context_rows[context_rows >= 0])
+        return scores
+
+
+_opened: dict = {}
+
+
+def load_pairing(path: Path = DEFAULT_PAIRING_DIR, vectors: Optional[IngredientVectors] = None) -> PairingMatrix:
+    """Process-wide shared handle, reopened when the matrix or vectors are rebuilt."""
+    path = Path(path).absolute()
+    vectors = vectors if vectors is not None else load_vectors()
+    generation = path.resolve()
+    stat = (generation / "meta.json").stat()
+    stamp = (generation, stat.st_ino, stat.st_mtime_ns, id(vectors))
+    cached = _opened.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _opened[path] = (stamp, PairingMatrix.load(generation, vectors))
+    return cached[1]
+
+
+def default_pairing() -> Optional[PairingMatrix]:
+    """The shipped pairing matrix, or None when it (or its vector store) has not been built."""
+    try:
+        return load_pairing()
+    except (FileNotFoundError, ValueError):
+        return None
@@ -0,0 +1,147 @@
+"""Memory-mapped ingredient vector store
+
+On-disk format (a directory, ``FORMAT_VERSION`` 1):
+
+    meta.json          format name/version, dim, count, dtype, fingerprint (a hash
+                       of the names in row order and the vectors)
+    vectors.npy        float32 (count, dim), L2-normalized rows
+    names.bin          UTF-8 names concatenated in row order
+    name_offsets.npy   int64 (count + 1) byte offsets into names.bin
+    name_order.npy     int32 (count,) rows sorted by name, for binary search
+
+Everything is opened with ``mmap_mode='r'``, so N workers share one
+page-cache copy and opening the store costs no unpickling. Name lookups
+binary-search the mapped arrays instead of building a per-process dict.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from ..storage import atomic_directory
+
+FORMAT_NAME = "recipeai.ingredient_vectors"
+FORMAT_VERSION = 1
+DEFAULT_VECTORS_DIR = Path(__file__).resolve().parent / "models" / "ingredient_vectors"
+
+
+def save_vectors(path: Path, names: Sequence[str], vectors: np.ndarray, extra: Optional[dict] = None) -> None:
+    """Write a store atomically: build in a sibling dir, then flip the store link to it."""
+    path = Path(path)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if vectors.ndim != 2 or vectors.shape[0] != len(names):
+        raise ValueError(f"Expected ({len(names)}, dim) vectors, got {vectors.shape}")
+    if len(set(names)) != len(names):
+        raise ValueError("Ingredient names must be unique")
+
+    encoded = [n.encode("utf-8") for n in names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    order = np.array(sorted(range(len(names)), key=encoded.__getitem__), dtype=np.int32)
+    # Stores derived from these rows (ANN index, pairing matrix) record this and refuse a mismatch.
+    digest = hashlib.sha256(offsets.tobytes())
+    digest.update(b"".join(encoded))
+    digest.update(vectors.tobytes())
+
+    with atomic_directory(path) as staging:
+        np.save(staging / "vectors.npy", vectors)
+        np.save(staging / "name_offsets.npy", offsets)
+        np.save(staging / "name_order.npy", order)
+        (staging / "names.bin").write_bytes(b"".join(encoded))
+        meta = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "dim": int(vectors.shape[1]),
+            "count": len(names),
+            "dtype": "float32",
+            "fingerprint": digest.hexdigest(),
+            **(extra or {}),
+        }
+        (staging / "meta.json").write_text(json.dumps(meta, indent=2))
+
+
+class IngredientVectors:
+    def __init__(self, path: Path = DEFAULT_VECTORS_DIR):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        if self.meta.get("format") != FORMAT_NAME or self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector store format in {self.path}: {self.meta}")
+        self.vectors: np.ndarray = np.load(self.path / "vectors.npy", mmap_mode="r")
+        self._offsets = np.load(self.path / "name_offsets.npy", mmap_mode="r")
+        self._order = np.load(self.path / "name_order.npy", mmap_mode="r")
+        size = (self.path / "names.bin").stat().st_size
+        self._names = (
+            np.memmap(self.path / "names.bin", dtype=np.uint8, mode="r") if size else np.zeros(0, np.uint8)
+        )
+        self.row = lru_cache(maxsize=65536)(self._find_row)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    def __contains__(self, name: str) -> bool:
+        return self.row(name) is not None
+
+    def name(self, row: int) -> str:
+        start, end = self._offsets[row], self._offsets[row + 1]
+        return self._names[start:end].tobytes().decode("utf-8")
+
+    def names(self) -> Iterator[str]:
+        return (self.name(i) for i in range(len(self)))
+
+    def _find_row(self, name: str) -> Optional[int]:
+        """Binary search over the name-sorted row order; None when unknown."""
+        target = name.strip().lower().encode("utf-8")
+        lo, hi = 0, len(self._order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row = int(self._order[mid])
+            candidate = self._names[self._offsets[row]:self._offsets[row + 1]].tobytes()
+            if candidate < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._order):
+            row = int(self._order[lo])
+            if self._names[self._offsets[row]:self._offsets[row + 1]].tobytes() == target:
+                return row
+        return None
+
+    def vector(self, name: str) -> Optional[np.ndarray]:
+        """Read-only view into the mapped matrix (no copy)."""
+        row = self.row(name)
+        return None if row is None else self.vectors[row]
+
+    def rows(self, names: Iterable[str]) -> np.ndarray:
+        """Row ids for ``names``; -1 marks unknown names."""
+        return np.array([-1 if (r := self.row(n)) is None else r for n in names], dtype=np.int64)
+
+    def matrix(self, names: Iterable[str]) -> np.ndarray:
+        """Stacked vectors for known names (a copy, since rows are gathered)."""
+        rows = self.rows(names)
+        return self.vectors[rows[rows >= 0]]
+
+
+_opened: dict = {}
+
+
+def load_vectors(path: Path = DEFAULT_VECTORS_DIR) -> IngredientVectors:
+    """Process-wide shared handle per store path, reopened when the store is rebuilt."""
+    # Keyed on the store path itself (not the generation it links to), so a
+    # rebuild replaces the entry instead of leaving the old one mapped.
+    path = Path(path).absolute()
+    generation = path.resolve()
+    stat = (generation / "meta.json").stat()
+    stamp = (generation, stat.st_ino, stat.st_mtime_ns)
+    cached = _opened.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _opened[path] = (stamp, IngredientVectors(generation))
+    return cached[1]
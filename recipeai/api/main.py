@@ -1,14 +1,38 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from recipeai.api.middleware.logging import AccessLogMiddleware, start_access_log, stop_access_log
+from recipeai.api.middleware.metrics import MetricsMiddleware
+from recipeai.api.middleware.response_cache import ResponseCacheMiddleware
 from recipeai.api.routes import customize, recipes
+from recipeai.application.knowledge_base import knowledge_store
+from recipeai.metrics import REGISTRY
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the knowledge base (and its search index) before the first request arrives.
+    knowledge_store.current()
+    start_access_log()
+    try:
+        yield
+    finally:
+        stop_access_log()
+
 
 app = FastAPI(
     title="Recipe AI API",
     description="MVP: Recipe customization with dietary substitution",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
+# Innermost, so CORS headers (which depend on the request) are never cached.
+app.add_middleware(ResponseCacheMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -17,6 +41,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(AccessLogMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Routes
 app.include_router(customize.router)
@@ -33,3 +59,7 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
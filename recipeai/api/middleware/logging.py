@@ -1,7 +1,92 @@
-"""Logging middleware (placeholder)"""
-from fastapi import Request
+"""Logging middleware: structured access log written off the event loop
 
-async def log_request(request: Request, call_next):
-    print(f"[LOG] {request.method} {request.url}")
-    response = await call_next(request)
-    return response
+Requests are recorded as one JSON object per line. The middleware only
+enqueues a ``LogRecord`` (a ``QueueHandler``); formatting and the actual
+write happen on a ``QueueListener`` thread started by ``start_access_log``.
+"""
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from time import perf_counter
+from typing import Optional
+
+from .metrics import route_template
+
+access_logger = logging.getLogger("recipeai.access")
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, separators=(",", ":"))
+
+
+def start_access_log(handler: Optional[logging.Handler] = None) -> QueueListener:
+    """Route ``recipeai.access`` records through a queue to ``handler`` (stderr by default)."""
+    global _listener
+    if _listener is not None:
+        return _listener
+    if handler is None:
+        handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter())
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    access_logger.addHandler(QueueHandler(log_queue))
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_access_log() -> None:
+    """Flush queued records and detach the queue handler."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in list(access_logger.handlers):
+        if isinstance(handler, QueueHandler):
+            access_logger.removeHandler(handler)
+    _listener = None
+
+
+class AccessLogMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not access_logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            client = scope.get("client")
+            access_logger.info("request", extra={"fields": {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_template(scope),
+                "status": status,
+                "duration_ms": round((perf_counter() - start) * 1000, 3),
+                "client": client[0] if client else None,
+            }})
@@ -0,0 +1,46 @@
+"""Metrics middleware: per-route latency and in-flight requests
+
+Implemented as a raw ASGI middleware rather than ``BaseHTTPMiddleware`` so
+it adds no extra task or body buffering; the cost per request is two clock
+reads and a couple of dict lookups.
+"""
+from time import perf_counter
+
+from recipeai.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope) -> str:
+    """Route path template (``/api/recipes/{recipe_id}``) to keep label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self._in_flight = HTTP_IN_FLIGHT.labels()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self._in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._in_flight.dec()
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], route_template(scope), str(status)
+            ).observe(perf_counter() - start)
@@ -0,0 +1,118 @@
+"""Response cache middleware: pre-encoded bodies, strong ETags, 304s
+
+GET responses under the configured path prefixes only change when the
+knowledge base (or the configured recipe store) changes, so the first 200
+for a ``(path, normalized query, knowledge-base version, recipe store
+generation)`` key is kept as its encoded bytes and later requests are
+answered from the cache without reaching the router. Every cached response carries a strong ETag (a
+hash of the body) and ``Cache-Control``; a matching ``If-None-Match`` gets a
+bodiless 304. A knowledge-base reload bumps the version and re-importing
+into the configured SQLite store bumps its generation, so stale entries are
+simply never asked for again and age out of the LRU.
+
+Raw ASGI like the metrics middleware: hits cost one dict lookup and a
+couple of ``send`` calls.
+"""
+import hashlib
+from typing import Callable, Iterable, List, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from recipeai.adapters.cache import BoundedCache
+from recipeai.application.knowledge_base import knowledge_store
+from recipeai.application.recipe_store import recipe_store_generation
+from recipeai.metrics import REGISTRY
+
+DEFAULT_PREFIXES = ("/api/recipes/",)
+
+
+def normalize_query(query_string: bytes) -> str:
+    """Query parameters in a canonical order, so ``?b=1&a=2`` and ``?a=2&b=1`` share an entry."""
+    return urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+
+
+def _etag_matches(header: bytes, etag: bytes) -> bool:
+    """``If-None-Match`` uses weak comparison, so ``W/"x"`` matches ``"x"``."""
+    for candidate in header.split(b","):
+        candidate = candidate.strip()
+        if candidate == b"*" or candidate.removeprefix(b"W/") == etag:
+            return True
+    return False
+
+
+class ResponseCacheMiddleware:
+    def __init__(
+        self,
+        app,
+        prefixes: Iterable[str] = DEFAULT_PREFIXES,
+        max_age: int = 60,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 50_000,
+        version: Callable[[], int] = lambda: knowledge_store.current().version,
+        store_generation: Callable[[], object] = recipe_store_generation,
+    ):
+        self.app = app
+        self.prefixes = tuple(prefixes)
+        self.cache_control = f"public, max-age={max_age}".encode()
+        self.version = version
+        self.store_generation = store_generation
+        # key -> (route, headers, body, etag); weighed by body size.
+        self.cache = BoundedCache(max_entries=max_entries, max_bytes=max_bytes, weigher=lambda entry: len(entry[2]))
+        REGISTRY.register_cache("http_responses", self.cache.stats)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith(self.prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        key = (
+            scope["path"],
+            normalize_query(scope.get("query_string", b"")),
+            self.version(),
+            self.store_generation(),
+        )
+        if_none_match = next((v for k, v in scope["headers"] if k == b"if-none-match"), None)
+        entry = self.cache.get(key)
+        if entry is not None:
+            route, headers, body, etag = entry
+            if route is not None:
+                scope["route"] = route  # keep per-route metrics labels for cached answers
+            await self._respond(send, headers, body, etag, if_none_match, b"HIT")
+            return
+
+        start = None
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    start = False
+                    await send(message)
+                    return
+                start = message
+                return
+            if start is False or message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            etag = b'"' + hashlib.blake2b(body, digest_size=16).hexdigest().encode() + b'"'
+            headers = [(k, v) for k, v in start["headers"] if k not in (b"etag", b"cache-control")]
+            headers += [(b"etag", etag), (b"cache-control", self.cache_control)]
+            self.cache.set(key, (scope.get("route"), headers, body, etag))
+            await self._respond(send, headers, body, etag, if_none_match, b"MISS")
+
+        await self.app(scope, receive, capture)
+
+    async def _respond(
+        self, send, headers: List[Tuple[bytes, bytes]], body: bytes, etag: bytes, if_none_match, state: bytes
+    ) -> None:
+        if if_none_match is not None and _etag_matches(if_none_match, etag):
+            not_modified = [(k, v) for k, v in headers if k in (b"etag", b"cache-control")]
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified + [(b"x-cache", state)]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": headers + [(b"x-cache", state)]})
+        await send({"type": "http.response.body", "body": body})
@@ -1,79 +1,174 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional, Sequence, Tuple
 
+from recipeai.api.serialization import (
+    MSGPACK, NDJSON, encode, encode_ingredient, encode_stream, encode_substitution, media_type,
+)
+from recipeai.adapters.recipestore.sqlite import SQLiteRecipeStore
 from recipeai.application.customize_recipe import CustomizeRecipe
-from recipeai.core.entities.Recipe import Recipe, Ingredient
+from recipeai.application.knowledge_base import KnowledgeBase, current_knowledge_base
+from recipeai.application.recipe_store import get_recipe_store
+from recipeai.core.entities.Recipe import Recipe
 from recipeai.core.entities.UserPreference import UserPreference
 
 router = APIRouter(prefix="/api/customize", tags=["customize"])
 
-class CustomizeRequest(BaseModel):
-    recipe_id: str
+# Batch results whose nutrition is computed together before they are streamed.
+NUTRITION_CHUNK = 64
+
+class PreferenceProfile(BaseModel):
     dietary_type: str
     allergens: List[str] = []
     blocked_ingredients: List[str] = []
     flavor_preferences: dict = {}
 
+class CustomizeRequest(PreferenceProfile):
+    recipe_id: str
+    include_nutrition: bool = False
+
+class BatchCustomizeRequest(BaseModel):
+    recipe_ids: List[str] = []
+    profiles: List[PreferenceProfile]
+    # Explicit (recipe_id, profile index) pairs; the full cross product when omitted.
+    pairs: Optional[List[Tuple[str, int]]] = None
+    include_nutrition: bool = False
+
 class CustomizeResponse(BaseModel):
     success: bool
     modified_recipe: dict
     substitutions: List[dict]
     summary: str
+    nutrition: Optional[dict] = None  # before/after/delta, when include_nutrition is set
 
-@router.post("/", response_model=CustomizeResponse)
-async def customize_recipe(request: CustomizeRequest):
+@router.post("/", response_model=CustomizeResponse, responses={200: {"content": {MSGPACK: {}}}})
+async def customize_recipe(
+    request: CustomizeRequest,
+    knowledge: KnowledgeBase = Depends(current_knowledge_base),
+    store: Optional[SQLiteRecipeStore] = Depends(get_recipe_store),
+    accept: Optional[str] = Header(None),
+):
     """
     Customize a recipe based on dietary preferences
+
+    The body is encoded directly (orjson, or MessagePack when the Accept
+    header asks for it) in the ``CustomizeResponse`` shape, without
+    re-validating it against the model.
     """
-    # Mock: Get recipe from database (implement later)
-    # For MVP, use hardcoded sample recipe
-    recipe = _get_sample_recipe(request.recipe_id)
+    media = media_type(accept)
+    (recipe,) = await _load_recipes([request.recipe_id], knowledge, store)
+
+    customizer = CustomizeRecipe(knowledge)
+    result = customizer.execute_memoized(recipe, _to_preferences(request))
+    body = _response_body(recipe, result)
+    body['nutrition'] = knowledge.nutrition.compare_batch(
+        [(recipe.ingredients, result['modified_ingredients'])]
+    )[0] if request.include_nutrition else None
     
-    preferences = UserPreference(
+    return Response(encode(body, media), media_type=media)
+
+@router.post("/batch")
+async def customize_batch(
+    request: BatchCustomizeRequest,
+    knowledge: KnowledgeBase = Depends(current_knowledge_base),
+    store: Optional[SQLiteRecipeStore] = Depends(get_recipe_store),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Customize many recipes for many preference profiles, streamed as NDJSON
+
+    Each line carries the recipe id and profile index it answers. Ingredient
+    decisions are resolved once per profile and shared across recipes. With
+    ``Accept: application/msgpack`` the stream is back-to-back MessagePack
+    objects instead.
+    """
+    media = media_type(accept)
+    if request.pairs is None:
+        recipe_ids = list(dict.fromkeys(request.recipe_ids))
+        pairs = None
+    else:
+        recipe_ids = list(dict.fromkeys(recipe_id for recipe_id, _ in request.pairs))
+        for _, profile_index in request.pairs:
+            if not 0 <= profile_index < len(request.profiles):
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Profile index {profile_index} out of range"
+                )
+        position = {recipe_id: i for i, recipe_id in enumerate(recipe_ids)}
+        pairs = [(position[recipe_id], p) for recipe_id, p in request.pairs]
+
+    recipes = await _load_recipes(recipe_ids, knowledge, store)
+    profiles = [_to_preferences(profile) for profile in request.profiles]
+    customizer = CustomizeRecipe(knowledge)
+
+    def bodies():
+        results = customizer.execute_batch(recipes, profiles, pairs, memoize=True)
+        if not request.include_nutrition:
+            for recipe_index, profile_index, result in results:
+                yield _batch_body(recipe_ids[recipe_index], profile_index, recipes[recipe_index], result)
+            return
+        # Nutrition for each chunk of results is one vectorized compare_batch call.
+        chunk = []
+        for item in results:
+            chunk.append(item)
+            if len(chunk) == NUTRITION_CHUNK:
+                yield from _with_nutrition(knowledge, recipe_ids, recipes, chunk)
+                chunk = []
+        yield from _with_nutrition(knowledge, recipe_ids, recipes, chunk)
+
+    return StreamingResponse(encode_stream(bodies(), media), media_type=MSGPACK if media == MSGPACK else NDJSON)
+
+async def _load_recipes(
+    recipe_ids: Sequence[str], knowledge: KnowledgeBase, store: Optional[SQLiteRecipeStore]
+) -> List[Recipe]:
+    """Recipes by id from the configured recipe store, like ``/api/recipes/scale``; 404 names any unknown id."""
+    if store is not None:
+        stored = await run_in_threadpool(lambda: {i: store.get_raw(i) for i in recipe_ids})
+        to_recipe = store.to_recipe
+    else:
+        stored = {i: knowledge.recipes_by_id.get(i) for i in recipe_ids}
+        to_recipe = knowledge.to_recipe
+    unknown = [i for i in recipe_ids if stored[i] is None]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Recipe not found: {', '.join(unknown)}")
+    return [to_recipe(stored[i]) for i in recipe_ids]
+
+def _batch_body(recipe_id: str, profile_index: int, recipe: Recipe, result: dict) -> dict:
+    body = _response_body(recipe, result)
+    body['recipe_id'] = recipe_id
+    body['profile'] = profile_index
+    return body
+
+def _with_nutrition(knowledge: KnowledgeBase, recipe_ids: List[str], recipes: List[Recipe], chunk: list):
+    if not chunk:
+        return
+    comparisons = knowledge.nutrition.compare_batch(
+        [(recipes[recipe_index].ingredients, result['modified_ingredients']) for recipe_index, _, result in chunk]
+    )
+    for (recipe_index, profile_index, result), nutrition in zip(chunk, comparisons):
+        body = _batch_body(recipe_ids[recipe_index], profile_index, recipes[recipe_index], result)
+        body['nutrition'] = nutrition
+        yield body
+
+def _to_preferences(profile: PreferenceProfile) -> UserPreference:
+    return UserPreference(
         user_id="temp",
-        dietary_type=request.dietary_type,
-        allergens=request.allergens,
-        blocked_ingredients=request.blocked_ingredients,
-        flavor_preferences=request.flavor_preferences
+        dietary_type=profile.dietary_type,
+        allergens=profile.allergens,
+        blocked_ingredients=profile.blocked_ingredients,
+        flavor_preferences=profile.flavor_preferences
     )
-    
-    customizer = CustomizeRecipe()
-    result = customizer.execute(recipe, preferences)
-    
-    return CustomizeResponse(
-        success=True,
-        modified_recipe={
+
+def _response_body(recipe: Recipe, result: dict) -> dict:
+    return {
+        'success': True,
+        'modified_recipe': {
             'name': recipe.name,
-            'ingredients': [
-                {'name': i.name, 'quantity': i.quantity, 'unit': i.unit}
-                for i in result['modified_ingredients']
-            ],
+            'ingredients': [encode_ingredient(i) for i in result['modified_ingredients']],
             'instructions': result['instructions']
         },
-        substitutions=result['substitutions'],
-        summary=result['customization_summary']
-    )
-
-def _get_sample_recipe(recipe_id: str) -> Recipe:
-    """Mock recipe - replace with DB call"""
-    return Recipe(
-        id="1",
-        name="Chicken Pasta",
-        ingredients=[
-            Ingredient("chicken", "200", "g", ["meat", "protein"]),
-            Ingredient("pasta", "300", "g", ["grain"]),
-            Ingredient("parmesan", "50", "g", ["dairy"]),
-            Ingredient("garlic", "3", "cloves", ["vegan", "aromatic"]),
-            Ingredient("olive oil", "2", "tbsp", ["vegan", "fat"])
-        ],
-        instructions=[
-            "Cook pasta according to package",
-            "Sauté chicken in olive oil",
-            "Add garlic and cook until fragrant",
-            "Combine pasta and chicken",
-            "Top with parmesan"
-        ],
-        cuisine="Italian",
-        dietary_tags=[]
-    )
+        'substitutions': [encode_substitution(sub) for sub in result['substitutions']],
+        'summary': result['customization_summary']
+    }
@@ -1,34 +1,141 @@
-from fastapi import APIRouter
-from typing import List
-import json
-from pathlib import Path
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+
+from recipeai.adapters.recipestore.sqlite import SQLiteRecipeStore
+from recipeai.application.knowledge_base import KnowledgeBase, current_knowledge_base
+from recipeai.application.recipe_store import get_recipe_store
+from recipeai.application.scale_recipes import ScaleRecipes
 
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
-RECIPE_DATA_PATH = Path(__file__).resolve().parents[2] / "knowledge" / "recipes.json"
+class ScaleIngredient(BaseModel):
+    name: str
+    quantity: str = ""
+    unit: str = ""
+
+class ScaleItem(BaseModel):
+    recipe_id: Optional[str] = None
+    # Inline ingredients; the stored recipe's ingredients when omitted.
+    ingredients: Optional[List[ScaleIngredient]] = None
+    servings: Optional[float] = Field(None, gt=0)  # defaults to the stored recipe's servings
+    target_servings: float = Field(gt=0)
+
+class ScaleRequest(BaseModel):
+    recipes: List[ScaleItem]
+    units: str = Field("original", pattern="^(original|metric)$")
+
 
 @router.get("/search")
-async def search_recipes(query: str = ""):
+async def search_recipes(
+    query: str = "",
+    ingredient: List[str] = Query([]),
+    cuisine: List[str] = Query([]),
+    tag: List[str] = Query([]),
+    match: str = Query("all", pattern="^(all|any)$"),
+    name_match: str = Query("words", pattern="^(words|start)$"),
+    diet: List[str] = Query([]),
+    exclude_allergens: List[str] = Query([]),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    knowledge: KnowledgeBase = Depends(current_knowledge_base),
+    store: Optional[SQLiteRecipeStore] = Depends(get_recipe_store),
+):
     """
-    Search for recipes (MVP: return mock data)
+    Search recipes by name prefix, ingredients, cuisine and dietary tags
+
+    Every word of ``query`` must start a word of the recipe name, in any
+    order; ``name_match=start`` restores matching the start of the whole
+    name instead.
+
+    ``diet`` (repeatable, e.g. vegan and gluten-free) and ``exclude_allergens``
+    keep only recipes compatible with every constraint, judged from their
+    ingredients by the dietary constraint engine. With a SQLite recipe
+    store configured, text queries are full-text ranked instead.
     """
-    # Mock data - replace with RecipeDB API call
-    with RECIPE_DATA_PATH.open() as f:
-        recipes = json.load(f)
-    
-    q = query.strip().lower()
-    if q:
-        recipes = [r for r in recipes if r["name"].lower().startswith(q)]
-    
-    return {"recipes": recipes}
+    unknown = [a for a in exclude_allergens if a.lower() not in knowledge.allergens]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown allergen group: {unknown[0]}")
+    try:
+        blocked = knowledge.dietary.blocked_mask(diet, exclude_allergens)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    criteria = dict(
+        query=query,
+        ingredients=ingredient,
+        cuisines=cuisine,
+        tags=tag,
+        match=match,
+        offset=offset,
+        limit=limit,
+        blocked=blocked,
+        name_match=name_match,
+    )
+    if store is not None:
+        try:
+            result = await run_in_threadpool(store.find, **criteria, diet_source=knowledge.diet_fingerprint)
+        except ValueError as e:  # the store's diet masks are missing or stale
+            raise HTTPException(status_code=422, detail=str(e))
+    else:
+        result = knowledge.recipe_index.search(**criteria)
+    return {
+        "recipes": result["recipes"],
+        "total": result["total"],
+        "offset": offset,
+        "limit": limit,
+    }
+
+@router.post("/scale")
+async def scale_recipes(
+    request: ScaleRequest,
+    knowledge: KnowledgeBase = Depends(current_knowledge_base),
+    store: Optional[SQLiteRecipeStore] = Depends(get_recipe_store),
+):
+    """
+    Rescale many recipes to new serving counts in one call
+
+    ``units="metric"`` also converts mass and volume units to g/kg and ml/l.
+    Quantities without a numeric amount are returned unchanged. Recipe ids
+    resolve against the configured recipe store, like ``GET /{recipe_id}``.
+    """
+    recipe_ids = {item.recipe_id for item in request.recipes if item.recipe_id is not None}
+    if store is not None:
+        stored = await run_in_threadpool(lambda: {i: store.get_raw(i) for i in recipe_ids})
+        to_recipe = store.to_recipe
+    else:
+        stored = {i: knowledge.recipes_by_id.get(i) for i in recipe_ids}
+        to_recipe = knowledge.to_recipe
+    items = []
+    for item in request.recipes:
+        raw = stored.get(item.recipe_id)
+        if item.ingredients is not None:
+            ingredients = [i.model_dump() for i in item.ingredients]
+        elif raw is not None:
+            ingredients = to_recipe(raw).ingredients
+        else:
+            raise HTTPException(status_code=404, detail=f"Recipe not found: {item.recipe_id}")
+        servings = item.servings or (raw or {}).get("servings")
+        if not servings:
+            raise HTTPException(status_code=422, detail=f"servings is required for recipe {item.recipe_id}")
+        items.append((ingredients, servings, item.target_servings))
+
+    scaled = ScaleRecipes(knowledge).execute_batch(items, request.units)
+    for item, result in zip(request.recipes, scaled):
+        result["recipe_id"] = item.recipe_id
+    return {"recipes": scaled}
 
 @router.get("/{recipe_id}")
-async def get_recipe(recipe_id: str):
+async def get_recipe(
+    recipe_id: str,
+    knowledge: KnowledgeBase = Depends(current_knowledge_base),
+    store: Optional[SQLiteRecipeStore] = Depends(get_recipe_store),
+):
     """Get recipe by ID"""
-    # Mock - replace with DB
-    return {
-        "id": recipe_id,
-        "name": "Sample Recipe",
-        "ingredients": [],
-        "instructions": []
-    }
+    if store is not None:
+        recipe = await run_in_threadpool(store.get_raw, recipe_id)
+    else:
+        recipe = knowledge.recipes_by_id.get(recipe_id)
+    if recipe is None:
+        raise HTTPException(status_code=404, detail=f"Recipe not found: {recipe_id}")
+    return recipe
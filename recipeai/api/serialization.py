@@ -0,0 +1,136 @@
+"""Fast response encoding for customize results
+
+Routes that return large nested payloads build plain dicts with the
+encoders below and hand them to ``encode``, which renders them with orjson
+(stdlib ``json`` when it is not installed) in one call, bypassing
+response-model validation and ``jsonable_encoder``. The encoders are
+precomputed per entity: each knows exactly which attributes go on the wire,
+so there is no per-object introspection.
+
+Clients can ask for MessagePack with ``Accept: application/msgpack`` (or
+``application/x-msgpack``), weighed against JSON by q-value. The backend
+image installs ``msgpack``; without it such requests fall back to JSON when
+the client accepts it and get a 406 otherwise.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from fastapi import HTTPException
+
+from recipeai.core.entities.Recipe import Ingredient, Recipe
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships in the image
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack ships in the image
+    msgpack = None
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+
+def _getter(*fields: str) -> Callable[[Any], dict]:
+    """An encoder that copies exactly ``fields`` from an object into a dict."""
+    def encode(obj) -> dict:
+        return {field: getattr(obj, field) for field in fields}
+    return encode
+
+
+encode_ingredient: Callable[[Ingredient], dict] = _getter("name", "quantity", "unit")
+_encode_recipe_fields = _getter("id", "name", "cuisine", "instructions", "dietary_tags")
+
+
+def encode_recipe(recipe: Recipe) -> dict:
+    body = _encode_recipe_fields(recipe)
+    body["ingredients"] = [encode_ingredient(i) for i in recipe.ingredients]
+    return body
+
+
+def encode_substitution(sub: dict) -> dict:
+    """The wire shape of one substitution record (drops any internal keys)."""
+    return {
+        "original": sub["original"],
+        "substitute": sub["substitute"],
+        "reason": sub["reason"],
+        "confidence": sub["confidence"],
+    }
+
+
+if orjson is not None:
+    def dumps(body: Any) -> bytes:
+        return orjson.dumps(body)
+else:  # pragma: no cover
+    def dumps(body: Any) -> bytes:
+        return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Accept entries that admit a JSON body, with their specificity.
+_JSON_RANGES = {JSON: 2, NDJSON: 2, "application/*": 1, "*/*": 0}
+
+
+def _preference(accept: str, ranges: dict) -> Tuple[float, int]:
+    """Best ``(q, specificity)`` the Accept header gives any of ``ranges``; ``(0, -1)`` when none."""
+    best = (0.0, -1)
+    for entry in accept.split(","):
+        media, _, params = entry.strip().partition(";")
+        specificity = ranges.get(media.strip().lower())
+        if specificity is None:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        best = max(best, (q, specificity))
+    return best
+
+
+def media_type(accept: Optional[str]) -> str:
+    """
+    MessagePack when the Accept header prefers it over JSON, else JSON
+
+    q-values decide; on a tie the more specific range wins and an explicit
+    ``application/json`` beats MessagePack. Answers 406 only when MessagePack
+    is the sole acceptable type and msgpack is not installed.
+    """
+    if not accept:
+        return JSON
+    packed = _preference(accept, dict.fromkeys(MSGPACK_TYPES, 2))
+    if packed[0] <= 0:
+        return JSON
+    plain = _preference(accept, _JSON_RANGES)
+    if packed <= plain:
+        return JSON
+    if msgpack is None:
+        if plain[0] > 0:
+            return JSON
+        raise HTTPException(status_code=406, detail="MessagePack encoding is not available")
+    return MSGPACK
+
+
+def encode(body: Any, media: str = JSON) -> bytes:
+    if media == MSGPACK:
+        return msgpack.packb(body, use_bin_type=True)
+    return dumps(body)
+
+
+def encode_stream(bodies: Iterable[Any], media: str) -> Iterator[bytes]:
+    """NDJSON lines, or back-to-back MessagePack objects for a streaming unpacker."""
+    if media == MSGPACK:
+        packer = msgpack.Packer(use_bin_type=True)
+        for body in bodies:
+            yield packer.pack(body)
+    else:
+        for body in bodies:
+            yield dumps(body) + b"\n"
@@ -1,54 +1,63 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import List
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from ..core.entities.Recipe import Recipe, Ingredient
 from ..core.entities.UserPreference import UserPreference
+from .knowledge_base import KnowledgeBase, get_knowledge_base
 from .substitute_ingredient import SubstituteIngredient
-import json
 
 class CustomizeRecipe:
-    def __init__(self):
-        self.substitutor = SubstituteIngredient()
-        allergen_path = Path(__file__).resolve().parents[1] / "knowledge" / "allergen_map.json"
-        with allergen_path.open() as f:
-            self.allergens = json.load(f)
+    def __init__(self, knowledge: Optional[KnowledgeBase] = None):
+        self.knowledge = knowledge or get_knowledge_base()
+        self.substitutor = SubstituteIngredient(self.knowledge)
+        self.allergen_matcher = self.knowledge.allergen_matcher
+        self.dietary = self.knowledge.dietary
     
-    def execute(self, recipe: Recipe, preferences: UserPreference) -> dict:
+    def execute(
+        self,
+        recipe: Recipe,
+        preferences: UserPreference,
+        decisions: Optional[Dict[tuple, str]] = None,
+    ) -> dict:
         """
         Customize recipe based on user preferences
+
+        ``decisions`` is an optional per-profile memo of context-free ingredient
+        outcomes (keep / drop / needs a substitute); pass the same dict for
+        every recipe customized with the same preferences to classify each
+        distinct ingredient only once. Substitutes depend on the rest of the
+        recipe and are memoized by ``SubstituteIngredient`` instead.
         """
+        if decisions is None:
+            decisions = {}
         modified_ingredients = []
         substitutions_made = []
+        allergens = frozenset(a.strip().lower() for a in preferences.allergens)
+        context = [i.name for i in recipe.ingredients]
         
         for ingredient in recipe.ingredients:
-            # Check allergens (hard filter)
-            if self._is_allergen(ingredient.name, preferences.allergens):
-                continue  # Skip allergenic ingredients
+            key = (ingredient.name, ingredient.mask)
+            action = decisions.get(key)
+            if action is None:
+                action = decisions[key] = self._decide(ingredient, preferences, allergens)
             
-            # Check dietary constraints
-            if self._violates_diet(ingredient, preferences.dietary_type):
-                # Find substitute
-                sub = self.substitutor.execute(
-                    ingredient.name,
-                    preferences.dietary_type,
-                    [i.name for i in recipe.ingredients]
-                )
-                
-                if sub['substitute']:
-                    modified_ing = Ingredient(
-                        name=sub['substitute'],
-                        quantity=ingredient.quantity,
-                        unit=ingredient.unit,
-                        categories=ingredient.categories
-                    )
-                    modified_ingredients.append(modified_ing)
-                    substitutions_made.append(sub)
-                # else: ingredient removed, no substitute
-            else:
-                # Keep original ingredient
+            if action == 'keep':
                 modified_ingredients.append(ingredient)
+            elif action == 'substitute':
+                sub = self.substitutor.execute(ingredient.name, preferences.dietary_type, context)
+                if sub['substitute'] and self._is_allergen(sub['substitute'], allergens):
+                    sub = self._allergen_free_substitute(sub, preferences.dietary_type, allergens, context)
+                if not sub['substitute']:
+                    continue  # diet violation without a safe substitute: drop it
+                modified_ingredients.append(Ingredient(
+                    name=sub['substitute'],
+                    quantity=ingredient.quantity,
+                    unit=ingredient.unit,
+                    categories=ingredient.categories
+                ))
+                substitutions_made.append(sub)
+            # 'drop': allergen
         
         # Adjust flavors (simple MVP: just add spices)
         if preferences.flavor_preferences.get('spicy', 0) > 0.5:
@@ -64,21 +73,82 @@ class CustomizeRecipe:
             'customization_summary': self._generate_summary(substitutions_made)
         }
     
-    def _is_allergen(self, ingredient: str, allergens: List[str]) -> bool:
-        for allergen in allergens:
-            if ingredient.lower() in self.allergens.get(allergen, []):
-                return True
-        return False
+    def execute_memoized(
+        self,
+        recipe: Recipe,
+        preferences: UserPreference,
+        decisions: Optional[Dict[tuple, str]] = None,
+    ) -> dict:
+        """
+        ``execute``, answered from the knowledge base's result memo when possible
+
+        Results are keyed by ``(recipe.id, preferences.fingerprint(), version)``,
+        so ``recipe.id`` must identify the recipe's content. The memo lives on
+        the knowledge-base snapshot and goes away with it on reload. The
+        returned dict is shared with later hits; treat it as read-only.
+        """
+        key = (recipe.id, preferences.fingerprint(), self.knowledge.version)
+        return self.knowledge.customizations.get_or_compute(
+            key, lambda: self.execute(recipe, preferences, decisions)
+        )
     
-    def _violates_diet(self, ingredient: Ingredient, diet_type: str) -> bool:
-        if diet_type == 'vegan':
-            blocked = ['meat', 'dairy', 'eggs', 'animal-product']
-        elif diet_type == 'vegetarian':
-            blocked = ['meat', 'seafood']
-        else:
-            return False
+    def execute_batch(
+        self,
+        recipes: Sequence[Recipe],
+        profiles: Sequence[UserPreference],
+        pairs: Optional[Iterable[Tuple[int, int]]] = None,
+        memoize: bool = False,
+    ) -> Iterator[Tuple[int, int, dict]]:
+        """
+        Customize many recipes for many preference profiles
+
+        Yields ``(recipe_index, profile_index, result)`` lazily, for every
+        ``pairs`` entry or else the full cross product. Ingredient decisions
+        are shared across all recipes customized for the same profile. With
+        ``memoize`` each result goes through ``execute_memoized``.
+        """
+        if pairs is None:
+            pairs = ((r, p) for r in range(len(recipes)) for p in range(len(profiles)))
+        execute = self.execute_memoized if memoize else self.execute
+        decisions: List[Dict[tuple, str]] = [{} for _ in profiles]
+        for recipe_index, profile_index in pairs:
+            result = execute(
+                recipes[recipe_index], profiles[profile_index], decisions[profile_index]
+            )
+            yield recipe_index, profile_index, result
+    
+    def _decide(
+        self,
+        ingredient: Ingredient,
+        preferences: UserPreference,
+        allergens: FrozenSet[str],
+    ) -> str:
+        # Check allergens (hard filter)
+        if self._is_allergen(ingredient.name, allergens):
+            return 'drop'
         
-        return any(cat in ingredient.categories for cat in blocked)
+        # Check dietary constraints
+        if not self._violates_diet(ingredient, preferences.dietary_type):
+            return 'keep'
+        
+        return 'substitute'
+    
+    def _allergen_free_substitute(
+        self, sub: dict, diet_type: str, allergens: FrozenSet[str], context: List[str]
+    ) -> dict:
+        """Next-ranked substitute that is not itself an allergen for this profile."""
+        for name in self.substitutor.rank(sub['original'], diet_type, context, k=10):
+            if not self._is_allergen(name, allergens):
+                return {**sub, 'substitute': name, 'reason': sub['reason'] + ' (allergen-safe pick)'}
+        return {**sub, 'substitute': None}
+    
+    def _is_allergen(self, ingredient: str, allergens: FrozenSet[str]) -> bool:
+        # One automaton pass finds every group named anywhere in the ingredient.
+        return bool(allergens) and self.allergen_matcher.matches(ingredient, allergens)
+    
+    def _violates_diet(self, ingredient: Ingredient, diet_type: str) -> bool:
+        # Diets such as gluten-free block allergen groups rather than categories.
+        return self.knowledge.violates(ingredient.name, diet_type, ingredient.mask)
     
     def _generate_summary(self, substitutions: List[dict]) -> str:
         if not substitutions:
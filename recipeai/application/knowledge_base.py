@@ -0,0 +1,301 @@
+"""Application: process-wide knowledge-base snapshot
+
+Every ``knowledge/*.json`` file is parsed once into an immutable
+``KnowledgeBase`` whose lookups are pre-lowercased frozensets, tuples and
+read-only mappings. ``KnowledgeBaseStore`` hands out the current snapshot
+and swaps in a new one (with a bumped ``version``) when the files change.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+from .. import metrics
+from ..adapters.cache import BoundedCache
+from ..adapters.nutrition.calculator import NutritionCalculator
+from ..ai_pipeline.ann_index import DEFAULT_INDEX_DIR, IVFIndex, default_index
+from ..ai_pipeline.pairing_matrix import DEFAULT_PAIRING_DIR, PairingMatrix, default_pairing
+from ..ai_pipeline.vector_store import DEFAULT_VECTORS_DIR
+from ..core.domain_services.AllergenMatcher import AllergenMatcher
+from ..core.domain_services.CategoryRegistry import category_mask
+from ..core.domain_services.DietaryEngine import DietaryEngine, allergen_mask
+from ..core.domain_services.RecipeSearchIndex import RecipeSearchIndex
+from ..core.entities.Recipe import Ingredient, Recipe
+
+KNOWLEDGE_DIR = Path(__file__).resolve().parents[1] / "knowledge"
+
+# Shipped model stores whose rebuilds also turn the snapshot over (see KnowledgeBase.ann_index).
+MODEL_DIRS = (DEFAULT_VECTORS_DIR, DEFAULT_INDEX_DIR, DEFAULT_PAIRING_DIR)
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value):
+    """Recursively convert parsed JSON into read-only containers."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class KnowledgeBase:
+    version: int
+    allergens: Mapping[str, FrozenSet[str]]  # group -> ingredient names
+    allergen_index: Mapping[str, FrozenSet[str]]  # ingredient name -> groups
+    allergen_matcher: AllergenMatcher
+    substitution_rules: Mapping[str, Mapping[str, Tuple[str, ...]]]
+    ingredient_roles: Mapping[str, Mapping]
+    ingredient_categories: Mapping[str, FrozenSet[str]]
+    ingredient_masks: Mapping[str, int]  # name -> CategoryRegistry bitmask of its categories
+    cuisine_styles: Mapping[str, Mapping]
+    recipes: Tuple[dict, ...]
+    recipes_by_id: Mapping[str, dict]
+    recipe_index: RecipeSearchIndex
+    dietary: DietaryEngine  # compiled knowledge/dietary_constraints.json
+    files: Mapping[str, object]  # every knowledge file, frozen, by stem
+    substitutions: BoundedCache  # SubstituteIngredient memo, scoped to this snapshot
+    customizations: BoundedCache  # CustomizeRecipe result memo, scoped to this snapshot
+    nutrition: NutritionCalculator
+    # Hash of the files diet_mask is computed from; stores of precomputed masks record it.
+    diet_fingerprint: str
+
+    # The shipped models are opened (resolved and stat'ed) once per snapshot, not
+    # per request. KnowledgeBaseStore watches their meta.json files along with the
+    # knowledge files, so rebuilding a model turns the snapshot over.
+    @cached_property
+    def ann_index(self) -> Optional[IVFIndex]:
+        return default_index()
+
+    @cached_property
+    def pairing(self) -> Optional[PairingMatrix]:
+        return default_pairing()
+
+    def vocabulary(self) -> Tuple[str, ...]:
+        """Every ingredient name the knowledge files mention, lowercased and sorted."""
+        names = set(self.allergen_index)
+        names.update(self.ingredient_roles)
+        names.update(self.ingredient_categories)
+        for recipe in self.recipes:
+            names.update(i.lower() for i in recipe.get("ingredients", []))
+        for ingredient, by_diet in self.substitution_rules.items():
+            names.add(ingredient)
+            for options in by_diet.values():
+                names.update(o.lower() for o in options)
+        return tuple(sorted(names))
+
+    def diet_mask(self, name: str) -> int:
+        """Category bits plus allergen-group bits of an ingredient name, for ``dietary`` masks."""
+        name = name.lower()
+        return self.ingredient_masks.get(name, 0) | allergen_mask(self.allergen_matcher.groups_for(name))
+
+    def violates(self, name: str, diet: str, categories: Optional[int] = None) -> bool:
+        """Whether ingredient ``name`` breaks ``diet`` (``categories`` defaults to its known mask)."""
+        name = name.lower()
+        if categories is None:
+            categories = self.ingredient_masks.get(name, 0)
+        return self.dietary.violates(diet, categories, allergen_mask(self.allergen_matcher.groups_for(name)))
+
+    def to_recipe(self, raw: Mapping) -> Recipe:
+        """Domain ``Recipe`` for a recipes.json entry, with categories from ingredient_categories.json."""
+        return Recipe(
+            id=str(raw["id"]),
+            name=raw.get("name", ""),
+            ingredients=[
+                Ingredient(name, "", "", sorted(self.ingredient_categories.get(name.lower(), ())))
+                for name in raw.get("ingredients", [])
+            ],
+            instructions=list(raw.get("instructions", [])),
+            cuisine=raw.get("cuisine", ""),
+            dietary_tags=list(raw.get("dietary_tags", [])),
+        )
+
+    @classmethod
+    def load(cls, directory: Path = KNOWLEDGE_DIR, version: int = 0) -> "KnowledgeBase":
+        raw: Dict[str, object] = {}
+        for path in sorted(directory.glob("*.json")):
+            with path.open() as f:
+                raw[path.stem] = json.load(f)
+
+        allergens: Dict[str, FrozenSet[str]] = {}
+        reverse: Dict[str, set] = {}
+        for group, names in raw.get("allergen_map", {}).items():
+            group = group.lower()
+            lowered = frozenset(n.lower() for n in names)
+            allergens[group] = allergens.get(group, frozenset()) | lowered
+            for name in lowered:
+                reverse.setdefault(name, set()).add(group)
+
+        rules = {
+            ingredient.lower(): MappingProxyType({
+                diet.lower(): tuple(options) for diet, options in by_diet.items()
+            })
+            for ingredient, by_diet in raw.get("substitution_rules", {}).items()
+        }
+
+        categories = {
+            k.lower(): frozenset(c.lower() for c in v)
+            for k, v in raw.get("ingredient_categories", {}).items()
+        }
+
+        masks = {k: category_mask(v) for k, v in categories.items()}
+        # Phrases that contain an allergen word without carrying the allergen
+        # ("vegan butter"). They are listed one by one: exempting a whole category
+        # would also exempt whatever else that category holds.
+        exclusions: Dict[str, set] = {
+            group.lower(): {n.lower() for n in names}
+            for group, names in raw.get("allergen_exclusions", {}).get("phrases", {}).items()
+        }
+        matcher = AllergenMatcher(allergens, exclusions=exclusions)
+
+        def diet_mask(name: str) -> int:
+            return masks.get(name, 0) | allergen_mask(matcher.groups_for(name))
+
+        fingerprint = hashlib.sha256(json.dumps(
+            [raw.get(stem, {}) for stem in ("ingredient_categories", "allergen_map", "allergen_exclusions")],
+            sort_keys=True,
+        ).encode()).hexdigest()
+
+        # Recipes stay plain dicts so routes can return them as-is; treat them as read-only.
+        recipes = tuple(raw.get("recipes", []))
+
+        return cls(
+            version=version,
+            allergens=MappingProxyType(allergens),
+            allergen_index=MappingProxyType({k: frozenset(v) for k, v in reverse.items()}),
+            allergen_matcher=matcher,
+            substitution_rules=MappingProxyType(rules),
+            ingredient_roles=_freeze({k.lower(): v for k, v in raw.get("ingredient_roles", {}).items()}),
+            ingredient_categories=MappingProxyType(categories),
+            ingredient_masks=MappingProxyType(masks),
+            cuisine_styles=_freeze({k.lower(): v for k, v in raw.get("cuisine_styles", {}).items()}),
+            recipes=recipes,
+            recipes_by_id=MappingProxyType({str(r["id"]): r for r in recipes}),
+            recipe_index=RecipeSearchIndex(recipes, diet_mask),
+            dietary=DietaryEngine.from_config(raw.get("dietary_constraints", {})),
+            files=MappingProxyType({k: v if k == "recipes" else _freeze(v) for k, v in raw.items()}),
+            substitutions=BoundedCache(max_entries=50_000),
+            customizations=BoundedCache(max_entries=10_000),
+            nutrition=NutritionCalculator(raw.get("nutrition", {}), raw.get("unit_conversions", {})),
+            diet_fingerprint=fingerprint,
+        )
+
+
+class KnowledgeBaseStore:
+    """
+    Holds the current KnowledgeBase and replaces it atomically on reload.
+
+    Readers just grab ``current()``; file mtimes are checked at most once per
+    ``check_interval`` seconds, so the hot path does no I/O or parsing. The
+    ``models`` store directories are watched too: their meta.json is rewritten
+    (and, once published through a link, replaced) on every rebuild.
+    """
+
+    def __init__(
+        self, directory: Path = KNOWLEDGE_DIR, check_interval: float = 1.0, models: Iterable[Path] = MODEL_DIRS
+    ):
+        self.directory = directory
+        self.check_interval = check_interval
+        self.models = tuple(Path(m) for m in models)
+        self._lock = threading.Lock()
+        self._snapshot: Optional[KnowledgeBase] = None
+        self._signature: Tuple = ()
+        self._checked_at = 0.0
+        self._version = 0
+
+    def current(self) -> KnowledgeBase:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.reload()
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            return self.reload_if_changed()
+        return snapshot
+
+    def reload_if_changed(self) -> KnowledgeBase:
+        self._checked_at = time.monotonic()
+        if self._snapshot is None or self._file_signature() != self._signature:
+            return self.reload(only_if_changed=True)
+        return self._snapshot
+
+    def reload(self, only_if_changed: bool = False) -> KnowledgeBase:
+        """
+        Load a new snapshot and swap it in
+
+        With ``only_if_changed`` the files are compared again under the lock,
+        so threads that all noticed the same change load it (and bump the
+        version) once. A load that fails once a snapshot exists, say on a
+        half-written file, is logged and counted and the previous snapshot
+        stays current; the next check retries.
+        """
+        with self._lock:
+            signature = self._file_signature()
+            if only_if_changed and self._snapshot is not None and signature == self._signature:
+                return self._snapshot
+            started = time.perf_counter()
+            try:
+                snapshot = KnowledgeBase.load(self.directory, version=self._version + 1)
+            except Exception:
+                if self._snapshot is None:
+                    raise
+                metrics.KNOWLEDGE_BASE_LOAD_FAILURES.inc()
+                logger.exception("knowledge base reload failed; keeping version %d", self._snapshot.version)
+                self._checked_at = time.monotonic()
+                return self._snapshot
+            self._version = snapshot.version
+            metrics.KNOWLEDGE_BASE_LOAD_SECONDS.observe(time.perf_counter() - started)
+            metrics.KNOWLEDGE_BASE_LOADS.inc()
+            metrics.KNOWLEDGE_BASE_VERSION.set(snapshot.version)
+            self._signature = signature
+            self._checked_at = time.monotonic()
+            self._snapshot = snapshot  # single reference swap: readers never see a partial load
+            return snapshot
+
+    def _file_signature(self) -> Tuple:
+        files = tuple((p.name, p.stat().st_mtime_ns) for p in sorted(self.directory.glob("*.json")))
+        models = []
+        for directory in self.models:
+            try:
+                stat = (directory / "meta.json").stat()
+            except FileNotFoundError:
+                continue
+            models.append((str(directory), stat.st_ino, stat.st_mtime_ns))
+        return files + tuple(models)
+
+
+knowledge_store = KnowledgeBaseStore()
+
+
+def _allergen_cache_stats():
+    snapshot = knowledge_store._snapshot
+    if snapshot is None:
+        return None
+    info = snapshot.allergen_matcher.groups_for.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+metrics.REGISTRY.register_cache("allergen_matcher", _allergen_cache_stats)
+metrics.REGISTRY.register_cache(
+    "substitutions", lambda: knowledge_store._snapshot and knowledge_store._snapshot.substitutions.stats()
+)
+metrics.REGISTRY.register_cache(
+    "customizations", lambda: knowledge_store._snapshot and knowledge_store._snapshot.customizations.stats()
+)
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Return the current process-wide snapshot."""
+    return knowledge_store.current()
+
+
+async def current_knowledge_base() -> KnowledgeBase:
+    """``get_knowledge_base`` as a FastAPI dependency; async, so requests skip the threadpool hop."""
+    return knowledge_store.current()
@@ -0,0 +1,40 @@
+"""Application: recipe store selection
+
+Routes search and look up recipes in the knowledge-base snapshot by default.
+Setting ``RECIPEAI_RECIPE_DB`` to a database built with
+``python -m recipeai.scripts.import_recipes`` serves them from that SQLite
+store instead, so the corpus does not have to fit in memory.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Optional, Tuple
+
+from ..adapters.recipestore.sqlite import SQLiteRecipeStore
+from .knowledge_base import get_knowledge_base
+
+RECIPE_DB_ENV = "RECIPEAI_RECIPE_DB"
+
+_lock = threading.Lock()
+_stores = {}
+
+
+def get_recipe_store() -> Optional[SQLiteRecipeStore]:
+    """The configured SQLite recipe store, opened once per path; None when unset."""
+    path = os.environ.get(RECIPE_DB_ENV)
+    if not path:
+        return None
+    store = _stores.get(path)
+    if store is None:
+        with _lock:
+            store = _stores.get(path)
+            if store is None:
+                store = _stores[path] = SQLiteRecipeStore(path, get_knowledge_base().ingredient_categories)
+    return store
+
+
+def recipe_store_generation() -> Optional[Tuple[str, int]]:
+    """``(path, generation)`` of the configured store, for cache keys; None when unset."""
+    store = get_recipe_store()
+    return None if store is None else (str(store.path), store.generation())
@@ -0,0 +1,80 @@
+"""Application: scale_recipes use case
+
+Rescales ingredient quantities from a recipe's servings to a target number of
+servings. Quantities go through the cached ``parse_quantity`` (fractions,
+mixed numbers, ranges, unicode fractions), so a batch of recipes sharing the
+usual handful of spellings parses each spelling once. Amounts that cannot be
+parsed ("to taste") are passed through unchanged.
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Tuple
+
+from ..core.domain_services.QuantityParser import format_amount, parse_quantity
+from .knowledge_base import KnowledgeBase, get_knowledge_base
+
+UNIT_SYSTEMS = ("original", "metric")
+METRIC_UNITS = frozenset(["g", "kg", "mg", "ml", "l"])
+
+
+class ScaleRecipes:
+    def __init__(self, knowledge: Optional[KnowledgeBase] = None):
+        self.knowledge = knowledge or get_knowledge_base()
+        # Mass (grams) and volume (ml) per canonical unit, shared with nutrition.
+        self.mass = self.knowledge.nutrition.mass
+        self.volume = self.knowledge.nutrition.volume
+
+    def execute(self, ingredients: Iterable, servings: float, target_servings: float, units: str = "original") -> dict:
+        """
+        Scale ``ingredients`` (Ingredients or name/quantity/unit mappings) by ``target_servings / servings``
+
+        With ``units="metric"`` mass and volume units are converted to g/kg
+        and ml/l; other units (cloves, pinches) keep their canonical name.
+        """
+        if units not in UNIT_SYSTEMS:
+            raise ValueError(f"Unknown unit system: {units}")
+        factor = target_servings / servings
+        return {
+            'servings': target_servings,
+            'factor': round(factor, 6),
+            'ingredients': [self._scale(item, factor, units == "metric") for item in ingredients],
+        }
+
+    def execute_batch(self, items: Iterable[Tuple[Iterable, float, float]], units: str = "original") -> List[dict]:
+        """``execute`` for many (ingredients, servings, target_servings) triples."""
+        return [self.execute(ingredients, servings, target, units) for ingredients, servings, target in items]
+
+    def _scale(self, item, factor: float, metric: bool) -> dict:
+        if isinstance(item, dict):
+            name, quantity, unit = item.get('name', ''), item.get('quantity') or '', item.get('unit') or ''
+        else:
+            name, quantity, unit = item.name, item.quantity or '', item.unit or ''
+        parsed = parse_quantity(str(quantity), unit)
+        if parsed.low is None:
+            return {'name': name, 'quantity': quantity, 'unit': unit, 'amount': None, 'amount_max': None}
+
+        low, high, unit = parsed.low * factor, parsed.high * factor, parsed.unit
+        if metric:
+            low, high, unit = self._to_metric(low, high, unit)
+        decimal = unit in METRIC_UNITS
+        quantity = format_amount(low, decimal)
+        if parsed.is_range:
+            quantity += '-' + format_amount(high, decimal)
+        return {
+            'name': name,
+            'quantity': quantity,
+            'unit': unit,
+            'amount': round(low, 3),
+            'amount_max': round(high, 3),
+        }
+
+    def _to_metric(self, low: float, high: float, unit: str) -> Tuple[float, float, str]:
+        if unit in self.mass:
+            grams = self.mass[unit]
+            low, high = low * grams, high * grams
+            return (low / 1000, high / 1000, 'kg') if high >= 1000 else (low, high, 'g')
+        if unit in self.volume:
+            ml = self.volume[unit]
+            low, high = low * ml, high * ml
+            return (low / 1000, high / 1000, 'l') if high >= 1000 else (low, high, 'ml')
+        return low, high, unit
@@ -1,23 +1,91 @@
 from __future__ import annotations
 
-import json
-from pathlib import Path
-from typing import List
+from typing import FrozenSet, Iterator, List, Optional
+
+import numpy as np
+
+from ..adapters.cache import BoundedCache
+from ..ai_pipeline.ann_index import DEFAULT_NPROBE, IVFIndex
+from ..ai_pipeline.pairing_matrix import PairingMatrix
+from ..core.domain_services.CategoryRegistry import category_bit
+from ..core.domain_services.FlavorMatcher import FlavorMatcher
+from ..core.ports.flavor_repository import FlavorRepository
+from .knowledge_base import KnowledgeBase, get_knowledge_base
+
+VEGAN = category_bit('vegan')
 
 class SubstituteIngredient:
-    def __init__(self):
-        rules_path = Path(__file__).resolve().parents[1] / "knowledge" / "substitution_rules.json"
-        with rules_path.open() as f:
-            self.rules = json.load(f)
+    def __init__(
+        self,
+        knowledge: Optional[KnowledgeBase] = None,
+        flavors: Optional[FlavorRepository] = None,
+        neighbours: Optional[IVFIndex] = None,
+        pairing: Optional[PairingMatrix] = None,
+        nprobe: int = DEFAULT_NPROBE,
+        candidates: int = 20,
+    ):
+        self.knowledge = knowledge or get_knowledge_base()
+        self.rules = self.knowledge.substitution_rules
+        self.flavors = flavors
+        self.neighbours = neighbours if neighbours is not None else self.knowledge.ann_index
+        self.pairing = pairing if pairing is not None else self.knowledge.pairing
+        self.nprobe = nprobe
+        self.candidates = candidates
+        # Results only depend on the snapshot and the shipped models unless
+        # collaborators are injected, so share the snapshot's memo in that case.
+        shared = flavors is None and neighbours is None and pairing is None
+        self.memo = self.knowledge.substitutions if shared else BoundedCache(max_entries=10_000)
     
     def execute(self, ingredient: str, dietary_type: str, context: List[str]) -> dict:
         """
         Find substitute for ingredient based on dietary constraint
+
+        ``context`` is the rest of the recipe; results are memoized on
+        ``(ingredient, diet, frozenset(context))``.
         """
-        substitutes = self.rules.get(ingredient.lower(), {})
-        options = substitutes.get(dietary_type, [])
+        name = ingredient.lower()
+        others = frozenset(c.lower() for c in context) - {name}
+        key = (name, dietary_type.lower(), others)
+        return dict(self.memo.get_or_compute(key, lambda: self._resolve(ingredient, dietary_type, others)))
+
+    def rank(self, ingredient: str, dietary_type: str, context: List[str], k: int = 5) -> List[str]:
+        """Up to ``k`` substitutes, best first; the first is what ``execute`` picks."""
+        others = frozenset(c.lower() for c in context) - {ingredient.lower()}
+        options = self._options(ingredient, dietary_type)
+        if not options:
+            return [name for name, _ in self._allowed_neighbours(ingredient, dietary_type, others)][:k]
+        total, _, _ = self._score_options(ingredient, options, others)
+        if total is None:
+            return list(options[:k])
+        return [options[i] for i in np.argsort(-total, kind="stable")[:k]]
+
+    def _options(self, ingredient: str, dietary_type: str) -> tuple:
+        """
+        Rule options for the diet, else every other diet's options that it allows
+
+        Diets without rules of their own (dairy-free, gluten-free) borrow from
+        the stricter ones: milk's vegan options are dairy-free too.
+        """
+        by_diet = self.rules.get(ingredient.lower(), {})
+        options = by_diet.get(dietary_type.lower())
+        if options is not None or dietary_type.lower() not in self.knowledge.dietary.masks:
+            return options or ()
+        borrowed = dict.fromkeys(o for opts in by_diet.values() for o in opts)
+        return tuple(o for o in borrowed if not self.knowledge.violates(o, dietary_type))
+
+    def _resolve(self, ingredient: str, dietary_type: str, context: FrozenSet[str]) -> dict:
+        options = self._options(ingredient, dietary_type)
         
         if not options:
+            nearest = next(self._allowed_neighbours(ingredient, dietary_type, context), None)
+            if nearest:
+                best_substitute, similarity = nearest
+                return {
+                    'original': ingredient,
+                    'substitute': best_substitute,
+                    'reason': f'Nearest {dietary_type} ingredient by embedding similarity',
+                    'confidence': round(0.6 * max(similarity, 0.0), 3)
+                }
             return {
                 'original': ingredient,
                 'substitute': None,
@@ -25,7 +93,25 @@ class SubstituteIngredient:
                 'confidence': 0.0
             }
         
-        # Simple: return first option (can enhance with ML later)
+        total, flavor, pairing = self._score_options(ingredient, options, context)
+        if total is not None:
+            best = int(np.argmax(total))  # first listed option wins ties
+            if flavor is not None:
+                reason = f'Closest-flavored {dietary_type} alternative'
+                confidence = 0.5 + 0.5 * float(flavor[best])
+            else:
+                reason = f'Common {dietary_type} alternative'
+                confidence = 0.8
+            if pairing is not None:
+                reason += ' that pairs well with the rest of the recipe'
+            return {
+                'original': ingredient,
+                'substitute': options[best],
+                'reason': reason,
+                'confidence': round(confidence, 3)
+            }
+
+        # Without flavor or pairing data, fall back to the first listed option
         best_substitute = options[0]
         
         return {
@@ -34,3 +120,56 @@ class SubstituteIngredient:
             'reason': f'Common {dietary_type} alternative',
             'confidence': 0.8
         }
+
+    def _score_options(self, ingredient: str, options, context: FrozenSet[str]) -> tuple:
+        """``(total, flavor, pairing)`` score arrays over ``options``; each None when unavailable."""
+        flavor = self._flavor_scores(ingredient, options)
+        pairing = self._pairing_scores(options, context)
+        if flavor is None and pairing is None:
+            return None, None, None
+        total = np.zeros(len(options))
+        if flavor is not None:
+            total += flavor
+        if pairing is not None:
+            total += pairing / pairing.max()
+        return total, flavor, pairing
+
+    def _allowed_neighbours(self, ingredient: str, dietary_type: str, context: FrozenSet[str]) -> Iterator[tuple]:
+        """
+        ANN fallback for ingredients without a rule
+
+        Only candidates with known categories that the diet allows, sharing a
+        functional category (e.g. protein, binder) with the original and not
+        already in the recipe are yielded, nearest first.
+        """
+        blocked = self.knowledge.dietary.masks.get(dietary_type.lower())
+        if self.neighbours is None or not blocked:
+            return
+        masks = self.knowledge.ingredient_masks
+        functional = masks.get(ingredient.lower(), 0) & ~(blocked | VEGAN)
+        for name, similarity in self.neighbours.neighbours(ingredient, self.candidates, self.nprobe):
+            if similarity <= 0 or name not in masks or name in context:
+                continue
+            found = masks[name]
+            if self.knowledge.violates(name, dietary_type, found):
+                continue
+            if functional and not functional & found:
+                continue
+            yield name, similarity
+
+    def _flavor_scores(self, ingredient: str, options) -> Optional[np.ndarray]:
+        """Flavor similarity of each rule option to the original; None without profiles."""
+        if self.flavors is None or len(options) < 2:
+            return None
+        target = self.flavors.get_flavor_profile(ingredient)
+        profiles = {option: self.flavors.get_flavor_profile(option) for option in options}
+        if not target or not any(profiles.values()):
+            return None
+        return FlavorMatcher(profiles).similarities([target])[0].astype(np.float64)
+
+    def _pairing_scores(self, options, context: FrozenSet[str]) -> Optional[np.ndarray]:
+        """Summed pairing of each option with the rest of the recipe; None when nothing pairs."""
+        if self.pairing is None or not context or len(options) < 2:
+            return None
+        scores = self.pairing.score_names([o.lower() for o in options], context)
+        return scores if scores.max() > 0 else None
@@ -0,0 +1,127 @@
+"""Domain service: AllergenMatcher
+
+Compiles an allergen map (group -> ingredient names) into a word-level
+Aho-Corasick automaton, so one pass over an ingredient string reports
+every allergen group whose phrase occurs in it ("unsalted butter",
+"soy sauce, low sodium", "Eggs"). Words are lowercased and singularized
+on both sides, so simple plurals match either way.
+
+``exclusions`` (group -> phrases) name longer phrases that do not carry a
+group even though they contain one of its words: "peanut butter" and
+"oat milk" are not dairy. An allergen hit is dropped when an exclusion
+phrase for its group covers it, so the longest match wins; "peanut butter
+and milk" is still dairy.
+"""
+from __future__ import annotations
+
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_EMPTY: FrozenSet[str] = frozenset()
+# Per automaton state: (phrase length, groups it adds, groups it clears) for each phrase ending there.
+_Match = Tuple[int, FrozenSet[str], FrozenSet[str]]
+
+
+@lru_cache(maxsize=16384)
+def singularize(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith(("ches", "shes", "sses", "xes", "oes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_words(text: str) -> Tuple[str, ...]:
+    return tuple(singularize(w) for w in _WORD_RE.findall(text.lower()))
+
+
+class AllergenMatcher:
+    def __init__(
+        self,
+        allergen_map: Mapping[str, Iterable[str]],
+        cache_size: int = 65536,
+        exclusions: Optional[Mapping[str, Iterable[str]]] = None,
+    ):
+        reverse: Dict[Tuple[str, ...], set] = {}
+        for group, names in allergen_map.items():
+            for name in names:
+                words = normalize_words(name)
+                if words:
+                    reverse.setdefault(words, set()).add(group.lower())
+        # Exact phrase -> groups, also handy for callers that only need a lookup.
+        self.reverse_index: Dict[Tuple[str, ...], FrozenSet[str]] = {
+            k: frozenset(v) for k, v in reverse.items()
+        }
+        cleared: Dict[Tuple[str, ...], set] = {}
+        for group, names in (exclusions or {}).items():
+            for name in names:
+                words = normalize_words(name)
+                if words:
+                    cleared.setdefault(words, set()).add(group.lower())
+
+        # Trie over words; state 0 is the root.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[Tuple[_Match, ...]] = [()]
+        for phrase in reverse.keys() | cleared.keys():
+            state = 0
+            for word in phrase:
+                nxt = self._goto[state].get(word)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][word] = nxt
+                    self._goto.append({})
+                    self._output.append(())
+                state = nxt
+            self._output[state] = ((
+                len(phrase),
+                self.reverse_index.get(phrase, _EMPTY),
+                frozenset(cleared.get(phrase, ())),
+            ),)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs.
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+                queue.append(nxt)
+
+        self.groups_for = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, ingredient: str) -> FrozenSet[str]:
+        """Return every allergen group mentioned anywhere in ``ingredient``."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        hits: List[Tuple[int, int, FrozenSet[str]]] = []
+        covers: List[Tuple[int, int, FrozenSet[str]]] = []
+        for end, word in enumerate(normalize_words(ingredient)):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for length, groups, clears in output[state]:
+                if groups:
+                    hits.append((end - length, end, groups))
+                if clears:
+                    covers.append((end - length, end, clears))
+        if not covers:
+            return _EMPTY.union(*(groups for _, _, groups in hits))
+        found = set()
+        for start, end, groups in hits:
+            for group in groups:
+                if not any(s <= start and end <= e and group in c for s, e, c in covers):
+                    found.add(group)
+        return frozenset(found)
+
+    def matches(self, ingredient: str, groups: Iterable[str]) -> bool:
+        return not self.groups_for(ingredient).isdisjoint(groups)
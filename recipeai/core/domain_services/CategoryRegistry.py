@@ -0,0 +1,56 @@
+"""Domain service: CategoryRegistry
+
+Maps ingredient category names to bits so a set of categories is one ``int``
+and "does this ingredient hit anything the diet blocks" is ``mask & blocked``.
+The known categories have fixed bits (their position in ``CATEGORIES``);
+a category first seen at runtime is appended, so a mask is stable for the
+life of the process but only the fixed bits are stable across processes.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+CATEGORIES = (
+    "vegan", "meat", "seafood", "dairy", "eggs", "animal-product", "protein", "grain",
+    "legume", "vegetable", "fruit", "nut", "herb", "spice", "fat", "sauce", "condiment",
+    "cheese", "binder", "dairy-alternative", "aromatic",
+)
+
+_bits: Dict[str, int] = {name: 1 << i for i, name in enumerate(CATEGORIES)}
+_names: List[str] = list(CATEGORIES)
+_lock = threading.Lock()
+
+
+def category_bit(category: str) -> int:
+    """The bit for ``category`` (case-insensitive), registering it on first sight."""
+    bit = _bits.get(category)
+    if bit is not None:
+        return bit
+    name = sys.intern(category.strip().lower())
+    with _lock:
+        bit = _bits.get(name)
+        if bit is None:
+            bit = _bits[name] = 1 << len(_names)
+            _names.append(name)
+        _bits[category] = bit
+    return bit
+
+
+def category_mask(categories: Iterable[str]) -> int:
+    """Bitwise OR of the bits of ``categories``."""
+    mask = 0
+    for category in categories:
+        mask |= category_bit(category)
+    return mask
+
+
+def category_names(mask: int) -> Tuple[str, ...]:
+    """The category names set in ``mask``, in registry order."""
+    return tuple(name for i, name in enumerate(_names) if mask >> i & 1)
+
+
+def registry_size() -> int:
+    """Number of bits assigned so far; every current mask fits in this many."""
+    return len(_names)
@@ -0,0 +1,112 @@
+"""Domain service: DietaryEngine
+
+Compiles the ``DietaryConstraint`` definitions in
+``knowledge/dietary_constraints.json`` into CategoryRegistry bitmasks.
+Allergen groups get bits of their own (``allergen:<group>``), so a diet,
+a combination of diets and allergy exclusions ("vegan + gluten-free + no
+nuts") all compile to one blocked mask, and an ingredient or recipe passes
+when ``mask & blocked == 0``.
+
+For a corpus, ``category_matrix`` packs per-recipe masks into a boolean
+``(n_recipes, n_bits)`` matrix; ``compatible`` then answers a constraint for
+every recipe at once with a column gather and ``any``.
+
+A diet's allowed categories compile to a mask too: for a single ingredient,
+``violates`` lets an allowed category (``dairy-alternative`` for
+dairy-free) override allergen-word hits, while blocked categories always
+win.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+from ..entities.DietaryConstraint import DietaryConstraint
+from .CategoryRegistry import category_bit, category_mask
+
+ALLERGEN_PREFIX = "allergen:"
+
+
+def allergen_mask(groups: Iterable[str]) -> int:
+    """Bits for allergen groups, disjoint from the ingredient category bits."""
+    mask = 0
+    for group in groups:
+        mask |= category_bit(ALLERGEN_PREFIX + group.lower())
+    return mask
+
+
+class DietaryEngine:
+    def __init__(self, constraints: Iterable[DietaryConstraint]):
+        self.constraints: Dict[str, DietaryConstraint] = {c.type.lower(): c for c in constraints}
+        # Diet name -> blocked mask; diets with no constraint (or not listed) block nothing.
+        self.masks: Dict[str, int] = {
+            name: category_mask(c.blocked_categories) | allergen_mask(c.blocked_allergens)
+            for name, c in self.constraints.items()
+        }
+        # Diet name -> allowed category mask; it only overrides allergen bits, never blocked categories.
+        self.allowed: Dict[str, int] = {
+            name: category_mask(c.allowed_categories) for name, c in self.constraints.items()
+        }
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Mapping]) -> "DietaryEngine":
+        """Build from the ``dietary_constraints.json`` layout: diet -> blocked/allowed lists."""
+        return cls(
+            DietaryConstraint(
+                type=name,
+                blocked_categories=list(spec.get("blocked_categories", [])),
+                allowed_categories=list(spec.get("allowed_categories", [])),
+                blocked_allergens=list(spec.get("blocked_allergens", [])),
+            )
+            for name, spec in config.items()
+        )
+
+    def blocked_mask(self, diets: Iterable[str] = (), allergens: Iterable[str] = ()) -> int:
+        """Compose ``diets`` and excluded allergen groups into one blocked mask."""
+        mask = allergen_mask(allergens)
+        for diet in diets:
+            blocked = self.masks.get(diet.lower())
+            if blocked is None:
+                raise ValueError(f"Unknown diet: {diet}")
+            mask |= blocked
+        return mask
+
+    def violates(self, diet: str, categories: int, allergens: int = 0) -> bool:
+        """Whether an ingredient with ``categories`` bits and ``allergens`` bits breaks ``diet``."""
+        diet = diet.lower()
+        if categories & self.allowed.get(diet, 0):
+            allergens = 0
+        return bool((categories | allergens) & self.masks.get(diet, 0))
+
+    def compose(self, diets: Sequence[str], allergens: Iterable[str] = ()) -> DietaryConstraint:
+        """A single constraint equivalent to following every diet in ``diets`` while avoiding ``allergens``."""
+        parts = [self.constraints[d.lower()] for d in diets]
+        blocked = {c for part in parts for c in part.blocked_categories}
+        return DietaryConstraint(
+            type="+".join(d.lower() for d in diets),
+            blocked_categories=sorted(blocked),
+            # Only what every diet permits, and nothing any of them blocks.
+            allowed_categories=sorted(set.intersection(*(set(p.allowed_categories) for p in parts)) - blocked)
+            if parts else [],
+            blocked_allergens=sorted({a.lower() for a in allergens}.union(*(p.blocked_allergens for p in parts))),
+        )
+
+    @staticmethod
+    def category_matrix(masks: Sequence[int], width: int) -> np.ndarray:
+        """Boolean ``(len(masks), width)`` matrix; column ``j`` is bit ``j`` of each mask."""
+        matrix = np.zeros((len(masks), width), dtype=bool)
+        # Shift through int64 in 62-bit slices so masks of any width fit.
+        for start in range(0, width, 62):
+            stop = min(start + 62, width)
+            chunk = np.fromiter(((m >> start) & ((1 << 62) - 1) for m in masks), dtype=np.int64, count=len(masks))
+            matrix[:, start:stop] = (chunk[:, None] >> np.arange(stop - start)) & 1
+        return matrix
+
+    @staticmethod
+    def compatible(matrix: np.ndarray, blocked: int) -> np.ndarray:
+        """Boolean vector: rows of ``matrix`` with none of the ``blocked`` bits set."""
+        columns: List[int] = [j for j in range(min(blocked.bit_length(), matrix.shape[1])) if blocked >> j & 1]
+        if not columns:
+            return np.ones(matrix.shape[0], dtype=bool)
+        return ~matrix[:, columns].any(axis=1)
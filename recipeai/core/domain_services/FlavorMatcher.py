@@ -1,8 +1,96 @@
-"""Domain service: FlavorMatcher"""
-from typing import Dict, List
+"""Domain service: FlavorMatcher
+
+Flavor profiles are packed into a dense ``(n_candidates, n_notes)`` float32
+matrix once (``fit``); scoring a batch of targets is then a single
+``targets @ candidates.T`` product and top-k selection uses ``argpartition``
+rather than a full sort. Note weights scale each column by ``sqrt(weight)`` on
+both sides, so the weighted similarity is still one plain matrix product.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+COSINE = "cosine"
+DOT = "dot"
+
 
 class FlavorMatcher:
-    def match(self, target: Dict[str, float], candidates: List[Dict[str, float]]):
+    def __init__(
+        self,
+        candidates: Optional[Mapping[str, Mapping[str, float]]] = None,
+        metric: str = COSINE,
+        note_weights: Optional[Mapping[str, float]] = None,
+    ):
+        if metric not in (COSINE, DOT):
+            raise ValueError(f"Unknown similarity metric: {metric!r}")
+        self.metric = metric
+        self.note_weights = dict(note_weights or {})
+        self.names: List[str] = []
+        self.notes: List[str] = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        if candidates is not None:
+            self.fit(candidates)
+
+    def fit(self, candidates: Mapping[str, Mapping[str, float]]) -> "FlavorMatcher":
+        """Pack named candidate profiles; the note vocabulary is fixed from here on."""
+        self.names = list(candidates)
+        self.notes = sorted({note for profile in candidates.values() for note in profile})
+        self._column = {note: i for i, note in enumerate(self.notes)}
+        self._scale = np.sqrt(
+            np.array([self.note_weights.get(n, 1.0) for n in self.notes], dtype=np.float32)
+        )
+        self.matrix = self._prepare(self.pack(candidates.values()))
+        return self
+
+    def pack(self, profiles: Iterable[Mapping[str, float]]) -> np.ndarray:
+        """Dense float32 rows over the fitted notes; notes outside the vocabulary are ignored."""
+        profiles = list(profiles)
+        packed = np.zeros((len(profiles), len(self.notes)), dtype=np.float32)
+        for row, profile in enumerate(profiles):
+            for note, value in profile.items():
+                col = self._column.get(note)
+                if col is not None:
+                    packed[row, col] = value
+        return packed
+
+    def _prepare(self, packed: np.ndarray) -> np.ndarray:
+        packed = packed * self._scale
+        if self.metric == COSINE:
+            norms = np.linalg.norm(packed, axis=1, keepdims=True)
+            packed /= np.where(norms == 0, 1.0, norms)
+        return packed
+
+    def similarities(self, targets: Sequence[Mapping[str, float]]) -> np.ndarray:
+        """``(n_targets, n_candidates)`` similarity matrix in one BLAS call."""
+        return self._prepare(self.pack(targets)) @ self.matrix.T
+
+    def top_k(self, targets: Sequence[Mapping[str, float]], k: int = 5) -> List[List[Tuple[str, float]]]:
+        """Best ``k`` candidates per target as ``(name, score)``, highest first."""
+        scores = self.similarities(targets)
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return [[] for _ in targets]
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        picked = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-picked, axis=1, kind="stable")
+        best = np.take_along_axis(best, order, axis=1)
+        picked = np.take_along_axis(picked, order, axis=1)
+        return [
+            [(self.names[i], float(s)) for i, s in zip(rows, values)]
+            for rows, values in zip(best.tolist(), picked.tolist())
+        ]
+
+    def match(self, target: Dict[str, float], candidates: List[Dict[str, float]], k: Optional[int] = None):
         """Return ranked candidates by similarity to target"""
-        # placeholder
-        return sorted(candidates, key=lambda c: 0, reverse=True)
+        if not candidates:
+            return []
+        matcher = FlavorMatcher(
+            {str(i): c for i, c in enumerate(candidates)}, self.metric, self.note_weights
+        )
+        scores = matcher.similarities([target])[0]
+        order = np.argsort(-scores, kind="stable")
+        if k is not None:
+            order = order[:k]
+        return [candidates[i] for i in order.tolist()]
@@ -0,0 +1,126 @@
+"""Domain service: QuantityParser
+
+Parses free-form ingredient quantities ("200", "1/2", "1 1/2", "1½",
+"2-3", "2 to 3 cups", "a pinch") into a ``Quantity`` with a numeric range
+and a canonical unit, using one compiled regular expression. ``parse_quantity``
+is LRU-cached on the raw strings, since recipe corpora repeat a small set of
+quantity spellings.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from typing import Optional
+
+UNICODE_FRACTIONS = {
+    "½": Fraction(1, 2), "⅓": Fraction(1, 3), "⅔": Fraction(2, 3), "¼": Fraction(1, 4),
+    "¾": Fraction(3, 4), "⅕": Fraction(1, 5), "⅖": Fraction(2, 5), "⅗": Fraction(3, 5),
+    "⅘": Fraction(4, 5), "⅙": Fraction(1, 6), "⅚": Fraction(5, 6), "⅛": Fraction(1, 8),
+    "⅜": Fraction(3, 8), "⅝": Fraction(5, 8), "⅞": Fraction(7, 8),
+}
+
+UNIT_ALIASES = {
+    "gram": "g", "grams": "g", "gr": "g", "kilogram": "kg", "kilograms": "kg", "kgs": "kg",
+    "milligram": "mg", "milligrams": "mg", "ounce": "oz", "ounces": "oz", "pound": "lb",
+    "pounds": "lb", "lbs": "lb", "milliliter": "ml", "milliliters": "ml", "millilitre": "ml",
+    "millilitres": "ml", "liter": "l", "liters": "l", "litre": "l", "litres": "l",
+    "cups": "cup", "c": "cup", "tablespoon": "tbsp", "tablespoons": "tbsp", "tbs": "tbsp",
+    "tbsps": "tbsp", "teaspoon": "tsp", "teaspoons": "tsp", "tsps": "tsp", "cloves": "clove",
+    "pieces": "piece", "pcs": "piece", "pc": "piece", "slices": "slice", "pinches": "pinch",
+    "cans": "can", "heads": "head",
+}
+
+_FRACTION_CHARS = "".join(UNICODE_FRACTIONS)
+_AMOUNT = (
+    r"(?:\d+\s+\d+\s*/\s*\d+"           # mixed number: 1 1/2
+    rf"|\d+\s*[{_FRACTION_CHARS}]"      # 1½
+    r"|\d+\s*/\s*\d+"                   # 1/2
+    r"|\d*\.\d+|\d+"                    # 0.5, .5, 2
+    rf"|[{_FRACTION_CHARS}]"            # ½
+    r"|an?\b)"                          # "a" / "an" pinch
+)
+_QUANTITY_RE = re.compile(
+    rf"^\s*(?P<low>{_AMOUNT})(?:\s*(?:-|–|—|to)\s*(?P<high>{_AMOUNT}))?\s*(?P<unit>.*?)\s*$",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class Quantity:
+    low: Optional[float]  # None when there is no numeric amount ("to taste")
+    high: Optional[float]  # equal to low unless a range was given
+    unit: str  # canonical unit, "" when none
+
+    @property
+    def value(self) -> Optional[float]:
+        """Single representative amount: the midpoint of a range."""
+        if self.low is None:
+            return None
+        return (self.low + self.high) / 2
+
+    @property
+    def is_range(self) -> bool:
+        return self.low is not None and self.high != self.low
+
+
+def canonical_unit(unit: str) -> str:
+    unit = unit.strip().lower().rstrip(".")
+    return UNIT_ALIASES.get(unit, unit)
+
+
+def _amount(text: str) -> Fraction:
+    text = text.strip().lower()
+    if text in ("a", "an"):
+        return Fraction(1)
+    if text[-1] in UNICODE_FRACTIONS:
+        whole = text[:-1].strip()
+        return (Fraction(whole) if whole else Fraction(0)) + UNICODE_FRACTIONS[text[-1]]
+    return sum((Fraction(part.replace(" ", "")) for part in re.split(r"\s+(?=\d+\s*/)", text)), Fraction(0))
+
+
+@lru_cache(maxsize=65536)
+def parse_quantity(quantity: str, unit: str = "") -> Quantity:
+    """
+    Parse ``quantity`` (which may itself carry a unit, "2 cups")
+
+    ``unit`` is the separately stored unit, used when the quantity has none.
+    Strings without a leading amount yield ``low = high = None``.
+    """
+    match = _QUANTITY_RE.match(quantity or "")
+    if match is None:
+        return Quantity(None, None, canonical_unit(unit))
+    try:
+        low = _amount(match.group("low"))
+        high = _amount(match.group("high")) if match.group("high") else low
+    except (ValueError, ZeroDivisionError):
+        return Quantity(None, None, canonical_unit(unit))
+    if high < low:
+        low, high = high, low
+    return Quantity(float(low), float(high), canonical_unit(match.group("unit") or unit))
+
+
+def format_amount(value: float, decimal: bool = False) -> str:
+    """
+    Render an amount for people: "2", "1 1/2", "0.3"
+
+    Halves, thirds, quarters and eighths are written as fractions unless
+    ``decimal`` is set (metric units read better as "12.5 g").
+    """
+    if value <= 0:
+        return "0"
+    if not decimal:
+        whole = int(value)
+        rest = value - whole
+        for denominator in (1, 2, 3, 4, 8):
+            numerator = round(rest * denominator)
+            if abs(numerator / denominator - rest) < 0.01:
+                if numerator == denominator:
+                    return str(whole + 1)
+                if numerator == 0:
+                    return str(whole)
+                fraction = f"{numerator}/{denominator}"
+                return f"{whole} {fraction}" if whole else fraction
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return text if value < 100 else str(round(value))
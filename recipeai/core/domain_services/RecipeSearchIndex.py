@@ -0,0 +1,183 @@
+"""Domain service: RecipeSearchIndex
+
+In-memory inverted index over a recipe corpus. Built once, then queried
+without touching the underlying records: name tokens are looked up by
+prefix through a sorted vocabulary (bisect), ingredients / cuisine /
+dietary tags through exact posting sets. Name queries match word by word
+by default ("pa chick" finds "Chicken Pasta"); ``name_match="start"``
+keeps the original behaviour of matching the start of the whole name. Given an ``ingredient_mask``
+function, each recipe's category and allergen bits are also packed into a
+boolean recipe x category matrix so a ``blocked`` mask (see DietaryEngine)
+filters the whole corpus with one vectorized pass.
+"""
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_left
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .CategoryRegistry import registry_size
+from .DietaryEngine import DietaryEngine
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_EMPTY: FrozenSet[int] = frozenset()
+NAME_MATCHES = ("words", "start")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _normalize(value: str) -> str:
+    return " ".join(tokenize(value))
+
+
+class RecipeSearchIndex:
+    def __init__(self, recipes: Sequence[dict], ingredient_mask: Optional[Callable[[str], int]] = None):
+        self.recipes = list(recipes)
+        name_postings: Dict[str, set] = {}
+        ingredient_postings: Dict[str, set] = {}
+        cuisine_postings: Dict[str, set] = {}
+        tag_postings: Dict[str, set] = {}
+
+        for doc_id, recipe in enumerate(self.recipes):
+            for token in tokenize(recipe.get("name", "")):
+                name_postings.setdefault(token, set()).add(doc_id)
+            for ingredient in recipe.get("ingredients", []):
+                ingredient_postings.setdefault(_normalize(ingredient), set()).add(doc_id)
+            cuisine = recipe.get("cuisine")
+            if cuisine:
+                cuisine_postings.setdefault(_normalize(cuisine), set()).add(doc_id)
+            for tag in recipe.get("dietary_tags", []):
+                tag_postings.setdefault(_normalize(tag), set()).add(doc_id)
+
+        self._name_postings = {k: frozenset(v) for k, v in name_postings.items()}
+        self._name_vocab = sorted(self._name_postings)
+        self._names: List[Tuple[str, int]] = sorted(
+            (recipe.get("name", "").lower(), doc_id) for doc_id, recipe in enumerate(self.recipes)
+        )
+        self._ingredients = {k: frozenset(v) for k, v in ingredient_postings.items()}
+        self._cuisines = {k: frozenset(v) for k, v in cuisine_postings.items()}
+        self._tags = {k: frozenset(v) for k, v in tag_postings.items()}
+
+        self.category_matrix: Optional[np.ndarray] = None
+        if ingredient_mask is not None:
+            masks = []
+            for recipe in self.recipes:
+                mask = 0
+                for ingredient in recipe.get("ingredients", []):
+                    mask |= ingredient_mask(ingredient.lower())
+                masks.append(mask)
+            self.category_matrix = DietaryEngine.category_matrix(masks, registry_size())
+
+    def __len__(self) -> int:
+        return len(self.recipes)
+
+    def search(
+        self,
+        query: str = "",
+        ingredients: Iterable[str] = (),
+        cuisines: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        match: str = "all",
+        offset: int = 0,
+        limit: Optional[int] = None,
+        blocked: int = 0,
+        name_match: str = "words",
+    ) -> dict:
+        """
+        Return recipes matching every non-empty criterion, in corpus order.
+
+        With ``name_match="words"`` each query token must prefix some token of
+        the recipe name, in any order; with ``"start"`` the whole query must
+        prefix the name (case-insensitively, punctuation included). ``match``
+        ("all" or "any") decides whether the ingredient and tag lists are
+        AND-ed or OR-ed; several cuisines are always OR-ed. Recipes with any
+        ``blocked`` bit set are excluded (needs an ``ingredient_mask``).
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"match must be 'all' or 'any', got {match!r}")
+        if name_match not in NAME_MATCHES:
+            raise ValueError(f"name_match must be 'words' or 'start', got {name_match!r}")
+
+        candidate_sets: List[FrozenSet[int]] = []
+        if name_match == "start":
+            prefix = query.strip().lower()
+            if prefix:
+                candidate_sets.append(self._name_start_postings(prefix))
+        else:
+            for token in tokenize(query):
+                candidate_sets.append(self._prefix_postings(token))
+
+        ingredient_sets = [self._ingredients.get(_normalize(i), _EMPTY) for i in ingredients]
+        tag_sets = [self._tags.get(_normalize(t), _EMPTY) for t in tags]
+        for field_sets in (ingredient_sets, tag_sets):
+            if not field_sets:
+                continue
+            if match == "all":
+                candidate_sets.extend(field_sets)
+            else:
+                candidate_sets.append(frozenset().union(*field_sets))
+
+        cuisine_sets = [self._cuisines.get(_normalize(c), _EMPTY) for c in cuisines]
+        if cuisine_sets:
+            candidate_sets.append(frozenset().union(*cuisine_sets))
+
+        offset = max(offset, 0)
+        allowed = None
+        if blocked:
+            if self.category_matrix is None:
+                raise ValueError("blocked filtering needs an index built with ingredient_mask")
+            allowed = DietaryEngine.compatible(self.category_matrix, blocked)
+        if not candidate_sets:
+            if allowed is not None:
+                ids = np.flatnonzero(allowed)
+                end = len(ids) if limit is None else offset + limit
+                return {"total": len(ids), "recipes": [self.recipes[i] for i in ids[offset:end]]}
+            total = len(self.recipes)
+            end = total if limit is None else offset + limit
+            return {"total": total, "recipes": self.recipes[offset:end]}
+
+        # Intersect smallest-first so the working set only ever shrinks.
+        candidate_sets.sort(key=len)
+        hits = set(candidate_sets[0])
+        for postings in candidate_sets[1:]:
+            if not hits:
+                break
+            hits &= postings
+        if allowed is not None and hits:
+            ids = np.fromiter(hits, dtype=np.int64, count=len(hits))
+            hits = set(ids[allowed[ids]].tolist())
+
+        total = len(hits)
+        if limit is None:
+            page = sorted(hits)[offset:]
+        else:
+            page = heapq.nsmallest(offset + limit, hits)[offset:]
+        return {"total": total, "recipes": [self.recipes[i] for i in page]}
+
+    def _prefix_postings(self, prefix: str) -> FrozenSet[int]:
+        exact = self._name_postings.get(prefix)
+        vocab = self._name_vocab
+        start = bisect_left(vocab, prefix)
+        # Fast path: the prefix is a complete token and nothing longer extends it.
+        if exact is not None and (start + 1 >= len(vocab) or not vocab[start + 1].startswith(prefix)):
+            return exact
+        matched = []
+        for token in vocab[start:]:
+            if not token.startswith(prefix):
+                break
+            matched.append(self._name_postings[token])
+        return frozenset().union(*matched) if matched else _EMPTY
+
+    def _name_start_postings(self, prefix: str) -> FrozenSet[int]:
+        names = self._names
+        matched = []
+        for name, doc_id in names[bisect_left(names, (prefix, -1)):]:
+            if not name.startswith(prefix):
+                break
+            matched.append(doc_id)
+        return frozenset(matched)
@@ -1,5 +1,10 @@
+"""Domain entity: DietaryConstraint"""
+from dataclasses import dataclass, field
+from typing import List
+
 @dataclass
 class DietaryConstraint:
-    type: str  # 'vegan', 'vegetarian', etc.
+    type: str  # 'vegan', 'vegetarian', 'gluten-free', etc.
     blocked_categories: List[str]
-    allowed_categories: List[str]
\ No newline at end of file
+    allowed_categories: List[str]  # what the diet explicitly permits; blocks take precedence
+    blocked_allergens: List[str] = field(default_factory=list)  # allergen_map.json groups
@@ -1,18 +1,29 @@
-from dataclasses import dataclass
-from typing import List
+import sys
+from dataclasses import dataclass, field
+from typing import List, Tuple
 
-@dataclass
+from ..domain_services.CategoryRegistry import category_mask
+
+@dataclass(frozen=True, slots=True)
 class Ingredient:
     name: str
     quantity: str
     unit: str
-    categories: List[str]  # ['vegan', 'protein', 'dairy']
-    
-@dataclass
+    categories: Tuple[str, ...]  # ('vegan', 'protein', 'dairy'); lists are accepted
+    mask: int = field(init=False, repr=False, compare=False)  # CategoryRegistry bits of categories
+
+    def __post_init__(self):
+        # Names repeat across a corpus, so share one string object per name.
+        object.__setattr__(self, 'name', sys.intern(self.name))
+        categories = tuple(sys.intern(c) for c in self.categories)
+        object.__setattr__(self, 'categories', categories)
+        object.__setattr__(self, 'mask', category_mask(categories))
+
+@dataclass(frozen=True, slots=True)
 class Recipe:
     id: str
     name: str
     ingredients: List[Ingredient]
     instructions: List[str]
     cuisine: str
-    dietary_tags: List[str]  # ['vegan', 'gluten-free']
\ No newline at end of file
+    dietary_tags: List[str]  # ['vegan', 'gluten-free']
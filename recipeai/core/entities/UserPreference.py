@@ -1,5 +1,6 @@
+import json
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 
 @dataclass
@@ -9,3 +10,20 @@ class UserPreference:
     allergens: List[str]
     blocked_ingredients: List[str]
     flavor_preferences: Dict[str, float]  # {'spicy': 0.8, 'sweet': 0.3}
+
+    def fingerprint(self) -> Tuple:
+        """
+        Canonical, hashable form of everything that affects a customization
+
+        ``user_id`` is left out, the diet name, allergens and blocked
+        ingredients are lowercased (the latter two de-duplicated and sorted),
+        and flavor preferences are sorted with zero weights dropped, so
+        equivalent profiles compare equal. Flavor values are not coerced: any
+        JSON value is kept in a canonical encoding.
+        """
+        return (
+            self.dietary_type.lower(),
+            tuple(sorted({a.strip().lower() for a in self.allergens})),
+            tuple(sorted({b.strip().lower() for b in self.blocked_ingredients})),
+            json.dumps({k: v for k, v in self.flavor_preferences.items() if v}, sort_keys=True, default=repr),
+        )
@@ -5,3 +5,10 @@ class LLMProvider(ABC):
     @abstractmethod
     def complete(self, prompt: str, **kwargs) -> str:
         raise NotImplementedError
+
+class AsyncLLMProvider(ABC):
+    """Non-blocking variant of LLMProvider for use inside the event loop."""
+
+    @abstractmethod
+    async def complete(self, prompt: str, **kwargs) -> str:
+        raise NotImplementedError
@@ -0,0 +1,259 @@
+"""In-process metrics with Prometheus text exposition
+
+Counters, gauges and histograms are plain Python objects guarded by a lock;
+updating one costs a dict lookup and an addition, so instrumenting the hot
+path stays in the low microseconds. ``REGISTRY.render()`` produces the
+Prometheus 0.0.4 text format served at ``/metrics``.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _default(self):
+        # Unlabelled metrics act as their own single child.
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value(self._lock)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield "", _format_labels(self.labelnames, values), child.value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...], lock: threading.Lock):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets, self._lock)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def samples(self):
+        bucket_names = self.labelnames + ("le",)
+        for values, child in list(self._children.items()):
+            with self._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(bucket_names, values + (_format_value(bound),))
+                yield "_bucket", labels, cumulative
+            labels = _format_labels(self.labelnames, values)
+            yield "_sum", labels, total
+            yield "_count", labels, cumulative
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._cache_sources: Dict[str, Callable[[], Optional[dict]]] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_cache(self, name: str, stats: Callable[[], Optional[dict]]) -> None:
+        """
+        Expose a cache's hit/miss counters, read lazily at scrape time
+
+        ``stats`` returns a dict with ``hits`` and ``misses`` (and optionally
+        ``evictions`` and ``size``), or None when the cache does not exist yet.
+        """
+        self._cache_sources[name] = stats
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        lines.extend(self._render_caches())
+        return "\n".join(lines) + "\n"
+
+    def _render_caches(self) -> List[str]:
+        if not self._cache_sources:
+            return []
+        rows = {}
+        for name, source in list(self._cache_sources.items()):
+            stats = source()
+            if stats:
+                rows[name] = stats
+        lines = []
+        for field, kind, doc in (
+            ("hits", "counter", "Cache lookups answered from the cache."),
+            ("misses", "counter", "Cache lookups that had to compute or load the value."),
+            ("evictions", "counter", "Entries dropped to respect the cache bound or TTL."),
+            ("size", "gauge", "Entries currently held."),
+        ):
+            metric = f"recipeai_cache_{field}" + ("_total" if kind == "counter" else "")
+            samples = [(n, s[field]) for n, s in rows.items() if field in s]
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric} {doc}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, value in samples:
+                lines.append(f"{metric}{_format_labels(('cache',), (name,))} {_format_value(value)}")
+        return lines
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "recipeai_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "recipeai_http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
+KNOWLEDGE_BASE_LOADS = REGISTRY.counter(
+    "recipeai_knowledge_base_loads_total",
+    "Knowledge-base snapshots loaded from disk.",
+)
+KNOWLEDGE_BASE_LOAD_FAILURES = REGISTRY.counter(
+    "recipeai_knowledge_base_load_failures_total",
+    "Knowledge-base reloads that failed and kept the previous snapshot.",
+)
+KNOWLEDGE_BASE_LOAD_SECONDS = REGISTRY.histogram(
+    "recipeai_knowledge_base_load_seconds",
+    "Time spent parsing and compiling a knowledge-base snapshot.",
+)
+KNOWLEDGE_BASE_VERSION = REGISTRY.gauge(
+    "recipeai_knowledge_base_version",
+    "Version counter of the active knowledge-base snapshot.",
+)
+PIPELINE_STAGE_SECONDS = REGISTRY.histogram(
+    "recipeai_pipeline_stage_duration_seconds",
+    "AI pipeline stage wall-clock time.",
+    ("stage", "status"),
+)
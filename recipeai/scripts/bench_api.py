@@ -0,0 +1,246 @@
+"""Script: in-process API benchmark with regression thresholds
+
+    python -m recipeai.scripts.bench_api [--requests 2000] [--concurrency 16] [--rounds 3]
+                                         [--baseline PATH] [--threshold 0.3] [--alloc-threshold 0.1]
+                                         [--update-baseline [--baseline-runs 3]]
+
+Drives ``recipeai.api.main:app`` over ``httpx.ASGITransport`` (no sockets, no
+network) with the app's lifespan running. Each scenario builds its n-th
+request from a process-wide counter, so no request number repeats across
+warmup, rounds, the allocation sample or repeated runs. ``search`` and ``customize`` rotate queries and payloads and make
+every request unique (a ``_`` cache-buster parameter; a never-matching
+blocked ingredient), so they measure the uncached handlers. The
+``*_cached`` scenarios repeat one request and measure the response cache
+and the customization memo. For every scenario it records
+throughput and p50/p95/p99 latency at the given concurrency (best of
+``rounds``, to damp scheduler noise), then replays a sequential sample under
+``tracemalloc`` for the peak bytes allocated per request and the bytes
+retained across the sample. Results are compared with the baseline file; a
+timing metric worse than ``threshold``, or an allocation metric worse than
+``alloc_threshold`` (both relative), fails the run with exit status 1. The
+baseline records the settings it was measured with, and a run with
+different settings is refused (exit status 2) rather than compared.
+``--update-baseline`` keeps the per-metric median of ``--baseline-runs``
+complete runs, so one unusually fast run does not become the bar.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+
+from recipeai.api.main import app
+from recipeai.api.middleware.logging import start_access_log, stop_access_log
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "bench_api_baseline.json"
+# Baseline entry holding the run settings it was measured with.
+SETTINGS_KEY = "_settings"
+
+Request = Tuple[str, str, Optional[dict]]
+
+QUERIES = ("pasta", "curry", "salad", "soup", "stir fry", "bowl", "tacos")
+INGREDIENTS = ("tomato", "garlic", "rice", "spinach", "chickpeas")
+DIETS = ("vegan", "vegetarian", "gluten-free", "dairy-free", "non-veg", "pescatarian")
+ALLERGENS = ((), ("nuts",), ("dairy", "eggs"), ("soy",), ("gluten",))
+RECIPE_IDS = tuple(str(i) for i in range(1, 21))
+
+
+def _search(n: int) -> Request:
+    query, ingredient = QUERIES[n % len(QUERIES)], INGREDIENTS[n % len(INGREDIENTS)]
+    return ("GET", f"/api/recipes/search?query={query}&ingredient={ingredient}&diet={DIETS[n % len(DIETS)]}"
+                   f"&match=any&limit=10&_={n}", None)
+
+
+def _customize(n: int) -> Request:
+    return ("POST", "/api/customize/", {
+        "recipe_id": RECIPE_IDS[n % len(RECIPE_IDS)],
+        "dietary_type": DIETS[n % len(DIETS)],
+        "allergens": list(ALLERGENS[n % len(ALLERGENS)]),
+        "blocked_ingredients": [f"bench-{n}"],
+    })
+
+
+# Request numbers are never reused within a process: the app's caches outlive
+# a single run_benchmark call, and a reused number would turn into a hit.
+_REQUEST_NUMBERS = itertools.count()
+
+# Scenario -> n-th request.
+SCENARIOS: Dict[str, Callable[[int], Request]] = {
+    "health": lambda n: ("GET", "/health", None),
+    "search": _search,
+    "search_cached": lambda n: (
+        "GET", "/api/recipes/search?query=pasta&ingredient=tomato&match=any&limit=10", None
+    ),
+    "customize": _customize,
+    "customize_cached": lambda n: (
+        "POST", "/api/customize/", {"recipe_id": "1", "dietary_type": "vegan", "allergens": ["nuts"]}
+    ),
+}
+
+# Metric -> True when higher is better; only these are compared with the baseline
+# (p99 is reported but too noisy at these sample sizes to gate on).
+TIMINGS = {"requests_per_second": True, "p50_ms": False, "p95_ms": False}
+ALLOCATIONS = {"peak_bytes_per_request": False}
+
+
+async def _send(client: httpx.AsyncClient, request: Request) -> None:
+    method, url, body = request
+    response = await client.request(method, url, json=body)
+    if response.status_code >= 400:
+        raise RuntimeError(f"{method} {url} -> {response.status_code}: {response.text[:200]}")
+
+
+async def _load(client: httpx.AsyncClient, requests: Iterator[Request], count: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    remaining = itertools.islice(requests, count)
+
+    async def worker() -> None:
+        for request in remaining:
+            started = time.perf_counter()
+            await _send(client, request)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "requests": count,
+        "concurrency": concurrency,
+        "requests_per_second": round(count / elapsed, 1),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+    }
+
+
+async def _allocations(client: httpx.AsyncClient, requests: Iterator[Request], samples: int) -> Dict:
+    peaks = []
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(samples):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await _send(client, next(requests))
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes_per_request": int(np.median(peaks)),
+        "retained_bytes_per_request": round(retained / samples, 1),
+    }
+
+
+async def run_benchmark(
+    scenarios: Sequence[str] = tuple(SCENARIOS),
+    requests: int = 2000,
+    concurrency: int = 16,
+    alloc_samples: int = 200,
+    warmup: int = 50,
+    rounds: int = 3,
+) -> Dict[str, Dict]:
+    # Keep the access log on the hot path, but write it nowhere.
+    start_access_log(logging.NullHandler())
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                results = {}
+                for name in scenarios:
+                    stream = map(SCENARIOS[name], _REQUEST_NUMBERS)
+                    for request in itertools.islice(stream, warmup):
+                        await _send(client, request)
+                    runs = [await _load(client, stream, requests, concurrency) for _ in range(rounds)]
+                    results[name] = max(runs, key=lambda run: run["requests_per_second"])
+                    results[name].update(await _allocations(client, stream, alloc_samples))
+                return results
+    finally:
+        stop_access_log()
+
+
+def median_results(runs: Sequence[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """Per-scenario, per-metric median of several ``run_benchmark`` results."""
+    merged = {}
+    for scenario in runs[0]:
+        merged[scenario] = {}
+        for metric, first in runs[0][scenario].items():
+            value = float(np.median([run[scenario][metric] for run in runs]))
+            merged[scenario][metric] = int(value) if isinstance(first, int) else round(value, 3)
+    return merged
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float, alloc_threshold: float = 0.1
+) -> List[str]:
+    """Human-readable regressions: metrics worse than the baseline by more than their threshold."""
+    regressions = []
+    for scenario, metrics in results.items():
+        reference = baseline.get(scenario)
+        if not reference:
+            continue
+        for compared, limit in ((TIMINGS, threshold), (ALLOCATIONS, alloc_threshold)):
+            for metric, higher_is_better in compared.items():
+                old, new = reference.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                change = (old - new) / old if higher_is_better else (new - old) / old
+                if change > limit:
+                    regressions.append(f"{scenario}.{metric}: {old} -> {new} ({change:+.0%} worse)")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="default: all")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--alloc-samples", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3, help="timed rounds per scenario; the best is kept")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--threshold", type=float, default=0.3, help="allowed relative timing regression")
+    parser.add_argument("--alloc-threshold", type=float, default=0.1, help="allowed relative allocation regression")
+    parser.add_argument("--update-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--baseline-runs", type=int, default=3, help="runs whose median --update-baseline keeps")
+    args = parser.parse_args()
+
+    settings = {
+        "requests": args.requests, "concurrency": args.concurrency,
+        "rounds": args.rounds, "alloc_samples": args.alloc_samples,
+    }
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+    if baseline is not None and not args.update_baseline and baseline.get(SETTINGS_KEY) != settings:
+        print(f"baseline {baseline_path} was measured with {baseline.get(SETTINGS_KEY)}, not {settings}; "
+              "re-run with those settings or --update-baseline", file=sys.stderr)
+        sys.exit(2)
+
+    runs = [
+        asyncio.run(run_benchmark(
+            args.scenario or tuple(SCENARIOS), args.requests, args.concurrency, args.alloc_samples,
+            rounds=args.rounds,
+        ))
+        for _ in range(args.baseline_runs if args.update_baseline else 1)
+    ]
+    results = median_results(runs)
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps({SETTINGS_KEY: settings, **results}, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {baseline_path}")
+    elif baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.alloc_threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+    else:
+        print(f"no baseline at {baseline_path}; run with --update-baseline to create one")
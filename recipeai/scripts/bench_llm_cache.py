@@ -0,0 +1,56 @@
+"""Script: LLM cache / coalescing benchmark against the local fake provider
+
+    python -m recipeai.scripts.bench_llm_cache --requests 2000 --prompts 50
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from recipeai.adapters.llm.cached_provider import CachedLLMProvider
+from recipeai.adapters.llm.fake_provider import FakeLLMProvider
+
+
+async def run(requests: int, prompts: int, concurrency: int, latency: float, burst: int) -> dict:
+    fake = FakeLLMProvider(latency=latency)
+    provider = CachedLLMProvider(fake, max_concurrency=concurrency)
+    rng = random.Random(0)
+    # Skewed popularity: a few prompts dominate, like real traffic.
+    weights = [1 / (rank + 1) for rank in range(prompts)]
+    workload = rng.choices([f"prompt-{i}" for i in range(prompts)], weights, k=requests)
+    latencies = []
+
+    async def one(prompt):
+        start = time.perf_counter()
+        await provider.complete(prompt)
+        latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    # Requests arrive in bursts: concurrent within a burst, bursts back to back.
+    for i in range(0, requests, burst):
+        await asyncio.gather(*(one(p) for p in workload[i:i + burst]))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    stats = provider.stats()
+    return {
+        "requests": requests,
+        "upstream_calls": fake.calls,
+        "hit_rate": stats["hits"] / requests,
+        "coalesced": stats["coalesced"],
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "elapsed_s": elapsed,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--prompts", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--burst", type=int, default=100)
+    args = parser.parse_args()
+    result = asyncio.run(run(args.requests, args.prompts, args.concurrency, args.latency, args.burst))
+    for key, value in result.items():
+        print(f"{key:>15}: {value:.3f}" if isinstance(value, float) else f"{key:>15}: {value}")
@@ -0,0 +1,40 @@
+"""Script: RecipeDB client benchmark against the local stand-in server
+
+    python -m recipeai.scripts.bench_recipedb --recipes 1000 --latency 0.005
+"""
+import argparse
+import asyncio
+import time
+
+from recipeai.adapters.recipedb.client import RecipeDBClient
+from recipeai.adapters.recipedb.stub_server import RecipeDBStubServer
+
+
+async def run(url: str, ids, batch_size: int, concurrency: int) -> float:
+    client = RecipeDBClient(url, batch_size=batch_size, max_concurrency=concurrency)
+    start = time.perf_counter()
+    try:
+        if batch_size == 1:
+            for recipe_id in ids:
+                await client.fetch(recipe_id)
+        else:
+            await client.fetch_many(ids)
+    finally:
+        await client.aclose()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    corpus = [{"id": str(i), "name": f"Recipe {i}", "ingredients": ["rice"]} for i in range(args.recipes)]
+    ids = [r["id"] for r in corpus]
+    for label, batch_size in (("sequential fetch", 1), ("fetch_many", args.batch_size)):
+        with RecipeDBStubServer(corpus, latency=args.latency) as server:
+            elapsed = asyncio.run(run(server.url, ids, batch_size, args.concurrency))
+            print(f"{label:>17}: {elapsed:7.3f}s  {server.requests:5d} round trips")
@@ -0,0 +1,83 @@
+"""Script: customize-response encoding benchmark
+
+    python -m recipeai.scripts.bench_serialization [--rounds 2000] [--profiles 4]
+
+Compares the previous path (validate into ``CustomizeResponse``, then
+``jsonable_encoder`` + ``json.dumps`` as FastAPI does for a response model)
+with the direct encoders in ``recipeai.api.serialization``, and MessagePack
+when ``msgpack`` is installed. Bodies are real customize results for a few
+diet profiles, so substitutions and nutrition blocks are included.
+"""
+import argparse
+import json
+import time
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from recipeai.api import serialization
+from recipeai.api.routes.customize import (
+    CustomizeResponse, _response_body, _to_preferences, PreferenceProfile,
+)
+from recipeai.application.customize_recipe import CustomizeRecipe
+from recipeai.application.knowledge_base import get_knowledge_base
+
+DIETS = ("vegan", "vegetarian", "pescatarian", "non-veg")
+
+
+def bodies(profiles: int) -> List[dict]:
+    kb = get_knowledge_base()
+    recipe = kb.to_recipe(kb.recipes_by_id["1"])
+    customizer = CustomizeRecipe(kb)
+    out = []
+    for i in range(profiles):
+        profile = PreferenceProfile(dietary_type=DIETS[i % len(DIETS)], allergens=["nuts"] if i % 2 else [])
+        result = customizer.execute(recipe, _to_preferences(profile))
+        body = _response_body(recipe, result)
+        body["nutrition"] = kb.nutrition.compare_batch([(recipe.ingredients, result["modified_ingredients"])])[0]
+        out.append(body)
+    return out
+
+
+def _model_path(body: dict) -> bytes:
+    content = jsonable_encoder(CustomizeResponse(**body))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def encoders() -> Dict[str, Callable[[dict], bytes]]:
+    paths = {"model+json": _model_path, "direct": serialization.dumps}
+    if serialization.msgpack is not None:
+        paths["msgpack"] = lambda body: serialization.encode(body, serialization.MSGPACK)
+    return paths
+
+
+def run(rounds: int, profiles: int) -> Dict[str, dict]:
+    samples = bodies(profiles)
+    results = {}
+    for label, encode in encoders().items():
+        size = sum(len(encode(body)) for body in samples) / len(samples)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for body in samples:
+                encode(body)
+        elapsed = time.perf_counter() - started
+        results[label] = {
+            "ops_per_s": rounds * len(samples) / elapsed,
+            "us_per_op": elapsed / (rounds * len(samples)) * 1e6,
+            "bytes": size,
+        }
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--profiles", type=int, default=4)
+    args = parser.parse_args()
+    results = run(args.rounds, args.profiles)
+    baseline = results["model+json"]["us_per_op"]
+    for label, stats in results.items():
+        print(
+            f"{label:>12}: {stats['ops_per_s']:>10.0f} ops/s  {stats['us_per_op']:>8.2f} us/op  "
+            f"{stats['bytes']:>7.0f} B  x{baseline / stats['us_per_op']:.1f}"
+        )
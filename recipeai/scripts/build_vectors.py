@@ -1,3 +1,130 @@
-"""Script: build ingredient vectors"""
+"""Script: build ingredient vectors
+
+    python -m recipeai.scripts.build_vectors [--dim 32] [--out DIR] [--flavor-db PATH]
+                                             [--lists N] [--index-out DIR] [--recall-k 10]
+
+Embeds every ingredient the knowledge base mentions. Features per ingredient:
+positive PMI over recipe co-occurrence (substitution rules count as extra
+co-occurrences between an ingredient and its options), allergen-group
+membership, hashed name tokens and, with ``--flavor-db``, FlavorDB note
+weights. The feature matrix is reduced with a truncated SVD, L2-normalized
+and written as a memory-mapped store (see ``ai_pipeline.vector_store``).
+An IVF index and the sparse recipe pairing matrix, both keyed by the new
+store's rows, are built alongside it, followed by a recall@k report of the
+index against the exact scan for a range of ``nprobe`` values.
+"""
+import argparse
+import time
+import zlib
+from itertools import combinations
+from typing import List
+
+import numpy as np
+
+from recipeai.adapters.flavordb.store import FlavorStore
+from recipeai.ai_pipeline.ann_index import DEFAULT_INDEX_DIR, IVFIndex, build_ivf, recall_report
+from recipeai.ai_pipeline.pairing_matrix import DEFAULT_PAIRING_DIR, PairingMatrix
+from recipeai.ai_pipeline.vector_store import DEFAULT_VECTORS_DIR, IngredientVectors, save_vectors
+from recipeai.application.knowledge_base import KnowledgeBase, get_knowledge_base
+
+HASH_BUCKETS = 64
+
+
+def cooccurrence_ppmi(kb: KnowledgeBase, index: dict) -> np.ndarray:
+    counts = np.zeros((len(index), len(index)), dtype=np.float64)
+    for recipe in kb.recipes:
+        rows = sorted({index[i.lower()] for i in recipe.get("ingredients", [])})
+        for a, b in combinations(rows, 2):
+            counts[a, b] += 1
+            counts[b, a] += 1
+    for ingredient, by_diet in kb.substitution_rules.items():
+        for options in by_diet.values():
+            for option in options:
+                a, b = index[ingredient], index[option.lower()]
+                counts[a, b] += 1
+                counts[b, a] += 1
+    total = counts.sum()
+    if not total:
+        return counts
+    marginals = counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pmi = np.log(counts * total / (marginals @ marginals.T))
+    return np.nan_to_num(np.maximum(pmi, 0.0), nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def allergen_features(kb: KnowledgeBase, names: List[str]) -> np.ndarray:
+    groups = sorted(kb.allergens)
+    features = np.zeros((len(names), len(groups)))
+    for row, name in enumerate(names):
+        for col, group in enumerate(groups):
+            if kb.allergen_matcher.matches(name, frozenset([group])):
+                features[row, col] = 1.0
+    return features
+
+
+def token_features(names: List[str]) -> np.ndarray:
+    features = np.zeros((len(names), HASH_BUCKETS))
+    for row, name in enumerate(names):
+        for token in name.split():
+            features[row, zlib.crc32(token.encode()) % HASH_BUCKETS] += 1.0
+    return features
+
+
+def flavor_features(store: FlavorStore, names: List[str]) -> np.ndarray:
+    profiles = [store.get_flavor_profile(name) for name in names]
+    notes = sorted({note for profile in profiles for note in profile})
+    column = {note: i for i, note in enumerate(notes)}
+    features = np.zeros((len(names), len(notes)))
+    for row, profile in enumerate(profiles):
+        for note, weight in profile.items():
+            features[row, column[note]] = weight
+    return features
+
+
+def reduce(features: np.ndarray, dim: int) -> np.ndarray:
+    centered = features - features.mean(axis=0)
+    u, s, _ = np.linalg.svd(centered, full_matrices=False)
+    dim = min(dim, len(s))
+    vectors = u[:, :dim] * s[:dim]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def build(kb: KnowledgeBase, dim: int, flavor_db=None):
+    names = list(kb.vocabulary())
+    index = {name: i for i, name in enumerate(names)}
+    blocks = [cooccurrence_ppmi(kb, index), 2.0 * allergen_features(kb, names), 0.5 * token_features(names)]
+    if flavor_db:
+        store = FlavorStore(flavor_db)
+        try:
+            blocks.append(flavor_features(store, names))
+        finally:
+            store.close()
+    return names, reduce(np.hstack(blocks), dim)
+
+
 if __name__ == '__main__':
-    print('build vectors placeholder')
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dim", type=int, default=32)
+    parser.add_argument("--out", default=str(DEFAULT_VECTORS_DIR))
+    parser.add_argument("--flavor-db", default=None, help="FlavorStore SQLite file to add note weights from")
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default: sqrt of the vocabulary)")
+    parser.add_argument("--index-out", default=str(DEFAULT_INDEX_DIR))
+    parser.add_argument("--recall-k", type=int, default=10)
+    parser.add_argument("--pairing-out", default=str(DEFAULT_PAIRING_DIR))
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    kb = get_knowledge_base()
+    names, vectors = build(kb, args.dim, args.flavor_db)
+    save_vectors(args.out, names, vectors, extra={"knowledge_version": kb.version})
+    stored = IngredientVectors(args.out)
+    build_ivf(args.index_out, stored, args.lists)
+    index = IVFIndex(args.index_out, stored)
+    pairing = PairingMatrix.from_recipes((r.get("ingredients", []) for r in kb.recipes), stored)
+    pairing.save(args.pairing_out)
+    print({"ingredients": len(names), "dim": vectors.shape[1], "lists": index.n_lists,
+           "pairings": pairing.nnz, "out": args.out,
+           "seconds": round(time.perf_counter() - started, 3)})
+    for row in recall_report(index, args.recall_k, nprobes=(1, 2, 4, 8, index.n_lists)):
+        print(row)
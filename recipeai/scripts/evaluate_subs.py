@@ -1,3 +1,215 @@
-"""Script: evaluate substitutions"""
+"""Script: evaluate substitutions
+
+    python -m recipeai.scripts.evaluate_subs [--corpus PATH] [--write-corpus PATH]
+                                             [--workers 4] [--repeat 1] [--k 3] [--cold]
+                                             [--out subs_eval.json]
+
+Runs ``SubstituteIngredient`` and ``CustomizeRecipe`` over a labeled corpus of
+(recipe, diet, allergens, expected substitutes) across a process pool and
+writes quality (hit@1, hit@k, allergen leak and diet violation rates) and
+performance (ops/sec, p50/p95/p99 latency, peak RSS) to a JSON file meant to
+be diffed between commits.
+
+Without ``--corpus`` the corpus is generated from the knowledge base: every
+ingredient a diet rules out is labeled with its substitution-rule options, or
+else with every allowed ingredient sharing a functional category. Each
+label's source ("rules", "categories", or "labelled" for a hand-made corpus
+without ``sources``) is kept, and hit rates are also reported per source
+under ``quality.by_label_source``. Rule-backed labels are the very options
+the substituter picks from, so their hit rates only check that rules are
+followed; the category and hand-labelled rates are the meaningful ones.
+"""
+import argparse
+import json
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from recipeai.application.customize_recipe import CustomizeRecipe
+from recipeai.application.knowledge_base import KnowledgeBase, get_knowledge_base
+from recipeai.application.substitute_ingredient import VEGAN
+from recipeai.core.entities.UserPreference import UserPreference
+
+DIETS = ("vegan", "vegetarian", "non-veg")
+
+
+def expected_substitutes(kb: KnowledgeBase, ingredient: str, diet: str) -> Tuple[List[str], str]:
+    """``(labels, source)``: the substitution-rule options, else same-function ingredients."""
+    options = kb.substitution_rules.get(ingredient, {}).get(diet)
+    if options:
+        return list(options), "rules"
+    blocked = kb.dietary.masks[diet]
+    functional = kb.ingredient_masks.get(ingredient, 0) & ~(blocked | VEGAN)
+    return sorted(
+        name for name, mask in kb.ingredient_masks.items()
+        if not kb.violates(name, diet, mask) and functional & mask
+    ), "categories"
+
+
+def build_corpus(kb: KnowledgeBase) -> List[dict]:
+    allergen_sets = [[]] + [[group] for group in sorted(kb.allergens)]
+    cases = []
+    for raw in kb.recipes:
+        for diet in DIETS:
+            blocked = kb.dietary.masks.get(diet, 0)
+            expected, sources = {}, {}
+            for name in raw.get("ingredients", []):
+                name = name.lower()
+                if kb.ingredient_masks.get(name, 0) & blocked:
+                    expected[name], sources[name] = expected_substitutes(kb, name, diet)
+            for allergens in allergen_sets:
+                cases.append({
+                    "recipe_id": str(raw["id"]),
+                    "diet": diet,
+                    "allergens": allergens,
+                    "expected": expected,
+                    "sources": sources,
+                })
+    return cases
+
+
+def evaluate_chunk(cases: Sequence[dict], k: int = 3, cold: bool = False) -> Dict:
+    """Evaluate ``cases`` in this process; returns raw counters and latency samples."""
+    kb = get_knowledge_base()
+    customizer = CustomizeRecipe(kb)
+    substitutor = customizer.substitutor
+    out = {
+        "cases": 0, "labels": 0, "hit_at_1": 0, "hit_at_k": 0, "unresolved": 0,
+        "allergen_cases": 0, "allergen_leaks": 0, "diet_violations": 0,
+        "customize_us": [], "substitute_us": [],
+        "by_source": {},  # label source -> {"labels", "hit_at_1", "hit_at_k"}
+    }
+    for case in cases:
+        if cold:
+            kb.substitutions.clear()
+        recipe = kb.to_recipe(kb.recipes_by_id[case["recipe_id"]])
+        context = [i.name for i in recipe.ingredients]
+
+        for ingredient, expected in case["expected"].items():
+            started = time.perf_counter()
+            best = substitutor.execute(ingredient, case["diet"], context)["substitute"]
+            out["substitute_us"].append((time.perf_counter() - started) * 1e6)
+            ranked = substitutor.rank(ingredient, case["diet"], context, k)
+            hit_at_1, hit_at_k = best in expected, any(name in expected for name in ranked)
+            out["labels"] += 1
+            out["unresolved"] += best is None
+            out["hit_at_1"] += hit_at_1
+            out["hit_at_k"] += hit_at_k
+            source = out["by_source"].setdefault(
+                case.get("sources", {}).get(ingredient, "labelled"), {"labels": 0, "hit_at_1": 0, "hit_at_k": 0}
+            )
+            source["labels"] += 1
+            source["hit_at_1"] += hit_at_1
+            source["hit_at_k"] += hit_at_k
+
+        preferences = UserPreference("eval", case["diet"], list(case["allergens"]), [], {})
+        started = time.perf_counter()
+        result = customizer.execute(recipe, preferences)
+        out["customize_us"].append((time.perf_counter() - started) * 1e6)
+
+        final = [i.name for i in result["modified_ingredients"]]
+        if case["allergens"]:
+            out["allergen_cases"] += 1
+            groups = frozenset(case["allergens"])
+            out["allergen_leaks"] += any(kb.allergen_matcher.matches(n, groups) for n in final)
+        out["diet_violations"] += any(kb.violates(n, case["diet"]) for n in final)
+        out["cases"] += 1
+    out["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return out
+
+
+def _merge(parts: Sequence[Dict]) -> Dict:
+    merged = {key: type(value)() for key, value in parts[0].items()}
+    for part in parts:
+        for key, value in part.items():
+            if key == "peak_rss_mb":
+                merged[key] = max(merged[key], value)
+            elif isinstance(value, list):
+                merged[key].extend(value)
+            elif isinstance(value, dict):
+                for source, counts in value.items():
+                    total = merged[key].setdefault(source, dict.fromkeys(counts, 0))
+                    for name, count in counts.items():
+                        total[name] += count
+            else:
+                merged[key] += value
+    return merged
+
+
+def _latency(samples: List[float]) -> Dict:
+    if not samples:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {"count": len(samples), "p50_us": round(p50, 1), "p95_us": round(p95, 1), "p99_us": round(p99, 1)}
+
+
+def evaluate(cases: Sequence[dict], workers: int = 4, k: int = 3, cold: bool = False) -> Dict:
+    """Run the corpus (inline when ``workers`` is 0) and summarize it as a diffable report."""
+    started = time.perf_counter()
+    if workers <= 0:
+        parts = [evaluate_chunk(cases, k, cold)]
+    else:
+        chunks = [cases[i::workers * 4] for i in range(workers * 4)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(evaluate_chunk, chunks, [k] * len(chunks), [cold] * len(chunks)))
+    elapsed = time.perf_counter() - started
+    totals = _merge([p for p in parts if p["cases"]] or parts)
+
+    def rate(numerator: str, denominator: str) -> float:
+        return round(totals[numerator] / totals[denominator], 4) if totals[denominator] else 0.0
+
+    return {
+        "config": {"cases": totals["cases"], "labels": totals["labels"], "workers": workers, "k": k, "cold": cold},
+        "quality": {
+            "hit_at_1": rate("hit_at_1", "labels"),
+            f"hit_at_{k}": rate("hit_at_k", "labels"),
+            "unresolved_rate": rate("unresolved", "labels"),
+            "allergen_leak_rate": rate("allergen_leaks", "allergen_cases"),
+            "diet_violation_rate": rate("diet_violations", "cases"),
+            "by_label_source": {
+                source: {
+                    "labels": counts["labels"],
+                    "hit_at_1": round(counts["hit_at_1"] / counts["labels"], 4),
+                    f"hit_at_{k}": round(counts["hit_at_k"] / counts["labels"], 4),
+                }
+                for source, counts in sorted(totals["by_source"].items())
+            },
+        },
+        "performance": {
+            "wall_seconds": round(elapsed, 3),
+            "ops_per_second": round(totals["cases"] / elapsed, 1) if elapsed else 0.0,
+            "customize": _latency(totals["customize_us"]),
+            "substitute": _latency(totals["substitute_us"]),
+            "peak_rss_mb": round(totals["peak_rss_mb"], 1),
+        },
+    }
+
+
 if __name__ == '__main__':
-    print('evaluate substitutions placeholder')
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=None, help="labeled corpus JSON (default: generate from knowledge)")
+    parser.add_argument("--write-corpus", default=None, help="also save the corpus used to this path")
+    parser.add_argument("--workers", type=int, default=4, help="process pool size; 0 runs inline")
+    parser.add_argument("--repeat", type=int, default=1, help="run the corpus this many times")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--cold", action="store_true", help="clear the substitution memo before every case")
+    parser.add_argument("--out", default="subs_eval.json")
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus) as f:
+            corpus = json.load(f)
+    else:
+        corpus = build_corpus(get_knowledge_base())
+    if args.write_corpus:
+        with open(args.write_corpus, "w") as f:
+            json.dump(corpus, f, indent=2)
+
+    report = evaluate(corpus * args.repeat, args.workers, args.k, args.cold)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(json.dumps(report, indent=2, sort_keys=True))
@@ -0,0 +1,58 @@
+"""Script: bulk-import recipes into the SQLite recipe store
+
+    python -m recipeai.scripts.import_recipes [--db PATH] [--source PATH] [--batch-size 5000]
+
+``--source`` is ``knowledge/recipes.json`` by default, or a RecipeDB dump:
+a JSON array, an object with a ``recipes`` array, or JSON lines (one record
+per line, streamed). Re-importing a recipe id replaces it. Point the API at
+the result with ``RECIPEAI_RECIPE_DB=PATH``.
+
+Diet masks are computed from the knowledge files at import time; after
+changing ingredient_categories, allergen_map or allergen_exclusions, re-run
+the import (the API answers diet-filtered searches with 422 until then).
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Iterator
+
+from recipeai.adapters.recipestore.sqlite import DEFAULT_DB_PATH, SQLiteRecipeStore
+from recipeai.application.knowledge_base import KNOWLEDGE_DIR, get_knowledge_base
+
+
+def read_recipes(path: Path) -> Iterator[dict]:
+    with open(path) as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            yield from json.load(f)
+        elif first == "{" and path.suffix == ".json":
+            data = json.load(f)
+            yield from data.get("recipes", [data])
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH))
+    parser.add_argument("--source", default=str(KNOWLEDGE_DIR / "recipes.json"))
+    parser.add_argument("--batch-size", type=int, default=5000, help="recipes per transaction")
+    args = parser.parse_args()
+
+    kb = get_knowledge_base()
+    store = SQLiteRecipeStore(Path(args.db), kb.ingredient_categories)
+    started = time.perf_counter()
+    try:
+        count = store.import_recipes(
+            read_recipes(Path(args.source)), kb.diet_mask, args.batch_size, diet_source=kb.diet_fingerprint
+        )
+        total = len(store)
+    finally:
+        store.close()
+    print({"imported": count, "total": total, "seconds": round(time.perf_counter() - started, 3)})
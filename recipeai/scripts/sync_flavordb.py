@@ -1,3 +1,45 @@
-"""Script: sync FlavorDB"""
+"""Script: sync FlavorDB into the local compound store
+
+    python -m recipeai.scripts.sync_flavordb --base-url https://... [--db PATH]
+    python -m recipeai.scripts.sync_flavordb --fake   # against a local fake FlavorDB
+
+Re-running only pulls entities changed since the last committed page.
+"""
+import argparse
+import asyncio
+import time
+
+from recipeai.adapters.flavordb.client import FlavorDBClient
+from recipeai.adapters.flavordb.fake_server import FakeFlavorDBServer
+from recipeai.adapters.flavordb.store import DEFAULT_STORE_PATH, FlavorStore
+from recipeai.adapters.flavordb.sync import sync_flavordb
+from recipeai.application.knowledge_base import get_knowledge_base
+
+
+async def run(base_url: str, db, concurrency: int, page_size: int) -> dict:
+    client = FlavorDBClient(base_url, max_connections=concurrency)
+    store = FlavorStore(db)
+    try:
+        return await sync_flavordb(client, store, concurrency, page_size)
+    finally:
+        await client.aclose()
+        store.close()
+
+
 if __name__ == '__main__':
-    print('sync flavordb placeholder')
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="https://cosylab.iiitd.edu.in/flavordb")
+    parser.add_argument("--db", default=str(DEFAULT_STORE_PATH))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--fake", action="store_true", help="sync from a local fake FlavorDB")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.fake:
+        with FakeFlavorDBServer(get_knowledge_base().vocabulary()) as server:
+            stats = asyncio.run(run(server.url, args.db, args.concurrency, args.page_size))
+    else:
+        stats = asyncio.run(run(args.base_url, args.db, args.concurrency, args.page_size))
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    print(stats)
@@ -0,0 +1,72 @@
+"""Atomic publishing of on-disk store directories
+
+The memory-mapped stores (ingredient vectors, IVF index, pairing matrix,
+columnar recipes) are directories of ``.npy`` files plus ``meta.json``.
+``atomic_directory`` stages a new version in a uniquely named sibling
+directory and publishes it by flipping a symlink at the store path with
+``os.replace``, so readers always find a complete store: the old version
+until the flip, the new one after it. The version it replaces is removed
+afterwards; processes that still have it mapped keep their pages.
+
+A store path that is still a plain directory (as shipped in the repo) is
+moved aside once and replaced by the link. Leftover ``<name>.old``
+directories from the earlier rename-based swap are cleared first.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+def _remove(path: Path) -> None:
+    if path.is_symlink() or path.is_file():
+        path.unlink()
+    elif path.exists():
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def publish_directory(staging: Path, path: Path) -> None:
+    """Make ``path`` point at the complete directory ``staging`` (a sibling of ``path``)."""
+    staging, path = Path(staging), Path(path)
+    _remove(path.with_name(path.name + ".old"))
+
+    previous = None
+    if path.is_symlink():
+        previous = path.parent / os.readlink(path)
+    elif path.exists():
+        previous = Path(tempfile.mkdtemp(prefix=path.name + ".", dir=path.parent))
+        os.replace(path, previous)
+
+    link = path.with_name(f".{path.name}.{uuid.uuid4().hex}.link")
+    os.symlink(staging.name, link)
+    try:
+        os.replace(link, path)
+    except BaseException:
+        _remove(link)
+        raise
+    if previous is not None and previous.resolve() != staging.resolve():
+        _remove(previous)
+
+
+@contextmanager
+def atomic_directory(path: Path) -> Iterator[Path]:
+    """
+    Yield an empty staging directory and publish it at ``path`` on success
+
+    On any error the staging directory is removed and ``path`` is untouched.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=path.name + ".", dir=path.parent))
+    try:
+        yield staging
+        staging.chmod(0o755)  # mkdtemp creates it 0700; published stores are read by other users
+        publish_directory(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
@@ -0,0 +1,39 @@
+from recipeai.application.knowledge_base import KnowledgeBase
+from recipeai.core.domain_services.AllergenMatcher import AllergenMatcher
+
+ALLERGENS = {
+    "dairy": ["butter", "cream", "milk"],
+    "soy": ["soy sauce", "tofu"],
+    "eggs": ["eggs", "mayonnaise"],
+    "nuts": ["peanuts"],
+}
+
+
+def test_catches_phrases_and_plurals():
+    matcher = AllergenMatcher(ALLERGENS)
+    assert matcher.groups_for("Unsalted Butter") == {"dairy"}
+    assert matcher.groups_for("soy sauce, low sodium") == {"soy"}
+    assert matcher.groups_for("1 egg") == {"eggs"}
+    assert matcher.groups_for("eggplant") == frozenset()
+
+
+def test_exclusion_phrases_override_the_words_they_cover():
+    matcher = AllergenMatcher(ALLERGENS, exclusions={
+        "dairy": ["peanut butter", "oat milk"],
+        "eggs": ["eggless mayonnaise"],
+    })
+    assert matcher.groups_for("peanut butter") == {"nuts"}
+    assert matcher.groups_for("Oat Milk") == frozenset()
+    assert matcher.groups_for("eggless mayonnaise") == frozenset()
+    assert matcher.groups_for("peanut butter and milk") == {"nuts", "dairy"}
+    assert matcher.groups_for("butter") == {"dairy"}
+
+
+def test_knowledge_base_excludes_dairy_alternatives():
+    groups = KnowledgeBase.load().allergen_matcher.groups_for
+    assert groups("peanut butter") == {"nuts"}
+    for name in ("oat milk", "soy milk", "coconut milk", "vegan butter", "cocoa butter"):
+        assert "dairy" not in groups(name), name
+    assert groups("eggless mayonnaise") == frozenset()
+    assert groups("lactose-free milk") == {"dairy"} and groups("mayonnaise") == {"eggs"}
+    assert groups("soy milk") == {"soy"} and groups("flax eggs") == frozenset()
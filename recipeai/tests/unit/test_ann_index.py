@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from recipeai.ai_pipeline.ann_index import IVFIndex, build_ivf, recall_report
+from recipeai.ai_pipeline.vector_store import IngredientVectors, save_vectors
+from recipeai.application.knowledge_base import get_knowledge_base
+from recipeai.application.substitute_ingredient import SubstituteIngredient
+from recipeai.scripts.build_vectors import build
+
+
+def _clustered_store(path, n=400, dim=16, clusters=8):
+    rng = np.random.default_rng(1)
+    centres = rng.normal(size=(clusters, dim))
+    points = centres[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    save_vectors(path, [f"item {i}" for i in range(n)], points)
+    return IngredientVectors(path)
+
+
+def test_ivf_recall_rises_with_nprobe_and_is_exact_when_probing_everything(tmp_path):
+    vectors = _clustered_store(tmp_path / "vectors")
+    build_ivf(tmp_path / "ivf", vectors, n_lists=8)
+    index = IVFIndex(tmp_path / "ivf", vectors)
+    assert isinstance(index.centroids, np.memmap)
+
+    report = recall_report(index, k=10, nprobes=(1, 2, 8))
+    recalls = [row["recall_at_k"] for row in report]
+    assert recalls == sorted(recalls)
+    assert recalls[-1] == 1.0 and recalls[0] > 0.5
+
+    neighbours = index.neighbours("item 3", k=5, nprobe=8)
+    assert len(neighbours) == 5 and "item 3" not in dict(neighbours)
+
+
+def test_index_refuses_a_rebuilt_vector_store(tmp_path):
+    vectors = _clustered_store(tmp_path / "vectors", n=50)
+    build_ivf(tmp_path / "ivf", vectors, n_lists=4)
+    save_vectors(tmp_path / "vectors", ["a", "b"], np.eye(2))
+    with pytest.raises(ValueError):
+        IVFIndex(tmp_path / "ivf", IngredientVectors(tmp_path / "vectors"))
+
+
+def test_substitution_falls_back_to_nearest_allowed_ingredient(tmp_path):
+    kb = get_knowledge_base()
+    names, vectors = build(kb, dim=32)
+    save_vectors(tmp_path / "vectors", names, vectors)
+    stored = IngredientVectors(tmp_path / "vectors")
+    build_ivf(tmp_path / "ivf", stored)
+    substitutor = SubstituteIngredient(kb, neighbours=IVFIndex(tmp_path / "ivf", stored), nprobe=100)
+
+    assert "salmon" not in kb.substitution_rules
+    result = substitutor.execute("salmon", "vegan", ["rice"])
+    categories = kb.ingredient_categories[result["substitute"]]
+    assert not categories & set(kb.dietary.constraints["vegan"].blocked_categories)
+    assert "protein" in categories and result["substitute"] != "rice"
+    assert 0 < result["confidence"] < 0.8
+
+    assert substitutor.execute("beef", "keto", [])["substitute"] is None
+    assert substitutor.execute("unknown thing", "vegan", [])["substitute"] is None
+
+
+def test_index_refuses_a_reordered_vector_store_of_the_same_size(tmp_path):
+    vectors = _clustered_store(tmp_path / "vectors", n=50)
+    build_ivf(tmp_path / "ivf", vectors, n_lists=4)
+    names = list(vectors.names())
+    save_vectors(tmp_path / "vectors", names[::-1], np.asarray(vectors.vectors)[::-1])
+    with pytest.raises(ValueError):
+        IVFIndex(tmp_path / "ivf", IngredientVectors(tmp_path / "vectors"))
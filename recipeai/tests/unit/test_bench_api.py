@@ -0,0 +1,45 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from recipeai.scripts.bench_api import DEFAULT_BASELINE, SCENARIOS, SETTINGS_KEY, compare, median_results, run_benchmark
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    baseline = {"search": {"requests_per_second": 1000, "p99_ms": 10.0, "peak_bytes_per_request": 20000}}
+    results = {"search": {"requests_per_second": 800, "p99_ms": 10.5, "peak_bytes_per_request": 23000}}
+    regressions = compare(results, baseline, threshold=0.1, alloc_threshold=0.1)
+    assert [r.split(":")[0] for r in regressions] == ["search.requests_per_second", "search.peak_bytes_per_request"]
+    assert compare(results, baseline, threshold=0.5, alloc_threshold=0.5) == []
+    assert compare({"health": results["search"]}, baseline, threshold=0.0) == []
+
+
+def test_baseline_keeps_the_median_run():
+    runs = [{"search": {"requests_per_second": rps, "peak_bytes_per_request": 100 + i}}
+            for i, rps in enumerate([900.0, 1500.0, 1000.0])]
+    assert median_results(runs) == {"search": {"requests_per_second": 1000.0, "peak_bytes_per_request": 101}}
+
+
+def test_small_run_covers_every_scenario():
+    results = asyncio.run(run_benchmark(requests=20, concurrency=4, alloc_samples=5, warmup=2, rounds=1))
+    assert set(results) == {"health", "search", "search_cached", "customize", "customize_cached"}
+    for metrics in results.values():
+        assert metrics["requests_per_second"] > 0
+        assert metrics["p50_ms"] <= metrics["p99_ms"]
+        assert metrics["peak_bytes_per_request"] > 0
+
+
+def test_uncached_scenarios_never_repeat_a_request():
+    for name in ("search", "customize"):
+        requests = [json.dumps(SCENARIOS[name](n), sort_keys=True) for n in range(500)]
+        assert len(set(requests)) == len(requests), name
+
+
+@pytest.mark.skipif(not os.environ.get("RECIPEAI_BENCH"), reason="set RECIPEAI_BENCH=1 to run the perf gate")
+def test_no_regression_against_baseline():
+    threshold = float(os.environ.get("RECIPEAI_BENCH_THRESHOLD", "0.3"))
+    baseline = json.loads(DEFAULT_BASELINE.read_text())
+    results = asyncio.run(run_benchmark(**baseline[SETTINGS_KEY]))  # measured the way the baseline was
+    assert compare(results, baseline, threshold) == []
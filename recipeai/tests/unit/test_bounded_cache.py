@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from recipeai.adapters.cache import BoundedCache
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = BoundedCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "size": 2}
+
+    sized = BoundedCache(max_entries=100, max_bytes=10, weigher=len)
+    sized.set("x", b"123456")
+    sized.set("y", b"123456")
+    assert sized.get("x") is None and sized.size_bytes == 6
+    with pytest.raises(ValueError):
+        BoundedCache(max_bytes=10)
+
+
+def test_per_entry_ttl():
+    cache = BoundedCache(ttl=60)
+    cache.set("fresh", 1)
+    cache.set("stale", 2, ttl=-1)
+    assert cache.get("fresh") == 1
+    assert cache.get("stale") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_get_or_load_runs_one_load_for_concurrent_cold_key():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "recipe"
+
+    async def scenario(cache):
+        return await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(500)))
+
+    cache = BoundedCache()
+    assert set(asyncio.run(scenario(cache))) == {"recipe"}
+    assert len(calls) == 1
+    assert cache.get("k") == "recipe"
+
+
+def test_failed_load_is_not_cached():
+    async def boom():
+        raise RuntimeError("upstream down")
+
+    cache = BoundedCache()
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_load("k", boom))
+    assert len(cache) == 0
+
+
+def test_cancelling_the_first_caller_leaves_the_shared_load_running():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "recipe"
+
+    async def scenario(cache):
+        leader = asyncio.ensure_future(cache.get_or_load("k", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_load("k", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return leader, await waiter
+
+    cache = BoundedCache()
+    leader, value = asyncio.run(scenario(cache))
+    assert leader.cancelled() and value == "recipe"
+    assert len(calls) == 1 and cache.coalesced == 1 and cache.get("k") == "recipe"
@@ -0,0 +1,69 @@
+import numpy as np
+
+from recipeai.adapters.recipestore.columnar import ColumnarRecipeStore
+
+RECIPES = [
+    {"id": "1", "name": "Chicken Pasta", "cuisine": "Italian",
+     "ingredients": ["chicken", "pasta", "parmesan"], "dietary_tags": [], "instructions": ["Boil", "Toss"]},
+    {"id": "2", "name": "Chickpea Curry", "cuisine": "Indian",
+     "ingredients": ["chickpeas", "tomato"], "dietary_tags": ["vegan", "gluten-free"]},
+    {"id": "10", "name": "Pesto Pasta", "cuisine": "Italian",
+     "ingredients": ["pasta", "basil", "parmesan", "pasta"], "dietary_tags": ["vegetarian"]},
+    {"id": "3", "name": "Plain Rice", "ingredients": ["rice"]},
+]
+
+
+def _ids(store, rows):
+    return [store.recipe_id(row) for row in rows]
+
+
+def test_get_materializes_domain_recipe():
+    store = ColumnarRecipeStore.from_recipes(RECIPES, {"chicken": ["meat", "protein"]})
+    recipe = store.get("1")
+    assert [i.name for i in recipe.ingredients] == ["chicken", "pasta", "parmesan"]
+    assert recipe.ingredients[0].categories == ("meat", "protein")
+    assert (recipe.cuisine, recipe.instructions) == ("Italian", ["Boil", "Toss"])
+    assert store.get("10").ingredients[-1].name == "parmesan"  # duplicates stored once
+    assert store.get("3").cuisine == "" and store.get("4") is None
+
+
+def test_scan_include_exclude_and_dictionaries():
+    store = ColumnarRecipeStore.from_recipes(RECIPES)
+    assert _ids(store, store.scan(include=["pasta"], exclude=["chicken"])) == ["10"]
+    assert _ids(store, store.scan(include=["basil", "tomato"], match="any")) == ["2", "10"]
+    assert _ids(store, store.scan(include=["pasta", "unknown"])) == []
+    assert _ids(store, store.scan(cuisines=["italian"], tags=["Vegetarian"])) == ["10"]
+    assert _ids(store, store.scan(exclude=["parmesan", "unknown"])) == ["2", "3"]
+
+
+def test_search_matches_word_prefixes_only():
+    store = ColumnarRecipeStore.from_recipes(RECIPES)
+    assert [r.id for r in store.search("chick")] == ["1", "2"]
+    assert [r.id for r in store.search("pasta pe")] == ["10"]
+    assert store.search("asta") == []
+    assert len(store.search("")) == 4
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    store = ColumnarRecipeStore.from_recipes(RECIPES)
+    store.save(tmp_path / "store")
+    loaded = ColumnarRecipeStore.load(tmp_path / "store")
+    assert isinstance(loaded.ingredient_indices, np.memmap)
+    assert loaded.get("2") == store.get("2")
+    assert _ids(loaded, loaded.scan(include=["parmesan"])) == ["1", "10"]
+    assert loaded.ingredient_indices.dtype == np.int32
+
+
+def test_search_finds_word_starts_right_after_a_straddling_match():
+    store = ColumnarRecipeStore.from_recipes([{"id": "a", "name": "Mojito"}, {"id": "b", "name": "Totopos"}])
+    assert [r.id for r in store.search("toto")] == ["b"]
+    assert [r.id for r in store.search("topo")] == []
+
+
+def test_cuisine_and_tag_dictionaries_fold_case():
+    store = ColumnarRecipeStore.from_recipes([
+        {"id": "a", "name": "A", "cuisine": "Thai", "dietary_tags": ["Vegan"]},
+        {"id": "b", "name": "B", "cuisine": "thai", "dietary_tags": ["vegan"]},
+    ])
+    assert store.cuisines == ["Thai"] and store.tags == ["Vegan"]
+    assert _ids(store, store.scan(tags=["vegan"], cuisines=["THAI"])) == ["a", "b"]
@@ -0,0 +1,64 @@
+from fastapi.testclient import TestClient
+
+from recipeai.api.main import app
+from recipeai.application.customize_recipe import CustomizeRecipe
+from recipeai.application.knowledge_base import KnowledgeBase, knowledge_store
+from recipeai.core.entities.Recipe import Ingredient, Recipe
+from recipeai.core.entities.UserPreference import UserPreference
+
+
+def _recipe(recipe_id="r1"):
+    return Recipe(recipe_id, "R", [Ingredient("chicken", "1", "g", ["meat"]), Ingredient("peanuts", "1", "g", [])], [], "", [])
+
+
+def test_fingerprint_ignores_user_and_ordering():
+    a = UserPreference("alice", "vegan", ["Nuts", "dairy"], [], {"spicy": 0.8, "sweet": 0})
+    b = UserPreference("bob", "vegan", ["dairy", " nuts", "nuts"], [], {"spicy": 0.8})
+    assert a.fingerprint() == b.fingerprint()
+    assert a.fingerprint() != UserPreference("alice", "vegan", ["nuts"], [], {"spicy": 0.8}).fingerprint()
+    assert a.fingerprint() != UserPreference("alice", "vegan", ["nuts", "dairy"], [], {"spicy": 0.4}).fingerprint()
+    assert UserPreference("a", "Vegan", [], [], {}).fingerprint() == UserPreference("b", "vegan", [], [], {}).fingerprint()
+
+
+def test_fingerprint_keeps_non_numeric_flavor_values():
+    odd = UserPreference("a", "vegan", [], [], {"sweet": "yes", "notes": {"b": [1], "a": None}})
+    same = UserPreference("b", "vegan", [], [], {"notes": {"a": None, "b": [1]}, "sweet": "yes"})
+    assert odd.fingerprint() == same.fingerprint()
+    assert odd.fingerprint() != UserPreference("a", "vegan", [], [], {"sweet": "no"}).fingerprint()
+
+
+def test_equivalent_profiles_share_one_result():
+    customizer = CustomizeRecipe(KnowledgeBase.load())
+    calls = []
+    original = customizer.execute
+    customizer.execute = lambda *args: calls.append(args[0].id) or original(*args)
+
+    first = customizer.execute_memoized(_recipe(), UserPreference("a", "vegan", ["nuts"], [], {}))
+    again = customizer.execute_memoized(_recipe(), UserPreference("b", "vegan", ["NUTS"], [], {}))
+    other = customizer.execute_memoized(_recipe("r2"), UserPreference("a", "vegan", ["nuts"], [], {}))
+
+    assert again is first and other is not first and calls == ["r1", "r2"]
+    assert [i.name for i in first["modified_ingredients"]] == ["tofu"]
+    assert customizer.knowledge.customizations.stats()["hits"] == 1
+
+
+def test_memo_is_scoped_to_the_knowledge_version():
+    kb = KnowledgeBase.load(version=1)
+    reloaded = KnowledgeBase.load(version=2)
+    prefs = UserPreference("a", "vegan", [], [], {})
+    CustomizeRecipe(kb).execute_memoized(_recipe(), prefs)
+    CustomizeRecipe(reloaded).execute_memoized(_recipe(), prefs)
+    assert kb.customizations.stats()["misses"] == 1 and reloaded.customizations.stats()["misses"] == 1
+
+
+def test_route_reports_memo_hits():
+    request = {"recipe_id": "1", "dietary_type": "vegan", "allergens": ["nuts", "soy"]}
+    with TestClient(app) as client:
+        memo = knowledge_store.current().customizations
+        assert client.post("/api/customize/", json={**request, "flavor_preferences": {"sweet": "yes"}}).status_code == 200
+        hits = memo.hits
+        first = client.post("/api/customize/", json=request).json()
+        second = client.post("/api/customize/", json={**request, "allergens": ["soy", "nuts"]}).json()
+        metrics = client.get("/metrics").text
+    assert first == second and memo.hits == hits + 1
+    assert 'recipeai_cache_hits_total{cache="customizations"}' in metrics
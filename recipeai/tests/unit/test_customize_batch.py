@@ -0,0 +1,80 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from recipeai.api.main import app
+from recipeai.api.routes import customize
+from recipeai.application.customize_recipe import CustomizeRecipe
+from recipeai.core.entities.Recipe import Recipe, Ingredient
+from recipeai.core.entities.UserPreference import UserPreference
+
+
+def _prefs(diet, allergens=()):
+    return UserPreference("test", diet, list(allergens), [], {})
+
+
+def test_execute_batch_resolves_each_ingredient_once_per_profile():
+    recipes = [
+        Recipe(str(i), "R", [Ingredient("chicken", "1", "g", ["meat"])], [], "", [])
+        for i in range(3)
+    ]
+    customizer = CustomizeRecipe()
+    calls = []
+    original = customizer._decide
+    customizer._decide = lambda *args: calls.append(args[0].name) or original(*args)
+
+    results = list(customizer.execute_batch(recipes, [_prefs("vegan"), _prefs("non-veg")]))
+
+    assert len(results) == 6
+    assert calls == ["chicken", "chicken"]
+    assert [r[2]['modified_ingredients'][0].name for r in results[:2]] == ["tofu", "chicken"]
+
+
+def test_batch_endpoint_streams_ndjson():
+    body = {
+        "recipe_ids": ["1", "2"],
+        "profiles": [{"dietary_type": "vegan"}, {"dietary_type": "non-veg", "allergens": ["dairy"]}],
+    }
+    with TestClient(app) as client:
+        response = client.post("/api/customize/batch", json=body)
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [(l["recipe_id"], l["profile"]) for l in lines] == [
+            ("1", 0), ("1", 1), ("2", 0), ("2", 1)
+        ]
+
+        pairs = client.post("/api/customize/batch", json={**body, "pairs": [["2", 1]]})
+        assert [json.loads(line)["recipe_id"] for line in pairs.text.splitlines()] == ["2"]
+
+        bad = client.post("/api/customize/batch", json={**body, "pairs": [["1", 5]]})
+        assert bad.status_code == 422
+
+
+def test_batch_nutrition_matches_the_single_route_across_chunks(monkeypatch):
+    monkeypatch.setattr(customize, "NUTRITION_CHUNK", 2)
+    profile = {"dietary_type": "vegan"}
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/customize/batch",
+            json={"recipe_ids": ["1", "2", "3"], "profiles": [profile], "include_nutrition": True},
+        )
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        single = [
+            client.post("/api/customize/", json={**profile, "recipe_id": rid, "include_nutrition": True}).json()
+            for rid in ("1", "2", "3")
+        ]
+    assert [l["recipe_id"] for l in lines] == ["1", "2", "3"]
+    assert [l["nutrition"] for l in lines] == [s["nutrition"] for s in single]
+
+
+def test_batch_resolves_each_recipe_id_and_rejects_unknown_ones():
+    profile = {"dietary_type": "vegan"}
+    with TestClient(app) as client:
+        response = client.post("/api/customize/batch", json={"recipe_ids": ["1", "5", "7"], "profiles": [profile]})
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        unknown = client.post("/api/customize/batch", json={"recipe_ids": ["5", "nope"], "profiles": [profile]})
+        single = client.post("/api/customize/", json={**profile, "recipe_id": "nope"})
+        names = [client.get(f"/api/recipes/{rid}").json()["name"] for rid in ("1", "5", "7")]
+    assert [l["modified_recipe"]["name"] for l in lines] == names and len(set(names)) == 3
+    assert unknown.status_code == 404 and "nope" in unknown.json()["detail"]
+    assert single.status_code == 404
@@ -0,0 +1,56 @@
+import dataclasses
+
+import pytest
+
+from recipeai.application.customize_recipe import CustomizeRecipe
+from recipeai.application.knowledge_base import get_knowledge_base
+from recipeai.core.domain_services.CategoryRegistry import category_bit, category_mask, category_names
+from recipeai.core.entities.Recipe import Ingredient, Recipe
+from recipeai.core.entities.UserPreference import UserPreference
+
+
+def test_ingredient_is_slotted_frozen_and_interned():
+    first = Ingredient("".join(["chick", "en"]), "1", "g", ["meat", "protein"])
+    second = Ingredient("".join(["chi", "cken"]), "2", "g", ("meat",))
+    assert first.name is second.name
+    assert first.categories == ("meat", "protein")
+    assert not hasattr(first, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.name = "tofu"
+    assert first == Ingredient("chicken", "1", "g", ("meat", "protein"))
+    recipe = Recipe("1", "R", [first], [], "", [])
+    assert not hasattr(recipe, "__dict__")
+
+
+def test_category_masks():
+    mask = category_mask(["dairy", "protein"])
+    blocked = get_knowledge_base().dietary.masks
+    assert category_names(mask) == ("dairy", "protein")
+    assert mask & blocked["vegan"] and not mask & blocked["vegetarian"]
+    # Unknown categories get their own bit instead of colliding with a known one.
+    novel = category_bit("fermented-test-only")
+    assert novel == category_bit("Fermented-Test-Only") and novel & category_mask(["vegan", "meat"]) == 0
+
+
+def test_diet_check_uses_masks():
+    customizer = CustomizeRecipe()
+    assert customizer._violates_diet(Ingredient("milk", "", "", ["dairy"]), "vegan")
+    assert not customizer._violates_diet(Ingredient("milk", "", "", ["dairy"]), "vegetarian")
+    assert not customizer._violates_diet(Ingredient("milk", "", "", ["dairy"]), "non-veg")
+
+
+def test_dairy_free_customization_substitutes_dairy_alternatives():
+    kb = get_knowledge_base()
+    recipe = Recipe("pancakes", "Pancakes", [
+        Ingredient(name, "1", "cup", sorted(kb.ingredient_categories[name])) for name in ("milk", "butter", "flour")
+    ], [], "", [])
+    result = CustomizeRecipe(kb).execute(recipe, UserPreference("u", "dairy-free", [], [], {}))
+    assert [i.name for i in result["modified_ingredients"]] == ["oat milk", "coconut oil", "flour"]
+    assert [s["substitute"] for s in result["substitutions"]] == ["oat milk", "coconut oil"]
+
+
+def test_substitutes_that_are_allergens_are_replaced():
+    recipe = Recipe("x", "Stir fry", [Ingredient("chicken", "1", "g", ["meat"])], [], "", [])
+    result = CustomizeRecipe().execute(recipe, UserPreference("u", "vegan", ["soy"], [], {}))
+    names = [i.name for i in result["modified_ingredients"]]
+    assert names == ["chickpeas"]
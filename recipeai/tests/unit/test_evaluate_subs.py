@@ -0,0 +1,27 @@
+from recipeai.application.knowledge_base import get_knowledge_base
+from recipeai.scripts.evaluate_subs import build_corpus, evaluate
+
+
+def test_corpus_labels_every_ingredient_the_diet_rules_out():
+    kb = get_knowledge_base()
+    corpus = build_corpus(kb)
+    chicken_pasta = next(c for c in corpus if c["recipe_id"] == "1" and c["diet"] == "vegan" and not c["allergens"])
+    assert set(chicken_pasta["expected"]) == {"chicken", "parmesan"}
+    assert chicken_pasta["expected"]["chicken"] == ["tofu", "tempeh", "chickpeas"]
+    assert chicken_pasta["sources"]["chicken"] == "rules"
+    assert all(not c["expected"] for c in corpus if c["diet"] == "non-veg")
+
+
+def test_inline_report_has_quality_and_latency_sections():
+    kb = get_knowledge_base()
+    report = evaluate(build_corpus(kb)[:60], workers=0, k=3)
+    assert report["config"]["cases"] == 60
+    assert 0.0 <= report["quality"]["hit_at_1"] <= report["quality"]["hit_at_3"] <= 1.0
+    assert report["quality"]["allergen_leak_rate"] == 0.0
+    by_source = report["quality"]["by_label_source"]
+    assert sum(s["labels"] for s in by_source.values()) == report["config"]["labels"]
+    assert set(by_source) <= {"rules", "categories"}
+    customize = report["performance"]["customize"]
+    assert customize["count"] == 60 and customize["p50_us"] <= customize["p99_us"]
+    assert report["performance"]["ops_per_second"] > 0
+
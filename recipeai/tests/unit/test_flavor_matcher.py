@@ -0,0 +1,57 @@
+import numpy as np
+
+from recipeai.application.substitute_ingredient import SubstituteIngredient
+from recipeai.core.domain_services.FlavorMatcher import FlavorMatcher
+from recipeai.core.ports.flavor_repository import FlavorRepository
+
+PROFILES = {
+    "tofu": {"umami": 0.3, "sweet": 0.1},
+    "tempeh": {"umami": 0.7, "bitter": 0.2},
+    "chickpeas": {"sweet": 0.6, "earthy": 0.4},
+    "lemon": {"sour": 1.0},
+}
+
+
+def _reference(target, profiles):
+    notes = sorted({n for p in [target, *profiles.values()] for n in p})
+    t = np.array([target.get(n, 0.0) for n in notes])
+    scores = {}
+    for name, profile in profiles.items():
+        c = np.array([profile.get(n, 0.0) for n in notes])
+        scores[name] = float(t @ c / (np.linalg.norm(t) * np.linalg.norm(c)))
+    return sorted(scores.items(), key=lambda kv: -kv[1])
+
+
+def test_top_k_matches_pairwise_cosine_for_a_batch():
+    matcher = FlavorMatcher(PROFILES)
+    targets = [{"umami": 0.8, "bitter": 0.1}, {"sweet": 1.0}, {"sour": 0.2, "earthy": 0.1}]
+    results = matcher.top_k(targets, k=2)
+    for target, result in zip(targets, results):
+        expected = _reference(target, PROFILES)[:2]
+        assert [name for name, _ in result] == [name for name, _ in expected]
+        np.testing.assert_allclose([s for _, s in result], [s for _, s in expected], rtol=1e-5)
+
+
+def test_note_weights_and_dot_metric():
+    weighted = FlavorMatcher(PROFILES, metric="dot", note_weights={"sweet": 4.0})
+    scores = weighted.similarities([{"sweet": 1.0, "umami": 1.0}])[0]
+    assert scores[weighted.names.index("chickpeas")] == np.float32(2.4)
+    assert weighted.top_k([{"sweet": 1.0}], k=10)[0][0][0] == "chickpeas"
+
+
+def test_match_keeps_list_signature():
+    candidates = list(PROFILES.values())
+    ranked = FlavorMatcher().match({"sour": 0.5}, candidates)
+    assert ranked[0] == PROFILES["lemon"] and len(ranked) == len(candidates)
+    assert FlavorMatcher().match({"sour": 0.5}, []) == []
+
+
+class _Profiles(FlavorRepository):
+    def get_flavor_profile(self, ingredient_name):
+        return {"chicken": {"umami": 0.9, "bitter": 0.1}, **PROFILES}.get(ingredient_name, {})
+
+
+def test_substitution_prefers_closest_flavor_when_profiles_exist():
+    result = SubstituteIngredient(flavors=_Profiles()).execute("chicken", "vegan", [])
+    assert result["substitute"] == "tempeh"
+    assert 0.5 < result["confidence"] <= 1.0
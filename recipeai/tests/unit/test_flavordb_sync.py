@@ -0,0 +1,96 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from recipeai.adapters.flavordb.client import FlavorDBClient
+from recipeai.adapters.flavordb.compound_parser import parse_compounds
+from recipeai.adapters.flavordb.fake_server import FakeFlavorDBServer
+from recipeai.adapters.flavordb.store import FlavorStore
+from recipeai.adapters.flavordb.sync import sync_flavordb
+
+ENTITIES = [f"ingredient {i}" for i in range(45)]
+
+
+def _sync(url, store):
+    async def run():
+        client = FlavorDBClient(url)
+        try:
+            return await sync_flavordb(client, store, concurrency=4, page_size=10)
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+
+def test_parse_compounds_builds_note_shares():
+    parsed = parse_compounds({"entity": "Basil", "version": 3, "molecules": [
+        {"pubchem_id": "1", "common_name": "linalool", "flavor_profile": "floral@Sweet"},
+        {"pubchem_id": 2, "common_name": "eugenol", "flavor_profile": "spicy@sweet"},
+    ]})
+    assert parsed["name"] == "basil" and parsed["version"] == 3
+    assert parsed["flavor_profile"] == {"floral": 0.5, "spicy": 0.5, "sweet": 1.0}
+
+
+def test_incremental_sync_and_local_lookup(tmp_path):
+    store = FlavorStore(tmp_path / "flavor.sqlite")
+    with FakeFlavorDBServer(ENTITIES) as server:
+        first = _sync(server.url, store)
+        assert (first["pages"], first["fetched"]) == (5, 45)
+
+        assert _sync(server.url, store)["fetched"] == 0
+
+        server.touch("ingredient 3")
+        server.touch("new ingredient")
+        delta = _sync(server.url, store)
+        assert delta["fetched"] == 2 and delta["start_watermark"] == first["watermark"]
+
+    assert len(store) == 46
+    profile = store.get_flavor_profile("Ingredient 3")
+    assert profile and all(0 < w <= 1 for w in profile.values())
+    assert store.get_flavor_profile("unknown") == {}
+
+
+def test_sync_resumes_from_committed_watermark(tmp_path):
+    store = FlavorStore(tmp_path / "flavor.sqlite")
+    with FakeFlavorDBServer(ENTITIES) as server:
+        store.upsert([], watermark=20)  # as if a previous run stopped after two pages
+        stats = _sync(server.url, store)
+    assert stats["fetched"] == 25
+
+
+def test_close_closes_every_thread_connection(tmp_path):
+    store = FlavorStore(tmp_path / "flavor.sqlite")
+    opened = []
+    worker = threading.Thread(target=lambda: opened.append(store._conn()))
+    worker.start()
+    worker.join()
+    main = store._conn()
+    store.close()
+    for conn in (main, *opened):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert len(store) == 0  # reopens lazily
+
+
+def test_sync_keeps_entities_sharing_a_version_across_pages(tmp_path):
+    store = FlavorStore(tmp_path / "flavor.sqlite")
+    with FakeFlavorDBServer(ENTITIES[:5]) as server:
+        server.touch(*(f"batch {i}" for i in range(25)))
+        stats = _sync(server.url, store)
+        assert _sync(server.url, store)["fetched"] == 0
+    assert stats["fetched"] == 30 and len(store) == 30
+
+
+def test_sync_matches_mixed_case_feed_names_and_applies_deletes(tmp_path):
+    store = FlavorStore(tmp_path / "flavor.sqlite")
+    with FakeFlavorDBServer(["Basil", "Tomato", "Olive Oil"]) as server:
+        _sync(server.url, store)
+        store.upsert([], watermark=0)  # replay the whole feed
+        assert _sync(server.url, store)["fetched"] == 0
+
+        assert store.get_flavor_profile("Tomato")
+        server.remove("Tomato")
+        stats = _sync(server.url, store)
+    assert (stats["fetched"], stats["deleted"]) == (0, 1)
+    assert len(store) == 2 and store.get_flavor_profile("tomato") == {}
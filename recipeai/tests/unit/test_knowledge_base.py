@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from recipeai import metrics
+from recipeai.ai_pipeline.vector_store import save_vectors
+from recipeai.application.customize_recipe import CustomizeRecipe
+from recipeai.application.knowledge_base import KnowledgeBaseStore
+
+
+def _write(directory, name, data):
+    (directory / name).write_text(json.dumps(data))
+
+
+@pytest.fixture
+def knowledge_dir(tmp_path):
+    _write(tmp_path, "allergen_map.json", {"Dairy": ["Milk", "butter"], "nuts": ["peanuts"]})
+    _write(tmp_path, "substitution_rules.json", {"Butter": {"Vegan": ["olive oil"]}})
+    _write(tmp_path, "recipes.json", [{"id": 1, "name": "Toast", "ingredients": ["butter"]}])
+    return tmp_path
+
+
+def test_snapshot_is_lowercased_and_read_only(knowledge_dir):
+    kb = KnowledgeBaseStore(knowledge_dir).current()
+
+    assert kb.allergens["dairy"] == frozenset({"milk", "butter"})
+    assert kb.allergen_index["peanuts"] == frozenset({"nuts"})
+    assert kb.substitution_rules["butter"]["vegan"] == ("olive oil",)
+    assert kb.recipes_by_id["1"]["name"] == "Toast"
+    with pytest.raises(TypeError):
+        kb.allergens["eggs"] = frozenset()
+
+
+def test_reload_swaps_snapshot_only_when_files_change(knowledge_dir):
+    store = KnowledgeBaseStore(knowledge_dir, check_interval=0)
+    first = store.current()
+    assert store.current() is first
+
+    path = knowledge_dir / "allergen_map.json"
+    _write(knowledge_dir, "allergen_map.json", {"soy": ["tofu"]})
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = store.current()
+    assert second.version == first.version + 1
+    assert "soy" in second.allergens and "dairy" in first.allergens
+
+
+def _touch(path, step=1_000_000):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + step))
+
+
+def test_threads_that_see_one_change_reload_once(knowledge_dir):
+    store = KnowledgeBaseStore(knowledge_dir, check_interval=0)
+    first = store.current()
+    _touch(knowledge_dir / "recipes.json")
+    barrier = threading.Barrier(8)
+
+    def check():
+        barrier.wait()
+        return store.reload_if_changed()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(check())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert {kb.version for kb in results} == {first.version + 1}
+
+
+def test_failed_reload_keeps_serving_the_previous_snapshot(knowledge_dir):
+    store = KnowledgeBaseStore(knowledge_dir, check_interval=0)
+    first = store.current()
+    failures = metrics.KNOWLEDGE_BASE_LOAD_FAILURES.labels().value
+    path = knowledge_dir / "allergen_map.json"
+    path.write_text('{"soy": ["to')  # a half-written file
+    _touch(path)
+    assert store.current() is first
+    assert metrics.KNOWLEDGE_BASE_LOAD_FAILURES.labels().value == failures + 1
+
+    _write(knowledge_dir, "allergen_map.json", {"soy": ["tofu"]})
+    _touch(path, 2_000_000)
+    assert store.current().version == first.version + 1
+
+
+def test_use_case_receives_injected_snapshot(knowledge_dir):
+    kb = KnowledgeBaseStore(knowledge_dir).current()
+    customizer = CustomizeRecipe(kb)
+    assert customizer.substitutor.execute("Butter", "vegan", [])["substitute"] == "olive oil"
+
+
+def test_rebuilding_a_model_turns_the_snapshot_over(knowledge_dir, tmp_path):
+    models = tmp_path / "models" / "vectors"
+    save_vectors(models, ["tofu"], np.ones((1, 2)))
+    store = KnowledgeBaseStore(knowledge_dir, check_interval=0, models=[models])
+    first = store.current()
+    assert store.current() is first
+    save_vectors(models, ["tofu", "tempeh"], np.ones((2, 2)))
+    assert store.current().version == first.version + 1
@@ -0,0 +1,51 @@
+import asyncio
+
+from recipeai.adapters.llm.cached_provider import CachedLLMProvider
+from recipeai.adapters.llm.completion_cache import CompletionCache
+from recipeai.adapters.llm.fake_provider import FakeLLMProvider
+
+
+def test_concurrent_identical_prompts_share_one_upstream_call():
+    async def scenario():
+        fake = FakeLLMProvider(latency=0.05)
+        provider = CachedLLMProvider(fake)
+        results = await asyncio.gather(*(provider.complete("vegan lasagna", temperature=0) for _ in range(50)))
+        again = await provider.complete("vegan lasagna", temperature=0)
+        other = await provider.complete("vegan lasagna", temperature=1)
+        return fake, provider, results, again, other
+
+    fake, provider, results, again, other = asyncio.run(scenario())
+    assert len(set(results)) == 1 and again == results[0]
+    assert other != again
+    assert fake.calls == 2
+    assert provider.stats()["coalesced"] == 49
+    assert provider.stats()["hits"] == 1
+    memory = provider.cache.memory
+    assert memory.hits + memory.misses == 52  # each lookup counted once
+
+
+def test_disk_store_survives_a_new_memory_cache(tmp_path):
+    async def complete(provider):
+        return await provider.complete("soup", model="m")
+
+    fake = FakeLLMProvider(latency=0)
+    first = asyncio.run(complete(CachedLLMProvider(fake, CompletionCache(disk_dir=tmp_path))))
+    restarted = CachedLLMProvider(fake, CompletionCache(disk_dir=tmp_path))
+    second = asyncio.run(complete(restarted))
+
+    assert first == second
+    assert fake.calls == 1
+    assert (restarted.stats()["hits"], restarted.stats()["misses"]) == (1, 0)
+
+
+def test_memory_cache_is_bounded_lru_with_ttl():
+    cache = CompletionCache(max_entries=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None and cache.get("a") == "1"
+
+    expired = CompletionCache(ttl=-1)
+    expired.set("a", "1")
+    assert expired.get("a") is None
@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from recipeai.api.main import app
+from recipeai.metrics import Registry
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    hits = registry.counter("demo_hits_total", "Demo hits.", ("route",))
+    latency = registry.histogram("demo_seconds", "Demo latency.", buckets=(0.1, 1.0))
+    registry.register_cache("demo", lambda: {"hits": 3, "misses": 1})
+
+    hits.labels("/a").inc()
+    hits.labels("/a").inc(2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    text = registry.render()
+    assert '# TYPE demo_hits_total counter' in text
+    assert 'demo_hits_total{route="/a"} 3' in text
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 2' in text
+    assert 'demo_seconds_count 2' in text
+    assert 'recipeai_cache_hits_total{cache="demo"} 3' in text
+
+
+def test_metrics_endpoint_reports_route_templates():
+    with TestClient(app) as client:
+        client.get("/api/recipes/42")
+        text = client.get("/metrics").text
+
+    assert 'route="/api/recipes/{recipe_id}"' in text
+    assert "recipeai_knowledge_base_loads_total" in text
+    assert "recipeai_http_requests_in_flight" in text
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from recipeai.adapters.nutrition.calculator import NutritionCalculator, parse_amount
+from recipeai.api.main import app
+from recipeai.core.entities.Recipe import Ingredient
+
+NUTRITION = {
+    "nutrients": ["calories", "protein_g"],
+    "per_100g": {"rice": [130, 2.7], "olive oil": [884, 0], "garlic": [149, 6.4]},
+}
+CONVERSIONS = {
+    "default_grams": 100,
+    "mass_grams": {"g": 1, "kg": 1000},
+    "volume_ml": {"tbsp": 15, "cup": 240},
+    "density_g_per_ml": {"default": 1.0, "olive oil": 0.9},
+    "piece_grams": {"default": {"": 100}, "garlic": {"clove": 3}},
+}
+
+
+@pytest.fixture
+def calc():
+    return NutritionCalculator(NUTRITION, CONVERSIONS)
+
+
+def test_unit_conversion_uses_density_and_piece_weights(calc):
+    assert calc.grams("rice", "0.5", "kg") == 500
+    assert calc.grams("olive oil", "2", "tbsp") == pytest.approx(27.0)
+    assert calc.grams("rice", "1", "cup") == 240
+    assert calc.grams("garlic", "3", "cloves") == 9  # plural units are canonicalized
+    assert calc.grams("garlic", "3", "heads") == 300  # unknown unit: one default portion each
+    assert calc.grams("rice", "1-3", "cups") == 480
+    assert calc.grams("olive oil", "½ cup") == pytest.approx(108.0)
+    assert calc.grams("Garlic", "1 1/2", "clove") == pytest.approx(4.5)
+    assert calc.grams("rice") == 100
+    assert parse_amount("1/2") == 0.5 and parse_amount("a pinch") is None
+
+
+def test_batch_matches_per_ingredient_sums(calc):
+    recipes = [
+        [Ingredient("rice", "200", "g", []), Ingredient("olive oil", "1", "tbsp", [])],
+        [{"name": "garlic", "quantity": "2", "unit": "clove"}, "unicorn"],
+        [],
+    ]
+    totals, unknown = calc.totals(recipes)
+    expected = np.array([
+        [1.3 * 200 + 8.84 * 13.5, 0.027 * 200],
+        [1.49 * 6, 0.064 * 6],
+        [0, 0],
+    ])
+    np.testing.assert_allclose(totals, expected)
+    assert unknown == [[], ["unicorn"], []]
+    assert calc.estimate(recipes[0])["calories"] == round(expected[0, 0], 1)
+    assert calc.get_nutrition("rice") == {"calories": 130.0, "protein_g": 2.7}
+
+    unknown[1].append("mutated")
+    again, unknown = calc.totals(recipes)
+    np.testing.assert_allclose(again, expected)
+    assert unknown == [[], ["unicorn"], []]
+    assert calc.encoded.stats()["misses"] == 3  # each ingredient list was encoded once
+
+
+def test_compare_batch_reports_delta(calc):
+    original = [Ingredient("rice", "100", "g", []), Ingredient("olive oil", "2", "tbsp", [])]
+    lighter = [Ingredient("rice", "100", "g", [])]
+    [result] = calc.compare_batch([(original, lighter)])
+    assert result["delta"]["calories"] == round(result["after"]["calories"] - result["before"]["calories"], 1)
+    assert result["delta"]["calories"] < 0
+
+
+def test_customize_can_include_nutrition_delta():
+    with TestClient(app) as client:
+        plain = client.post("/api/customize/", json={"recipe_id": "1", "dietary_type": "vegan"}).json()
+        assert plain["nutrition"] is None
+        body = client.post(
+            "/api/customize/", json={"recipe_id": "1", "dietary_type": "vegan", "include_nutrition": True}
+        ).json()
+    nutrition = body["nutrition"]
+    assert nutrition["before"]["calories"] > 0 and nutrition["before"]["unknown_ingredients"] == []
+    assert nutrition["delta"]["protein_g"] == round(
+        nutrition["after"]["protein_g"] - nutrition["before"]["protein_g"], 1
+    )
@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from recipeai.ai_pipeline.orchestrator import INLINE, Orchestrator, Stage, StageFailed
+
+
+def _sleep_then(value, seconds=0.2):
+    def run(*_):
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def test_default_pipeline_runs_every_stage():
+    result = Orchestrator().run("make it vegan")
+    assert result["enriched"]["enriched"] is True
+    assert result["valid"] is True
+    assert set(result["timings"]) == {
+        "intent", "enrichment", "nutrition", "substitution",
+        "transformation", "seasoning", "instructions", "validation",
+    }
+
+
+def test_independent_stages_overlap():
+    # Both stages must be inside their bodies at once to pass the barrier, so
+    # serial execution fails deterministically instead of by a wall-clock margin.
+    barrier = threading.Barrier(2, timeout=2.0)
+    spans = {}
+
+    def meet(name, value):
+        def run(*_):
+            started = time.perf_counter()
+            barrier.wait()
+            spans[name] = (started, time.perf_counter())
+            return value
+        return run
+
+    stages = [
+        Stage("a", meet("a", 1), ("user_input",), ("a",)),
+        Stage("b", meet("b", 2), ("user_input",), ("b",)),
+        Stage("sum", lambda a, b: a + b, ("a", "b"), ("total",), INLINE),
+    ]
+    orchestrator = Orchestrator(stages, inputs=("user_input",))
+
+    result = orchestrator.run("x")
+
+    assert result["total"] == 3
+    (a_start, a_end), (b_start, b_end) = spans["a"], spans["b"]
+    assert a_start < b_end and b_start < a_end
+    assert set(result["timings"]) == {"a", "b", "sum"}
+
+
+def test_stage_timeout_and_graph_validation():
+    slow = Stage("slow", _sleep_then(1, 0.3), ("user_input",), ("out",), timeout=0.05)
+    with pytest.raises(StageFailed) as excinfo:
+        Orchestrator([slow], inputs=("user_input",)).run("x")
+    assert excinfo.value.timings["slow"]["status"] == "timeout"
+
+    with pytest.raises(ValueError):
+        Orchestrator([Stage("orphan", _sleep_then(1), ("missing",), ("out",))], inputs=())
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from recipeai.ai_pipeline.pairing_matrix import PairingMatrix
+from recipeai.ai_pipeline.vector_store import IngredientVectors, save_vectors
+from recipeai.application.knowledge_base import get_knowledge_base
+from recipeai.application.substitute_ingredient import SubstituteIngredient
+
+NAMES = ["tofu", "tempeh", "chickpeas", "chicken", "rice", "soy sauce", "tomato", "spices"]
+RECIPES = [
+    ["tofu", "rice", "soy sauce"],
+    ["chicken", "rice", "soy sauce"],
+    ["chickpeas", "tomato", "spices"],
+    ["chicken", "tomato", "spices", "rice"],
+    ["tempeh", "rice"],
+]
+
+
+def _matrix(tmp_path):
+    save_vectors(tmp_path / "vectors", NAMES, np.eye(len(NAMES)))
+    vectors = IngredientVectors(tmp_path / "vectors")
+    return PairingMatrix.from_recipes(RECIPES, vectors), vectors
+
+
+def test_csr_is_symmetric_and_scores_match_a_dense_gather(tmp_path):
+    matrix, _ = _matrix(tmp_path)
+    n = len(NAMES)
+    dense = np.zeros((n, n))
+    for row in range(n):
+        for pos in range(matrix.indptr[row], matrix.indptr[row + 1]):
+            dense[row, matrix.indices[pos]] = matrix.data[pos]
+    np.testing.assert_allclose(dense, dense.T)
+    assert matrix.pairing(0, 4) == dense[0, 4]
+
+    candidates = np.array([0, 1, 2, 3])
+    context = np.array([4, 5, 6])
+    np.testing.assert_allclose(matrix.score(candidates, context), dense[candidates][:, context].sum(axis=1), rtol=1e-6)
+    assert matrix.score(candidates, np.array([], dtype=np.int64)).tolist() == [0, 0, 0, 0]
+
+
+def test_save_and_load_memory_maps(tmp_path):
+    matrix, vectors = _matrix(tmp_path)
+    matrix.save(tmp_path / "pairing")
+    loaded = PairingMatrix.load(tmp_path / "pairing", vectors)
+    assert isinstance(loaded.data, np.memmap) and loaded.nnz == matrix.nnz
+    np.testing.assert_allclose(
+        loaded.score_names(["tofu", "chickpeas", "unknown"], ["soy sauce", "tomato", "nope"]),
+        matrix.score_names(["tofu", "chickpeas", "unknown"], ["soy sauce", "tomato", "nope"]),
+    )
+
+
+def test_substitute_follows_recipe_context_and_is_memoized(tmp_path):
+    matrix, _ = _matrix(tmp_path)
+    substitutor = SubstituteIngredient(get_knowledge_base(), pairing=matrix)
+
+    asian = substitutor.execute("chicken", "vegan", ["chicken", "rice", "soy sauce"])
+    stew = substitutor.execute("chicken", "vegan", ["chicken", "tomato", "spices"])
+    assert asian["substitute"] == "tofu" and stew["substitute"] == "chickpeas"
+    assert "pairs well" in stew["reason"]
+    assert substitutor.execute("chicken", "vegan", [])["substitute"] == "tofu"
+
+    substitutor.execute("Chicken", "vegan", ["spices", "tomato", "chicken"])
+    assert substitutor.memo.stats()["hits"] == 1
+
+
+def test_shipped_models_resolve_once_per_snapshot(monkeypatch):
+    kb = get_knowledge_base()
+    first = SubstituteIngredient(kb)
+    monkeypatch.setattr("pathlib.Path.stat", lambda *a, **k: (_ for _ in ()).throw(AssertionError("stat")))
+    again = SubstituteIngredient(kb)
+    assert again.pairing is first.pairing is kb.pairing and again.neighbours is kb.ann_index
+
+
+def test_load_refuses_a_reordered_vector_store(tmp_path):
+    matrix, _ = _matrix(tmp_path)
+    matrix.save(tmp_path / "pairing")
+    save_vectors(tmp_path / "vectors", NAMES[::-1], np.eye(len(NAMES)))
+    with pytest.raises(ValueError):
+        PairingMatrix.load(tmp_path / "pairing", IngredientVectors(tmp_path / "vectors"))
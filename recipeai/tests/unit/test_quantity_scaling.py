@@ -0,0 +1,57 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from recipeai.api.main import app
+from recipeai.core.domain_services.QuantityParser import Quantity, format_amount, parse_quantity
+
+
+@pytest.mark.parametrize("quantity, unit, expected", [
+    ("200", "g", Quantity(200.0, 200.0, "g")),
+    ("1/2", "cups", Quantity(0.5, 0.5, "cup")),
+    ("1 1/2", "", Quantity(1.5, 1.5, "")),
+    ("1½", "tbsp", Quantity(1.5, 1.5, "tbsp")),
+    ("¾ cup", "", Quantity(0.75, 0.75, "cup")),
+    ("2-3", "cloves", Quantity(2.0, 3.0, "clove")),
+    ("2 to 3 Tablespoons", "", Quantity(2.0, 3.0, "tbsp")),
+    ("a pinch", "", Quantity(1.0, 1.0, "pinch")),
+    ("to taste", "", Quantity(None, None, "")),
+])
+def test_parse_quantity(quantity, unit, expected):
+    assert parse_quantity(quantity, unit) == expected
+
+
+def test_format_amount():
+    assert format_amount(1.5) == "1 1/2"
+    assert format_amount(0.3333) == "1/3"
+    assert format_amount(0.3) == "0.3"
+    assert format_amount(12.5, decimal=True) == "12.5"
+
+
+def test_scale_endpoint_scales_ranges_and_converts_units():
+    body = {
+        "units": "metric",
+        "recipes": [
+            {
+                "ingredients": [
+                    {"name": "flour", "quantity": "1 1/2", "unit": "cups"},
+                    {"name": "garlic", "quantity": "2-3", "unit": "cloves"},
+                    {"name": "salt", "quantity": "to taste"},
+                ],
+                "servings": 2,
+                "target_servings": 6,
+            },
+            {"recipe_id": "1", "servings": 4, "target_servings": 2},
+        ],
+    }
+    with TestClient(app) as client:
+        response = client.post("/api/recipes/scale", json=body)
+        missing = client.post("/api/recipes/scale", json={"recipes": [{"recipe_id": "nope", "target_servings": 2}]})
+    assert response.status_code == 200
+    first, second = response.json()["recipes"]
+    assert first["factor"] == 3
+    flour, garlic, salt = first["ingredients"]
+    assert (flour["amount"], flour["unit"], flour["quantity"]) == (1.08, "l", "1.08")
+    assert (garlic["quantity"], garlic["unit"], garlic["amount_max"]) == ("6-9", "clove", 9.0)
+    assert salt == {"name": "salt", "quantity": "to taste", "unit": "", "amount": None, "amount_max": None}
+    assert second["recipe_id"] == "1" and second["factor"] == 0.5
+    assert missing.status_code == 404
@@ -0,0 +1,115 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from recipeai.api.main import app
+from recipeai.application.knowledge_base import get_knowledge_base
+from recipeai.core.domain_services.CategoryRegistry import category_mask
+from recipeai.core.domain_services.DietaryEngine import DietaryEngine, allergen_mask
+from recipeai.core.domain_services.RecipeSearchIndex import RecipeSearchIndex
+
+RECIPES = [
+    {"id": "1", "name": "Chicken Pasta", "cuisine": "Italian",
+     "ingredients": ["chicken", "pasta", "parmesan"], "dietary_tags": []},
+    {"id": "2", "name": "Chickpea Curry", "cuisine": "Indian",
+     "ingredients": ["chickpeas", "tomato"], "dietary_tags": ["vegan", "gluten-free"]},
+    {"id": "3", "name": "Pesto Pasta", "cuisine": "Italian",
+     "ingredients": ["pasta", "basil", "parmesan"], "dietary_tags": ["vegetarian"]},
+]
+
+
+def _ids(result):
+    return [r["id"] for r in result["recipes"]]
+
+
+def test_name_prefix_matches_any_name_token():
+    index = RecipeSearchIndex(RECIPES)
+    assert _ids(index.search("chick")) == ["1", "2"]
+    assert _ids(index.search("pasta")) == ["1", "3"]
+    assert _ids(index.search("chicken pa")) == ["1"]
+    assert _ids(index.search("pa chick")) == ["1"]
+
+
+def test_name_match_start_keeps_whole_name_prefix():
+    index = RecipeSearchIndex(RECIPES)
+    assert _ids(index.search("chick", name_match="start")) == ["1", "2"]
+    assert _ids(index.search("pasta", name_match="start")) == []
+    assert _ids(index.search("Chicken Pa", name_match="start")) == ["1"]
+    assert _ids(index.search(" pesto ", name_match="start")) == ["3"]
+    with pytest.raises(ValueError):
+        index.search("pasta", name_match="tokens")
+
+
+def test_filters_and_or():
+    index = RecipeSearchIndex(RECIPES)
+    assert _ids(index.search(ingredients=["pasta", "basil"])) == ["3"]
+    assert _ids(index.search(ingredients=["basil", "tomato"], match="any")) == ["2", "3"]
+    assert _ids(index.search(cuisines=["italian"], tags=["Vegetarian"])) == ["3"]
+
+
+def test_pagination_reports_total():
+    index = RecipeSearchIndex(RECIPES)
+    result = index.search(cuisines=["Italian", "Indian"], offset=1, limit=1)
+    assert result["total"] == 3
+    assert _ids(result) == ["2"]
+    assert index.search(offset=2)["total"] == 3
+
+
+def test_dietary_engine_composes_diets_and_allergens():
+    engine = DietaryEngine.from_config({
+        "vegan": {"blocked_categories": ["meat", "dairy"], "allowed_categories": ["vegan", "grain"]},
+        "gluten-free": {"blocked_categories": [], "allowed_categories": ["grain"], "blocked_allergens": ["gluten"]},
+    })
+    combined = engine.compose(["vegan", "gluten-free"], allergens=["nuts"])
+    assert combined.blocked_categories == ["dairy", "meat"]
+    assert combined.allowed_categories == ["grain"]
+    assert combined.blocked_allergens == ["gluten", "nuts"]
+    assert engine.blocked_mask(["Vegan", "gluten-free"], ["nuts"]) == (
+        category_mask(["meat", "dairy"]) | allergen_mask(["gluten", "nuts"])
+    )
+    with pytest.raises(ValueError):
+        engine.blocked_mask(["keto"])
+
+
+def test_blocked_mask_filters_corpus():
+    masks = {"chicken": category_mask(["meat"]), "parmesan": category_mask(["dairy"]) | allergen_mask(["dairy"])}
+    index = RecipeSearchIndex(RECIPES, lambda name: masks.get(name, 0))
+    vegan = category_mask(["meat", "dairy"])
+    assert _ids(index.search(blocked=vegan)) == ["2"]
+    assert _ids(index.search(blocked=category_mask(["meat"]))) == ["2", "3"]
+    assert _ids(index.search("pasta", blocked=allergen_mask(["dairy"]))) == []
+    assert index.search(blocked=category_mask(["meat"]), limit=1)["total"] == 2
+
+
+def test_search_endpoint_filters_by_diet_and_allergens():
+    with TestClient(app) as client:
+        vegan = client.get("/api/recipes/search", params={"diet": ["vegan", "gluten-free"]}).json()
+        no_nuts = client.get("/api/recipes/search", params={"exclude_allergens": "nuts"}).json()
+        unknown = client.get("/api/recipes/search", params={"diet": "keto"})
+        everything = client.get("/api/recipes/search").json()
+    kb = get_knowledge_base()
+    blocked = kb.dietary.blocked_mask(["vegan", "gluten-free"])
+    for recipe in vegan["recipes"]:
+        assert not any(kb.diet_mask(name) & blocked for name in recipe["ingredients"])
+    assert 0 < vegan["total"] < everything["total"]
+    assert all(not any(kb.allergen_matcher.matches(n, ["nuts"]) for n in r["ingredients"]) for r in no_nuts["recipes"])
+    assert unknown.status_code == 422
+
+
+def test_gluten_free_excludes_wheat_based_recipes():
+    with TestClient(app) as client:
+        found = client.get("/api/recipes/search", params={"diet": "gluten-free", "limit": 100}).json()
+    names = {r["name"] for r in found["recipes"]}
+    for name in ("Chicken Pasta", "Pesto Pasta", "Avocado Toast", "Beef Tacos", "Falafel Wrap", "Veggie Stir Fry"):
+        assert name not in names
+    assert {"Chickpea Curry", "Kale Quinoa Bowl", "Grilled Salmon"} <= names
+
+
+def test_allowed_categories_override_allergen_hits_only():
+    engine = DietaryEngine.from_config({
+        "dairy-free": {"blocked_categories": ["dairy"], "allowed_categories": ["dairy-alternative"],
+                       "blocked_allergens": ["dairy"]},
+    })
+    alternative, dairy = category_mask(["dairy-alternative"]), category_mask(["dairy"])
+    assert not engine.violates("Dairy-Free", alternative, allergen_mask(["dairy"]))
+    assert engine.violates("dairy-free", 0, allergen_mask(["dairy"]))
+    assert engine.violates("dairy-free", alternative | dairy)
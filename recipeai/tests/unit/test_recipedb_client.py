@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from recipeai.adapters.recipedb.client import RecipeDBBatchError, RecipeDBClient
+from recipeai.adapters.recipedb.stub_server import RecipeDBStubServer
+from recipeai.core.entities.Recipe import Recipe
+
+CORPUS = [
+    {"id": str(i), "name": f"Recipe {i}", "cuisine": "Test",
+     "ingredients": ["rice", {"name": "tofu", "quantity": 200, "unit": "g"}],
+     "dietary_tags": ["vegan"]}
+    for i in range(1000)
+]
+
+
+def test_fetch_many_batches_round_trips():
+    async def scenario(url):
+        client = RecipeDBClient(url, batch_size=100, max_concurrency=4)
+        try:
+            recipes = await client.fetch_many([str(i) for i in range(1000)] + ["missing"])
+            again = await client.fetch("7")
+        finally:
+            await client.aclose()
+        return recipes, again
+
+    with RecipeDBStubServer(CORPUS) as server:
+        recipes, again = asyncio.run(scenario(server.url))
+        requests = server.requests
+
+    assert len(recipes) == 1000
+    assert requests == 11  # ceil(1001 ids / 100 per batch); "7" is then served from cache
+    assert isinstance(again, Recipe)
+    assert again.ingredients[1].quantity == "200" and again.ingredients[1].unit == "g"
+
+
+def test_transient_failures_are_retried_and_sync_port_works():
+    with RecipeDBStubServer(CORPUS, fail_every=2) as server:
+        client = RecipeDBClient(server.url, backoff=0.001)
+        try:
+            first = client.get("1")
+            second = client.get("2")
+            assert client.get("nope") is None
+        finally:
+            client.close()
+
+    assert (first.id, second.id) == ("1", "2")
+
+
+def test_unknown_ids_are_negatively_cached_in_every_path():
+    async def scenario(url):
+        client = RecipeDBClient(url)
+        try:
+            assert await client.fetch("ghost") is None
+            first = await client.fetch_many(["1", "ghost", "phantom"])
+            second = await client.fetch_many(["1", "ghost", "phantom"])
+            assert await client.fetch("phantom") is None
+        finally:
+            await client.aclose()
+        return first, second
+
+    with RecipeDBStubServer(CORPUS) as server:
+        first, second = asyncio.run(scenario(server.url))
+        requests = server.requests
+        client = RecipeDBClient(server.url)
+        try:
+            assert client.get("nope") is None and client.get("nope") is None
+        finally:
+            client.close()
+        sync_requests = server.requests - requests
+
+    assert list(first) == list(second) == ["1"]
+    assert requests == 2  # one 404 for "ghost", one batch for "1" and "phantom"
+    assert sync_requests == 1
+
+
+def test_fetch_many_shares_inflight_loads_and_keeps_successful_batches():
+    async def scenario(server):
+        client = RecipeDBClient(server.url, batch_size=2, max_concurrency=1, retries=0)
+        try:
+            first, second = await asyncio.gather(client.fetch_many(["1", "2"]), client.fetch_many(["2", "1"]))
+            assert first == second and server.requests == 1
+
+            server.fail_every = 3  # request 3, the second batch below, fails
+            with pytest.raises(RecipeDBBatchError) as failure:
+                await client.fetch_many(["3", "4", "5", "6"])
+            assert list(failure.value.recipes) == ["3", "4"] and failure.value.failed_ids == ["5", "6"]
+
+            server.fail_every = 0
+            before = server.requests
+            recovered = await client.fetch_many(["3", "4", "5", "6"])
+            return list(recovered), server.requests - before
+        finally:
+            await client.aclose()
+
+    with RecipeDBStubServer(CORPUS) as server:
+        recovered, requests = asyncio.run(scenario(server))
+    assert recovered == ["3", "4", "5", "6"] and requests == 1
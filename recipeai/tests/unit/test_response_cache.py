@@ -0,0 +1,93 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from recipeai.adapters.recipestore.sqlite import SQLiteRecipeStore
+from recipeai.api.main import app
+from recipeai.api.middleware.response_cache import ResponseCacheMiddleware, normalize_query
+from recipeai.application.knowledge_base import get_knowledge_base
+from recipeai.application.recipe_store import RECIPE_DB_ENV, get_recipe_store
+
+
+def _counting_app(version):
+    inner = FastAPI()
+    calls = []
+
+    @inner.get("/api/recipes/search")
+    async def search(query: str = ""):
+        calls.append(query)
+        return {"query": query, "calls": len(calls)}
+
+    @inner.get("/api/recipes/{recipe_id}")
+    async def get_recipe(recipe_id: str):
+        calls.append(recipe_id)
+        raise HTTPException(status_code=404)
+
+    inner.add_middleware(ResponseCacheMiddleware, max_age=30, version=lambda: version[0], store_generation=lambda: None)
+    return inner, calls
+
+
+def test_repeat_queries_skip_the_handler_until_the_version_changes():
+    version = [1]
+    inner, calls = _counting_app(version)
+    client = TestClient(inner)
+    first = client.get("/api/recipes/search?query=pasta&limit=5")
+    again = client.get("/api/recipes/search?limit=5&query=pasta")
+    assert first.headers["x-cache"] == "MISS" and again.headers["x-cache"] == "HIT"
+    assert again.content == first.content and calls == ["pasta"]
+    assert first.headers["cache-control"] == "public, max-age=30"
+    assert first.headers["etag"].startswith('"') and first.headers["etag"] == again.headers["etag"]
+
+    version[0] = 2
+    assert client.get("/api/recipes/search?query=pasta&limit=5").headers["x-cache"] == "MISS"
+    assert calls == ["pasta", "pasta"]
+
+
+def test_if_none_match_gets_a_304():
+    inner, calls = _counting_app([1])
+    client = TestClient(inner)
+    etag = client.get("/api/recipes/search?query=x").headers["etag"]
+    for header in (etag, f'W/{etag}', f'"other", {etag}', "*"):
+        response = client.get("/api/recipes/search?query=x", headers={"If-None-Match": header})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["etag"] == etag
+    assert client.get("/api/recipes/search?query=x", headers={"If-None-Match": '"stale"'}).status_code == 200
+    assert calls == ["x"]
+
+
+def test_only_successful_gets_are_cached():
+    inner, calls = _counting_app([1])
+    client = TestClient(inner)
+    assert client.get("/api/recipes/nope").status_code == 404
+    response = client.get("/api/recipes/nope")
+    assert response.status_code == 404 and "x-cache" not in response.headers
+    assert calls == ["nope", "nope"]
+
+
+def test_normalize_query_sorts_pairs():
+    assert normalize_query(b"tag=b&ingredient=x&tag=a") == normalize_query(b"tag=a&tag=b&ingredient=x")
+    assert normalize_query(b"query=") == "query="
+
+
+def test_api_serves_recipe_routes_from_the_cache():
+    with TestClient(app) as client:
+        first = client.get("/api/recipes/search?query=curry")
+        second = client.get("/api/recipes/search?query=curry")
+        metrics = client.get("/metrics").text
+    assert second.headers["x-cache"] == "HIT" and second.json() == first.json()
+    assert 'cache="http_responses"' in metrics
+
+
+def test_reimporting_the_recipe_store_invalidates_entries(tmp_path, monkeypatch):
+    kb = get_knowledge_base()
+    path = tmp_path / "cached.sqlite"
+    seeded = SQLiteRecipeStore(path)
+    seeded.import_recipes(kb.recipes[:3], kb.diet_mask)
+    monkeypatch.setenv(RECIPE_DB_ENV, str(path))
+    with TestClient(app) as client:
+        client.get("/api/recipes/search")
+        get_recipe_store().check_interval = 0
+        assert client.get("/api/recipes/search").headers["x-cache"] == "HIT"
+        seeded.import_recipes(kb.recipes[3:5], kb.diet_mask)  # another writer, same file
+        fresh = client.get("/api/recipes/search")
+    seeded.close()
+    assert fresh.headers["x-cache"] == "MISS" and fresh.json()["total"] == 5
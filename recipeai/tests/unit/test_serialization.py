@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from recipeai.api import serialization
+from recipeai.api.main import app
+from recipeai.api.routes.customize import CustomizeResponse
+from recipeai.core.entities.Recipe import Ingredient, Recipe
+from recipeai.scripts import bench_serialization
+
+
+def test_encoders_emit_only_wire_fields():
+    recipe = Recipe("1", "Toast", [Ingredient("bread", "2", "slices", ["grain"])], ["Toast it"], "British", [])
+    assert serialization.encode_recipe(recipe) == {
+        "id": "1", "name": "Toast", "cuisine": "British", "instructions": ["Toast it"], "dietary_tags": [],
+        "ingredients": [{"name": "bread", "quantity": "2", "unit": "slices"}],
+    }
+    sub = {"original": "a", "substitute": "b", "reason": "r", "confidence": 0.5, "score": 3}
+    assert serialization.encode_substitution(sub) == {"original": "a", "substitute": "b", "reason": "r", "confidence": 0.5}
+
+
+def test_customize_body_matches_the_response_model():
+    with TestClient(app) as client:
+        response = client.post("/api/customize/", json={"recipe_id": "1", "dietary_type": "vegan", "include_nutrition": True})
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    assert CustomizeResponse(**body).model_dump(mode="json") == body
+    assert body["substitutions"] and body["nutrition"]["delta"]
+
+
+def test_msgpack_is_negotiated_by_accept():
+    msgpack = pytest.importorskip("msgpack")
+    request = {"recipe_id": "1", "dietary_type": "vegan"}
+    headers = {"Accept": "application/msgpack"}
+    with TestClient(app) as client:
+        plain = client.post("/api/customize/", json=request).json()
+        response = client.post("/api/customize/", json=request, headers=headers)
+        stream = client.post("/api/customize/batch", json={"recipe_ids": ["1", "2"], "profiles": [request]}, headers=headers)
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == plain
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(stream.content)
+    assert stream.headers["content-type"] == "application/msgpack"
+    assert [body["recipe_id"] for body in unpacker] == ["1", "2"]
+
+
+def test_media_type_respects_q_values(monkeypatch):
+    choose = serialization.media_type
+    assert choose(None) == choose("*/*") == choose("text/html") == serialization.JSON
+    assert choose("application/json, application/msgpack;q=0.1") == serialization.JSON
+    assert choose("application/json;q=0.5, application/x-msgpack") == serialization.MSGPACK
+    assert choose("application/msgpack, */*;q=0.8") == serialization.MSGPACK
+    assert choose("application/msgpack, application/json") == serialization.JSON
+    assert choose("application/msgpack;q=0") == serialization.JSON
+    monkeypatch.setattr(serialization, "msgpack", None)
+    assert choose("application/msgpack, */*;q=0.1") == serialization.JSON
+    with pytest.raises(HTTPException) as error:
+        choose("application/msgpack")
+    assert error.value.status_code == 406
+
+
+def test_batch_stream_is_still_ndjson():
+    with TestClient(app) as client:
+        response = client.post("/api/customize/batch", json={"recipe_ids": ["1", "2"], "profiles": [{"dietary_type": "vegan"}]})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["recipe_id"] for line in lines] == ["1", "2"]
+
+
+def test_bench_reports_every_encoder():
+    results = bench_serialization.run(rounds=2, profiles=2)
+    assert {"model+json", "direct"} <= set(results)
+    assert results["model+json"]["bytes"] == results["direct"]["bytes"]
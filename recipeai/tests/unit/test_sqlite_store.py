@@ -0,0 +1,133 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from recipeai.adapters.recipestore.sqlite import SQLiteRecipeStore
+from recipeai.api.main import app
+from recipeai.application.knowledge_base import get_knowledge_base
+from recipeai.application.recipe_store import RECIPE_DB_ENV, get_recipe_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    kb = get_knowledge_base()
+    store = SQLiteRecipeStore(tmp_path / "recipes.sqlite", kb.ingredient_categories)
+    store.import_recipes(kb.recipes, kb.diet_mask, batch_size=7)
+    yield store
+    store.close()
+
+
+def _ids(result):
+    return sorted(r["id"] for r in result["recipes"])
+
+
+def test_filters_match_the_in_memory_index(store):
+    kb = get_knowledge_base()
+    vegan = kb.dietary.blocked_mask(["vegan"], ["nuts"])
+    for criteria in (
+        {"ingredients": ["pasta"]},
+        {"ingredients": ["tofu", "rice"], "match": "any"},
+        {"cuisines": ["italian", "Indian"], "tags": ["vegetarian"]},
+        {"blocked": vegan},
+        {"ingredients": ["tomato"], "blocked": vegan},
+        {"query": "chicken", "name_match": "start"},
+        {"query": "P", "name_match": "start", "cuisines": ["italian"]},
+    ):
+        expected = kb.recipe_index.search(**criteria)
+        found = store.find(**criteria)
+        assert found["total"] == expected["total"], criteria
+        assert _ids(found) == _ids(expected), criteria
+
+
+def test_text_query_is_ranked_and_paged(store):
+    result = store.find("pasta", limit=2)
+    assert result["total"] == 3 and len(result["recipes"]) == 2
+    assert all("pasta" in r["name"].lower() for r in result["recipes"])  # name hits outrank ingredient-only hits
+    assert store.find("pas", offset=2)["recipes"][0]["id"] == store.find("pas")["recipes"][2]["id"]
+
+
+def test_import_upserts_recipedb_records(store):
+    store.import_recipes([{
+        "id": 6, "name": "Bean Tacos", "steps": ["Warm", "Fill"],
+        "ingredients": [{"name": "black beans", "quantity": 1, "unit": "cup"}, "tortillas"],
+    }])
+    recipe = store.get("6")
+    assert recipe.name == "Bean Tacos" and recipe.instructions == ["Warm", "Fill"]
+    assert (recipe.ingredients[0].quantity, recipe.ingredients[0].unit) == ("1", "cup")
+    assert store.find("beef")["total"] == 0 and store.find("tacos")["recipes"][0]["name"] == "Bean Tacos"
+    assert len(store) == len(get_knowledge_base().recipes)
+    assert store.get("missing") is None
+
+
+def test_threads_get_their_own_connections(store):
+    with ThreadPoolExecutor(4) as pool:
+        totals = list(pool.map(lambda _: store.find(ingredients=["pasta"])["total"], range(16)))
+    assert len(set(totals)) == 1 and len(store._connections) > 1
+
+
+def test_routes_use_the_configured_store(tmp_path, monkeypatch):
+    kb = get_knowledge_base()
+    path = tmp_path / "api.sqlite"
+    seeded = SQLiteRecipeStore(path)
+    seeded.import_recipes(kb.recipes[:5], kb.diet_mask)
+    seeded.close()
+    monkeypatch.setenv(RECIPE_DB_ENV, str(path))
+    with TestClient(app) as client:
+        assert client.get("/api/recipes/search").json()["total"] == 5
+        assert client.get(f"/api/recipes/{kb.recipes[0]['id']}").json()["name"] == kb.recipes[0]["name"]
+        assert client.get(f"/api/recipes/{kb.recipes[-1]['id']}").status_code == 404
+    monkeypatch.delenv(RECIPE_DB_ENV)
+    with TestClient(app) as client:
+        assert client.get(f"/api/recipes/{kb.recipes[-1]['id']}").status_code == 200
+
+
+def test_routes_handle_stores_without_diet_masks_and_scale_from_the_store(tmp_path, monkeypatch):
+    path = tmp_path / "plain.sqlite"
+    seeded = SQLiteRecipeStore(path)
+    seeded.import_recipes([{
+        "id": "db-1", "name": "Stored Stew", "servings": 2,
+        "ingredients": [{"name": "lentils", "quantity": "1", "unit": "cup"}],
+    }])
+    seeded.close()
+    monkeypatch.setenv(RECIPE_DB_ENV, str(path))
+    with TestClient(app) as client:
+        assert client.get("/api/recipes/search", params={"diet": "vegan"}).status_code == 422
+        scaled = client.post("/api/recipes/scale", json={"recipes": [{"recipe_id": "db-1", "target_servings": 4}]})
+    assert scaled.status_code == 200
+    assert scaled.json()["recipes"][0]["ingredients"][0]["quantity"] == "2"
+
+
+def test_diet_bits_written_by_another_instance_are_picked_up(tmp_path):
+    kb = get_knowledge_base()
+    vegan = kb.dietary.blocked_mask(["vegan"], [])
+    server = SQLiteRecipeStore(tmp_path / "shared.sqlite", check_interval=0)
+    first = SQLiteRecipeStore(tmp_path / "shared.sqlite")
+    second = SQLiteRecipeStore(tmp_path / "shared.sqlite")
+    with pytest.raises(ValueError):
+        server.find(blocked=vegan)
+    first.import_recipes(kb.recipes[:10], kb.diet_mask)
+    second.import_recipes(kb.recipes[10:], kb.diet_mask)  # its own layout was read before first's bits existed
+    try:
+        assert server.find(blocked=vegan)["total"] == kb.recipe_index.search(blocked=vegan)["total"]
+    finally:
+        for store in (server, first, second):
+            store.close()
+
+
+def test_diet_filters_refuse_masks_from_other_knowledge(tmp_path, monkeypatch):
+    kb = get_knowledge_base()
+    vegan = kb.dietary.blocked_mask(["vegan"], [])
+    path = tmp_path / "stale.sqlite"
+    seeded = SQLiteRecipeStore(path)
+    seeded.import_recipes(kb.recipes, kb.diet_mask, diet_source="older knowledge")
+    assert seeded.find(blocked=vegan, diet_source="older knowledge")["total"] > 0
+    with pytest.raises(ValueError, match="re-run import_recipes"):
+        seeded.find(blocked=vegan, diet_source=kb.diet_fingerprint)
+    monkeypatch.setenv(RECIPE_DB_ENV, str(path))
+    with TestClient(app) as client:
+        assert client.get("/api/recipes/search", params={"diet": "vegan"}).status_code == 422
+        seeded.import_recipes(kb.recipes, kb.diet_mask, diet_source=kb.diet_fingerprint)
+        get_recipe_store()._checked_at = 0.0
+        assert client.get("/api/recipes/search", params={"diet": "vegan"}).status_code == 200
+    seeded.close()
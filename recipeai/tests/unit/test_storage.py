@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from recipeai.storage import atomic_directory
+
+
+def _write(path, text):
+    with atomic_directory(path) as staging:
+        (staging / "meta.json").write_text(text)
+
+
+def test_publishing_flips_a_link_and_removes_the_old_version(tmp_path):
+    path = tmp_path / "store"
+    _write(path, "1")
+    first = path.resolve()
+    _write(path, "2")
+    assert path.is_symlink() and (path / "meta.json").read_text() == "2"
+    assert path.resolve().stat().st_mode & 0o777 == 0o755
+    assert not first.exists() and sorted(p.name for p in tmp_path.iterdir()) == sorted(["store", os.readlink(path)])
+
+
+def test_plain_directories_and_stale_leftovers_are_replaced(tmp_path):
+    path = tmp_path / "store"
+    path.mkdir()
+    (path / "meta.json").write_text("shipped")
+    (tmp_path / "store.old").mkdir()
+    _write(path, "rebuilt")
+    assert (path / "meta.json").read_text() == "rebuilt"
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(["store", os.readlink(path)])
+
+
+def test_a_failed_build_leaves_the_store_untouched(tmp_path):
+    path = tmp_path / "store"
+    _write(path, "1")
+    with pytest.raises(RuntimeError):
+        with atomic_directory(path) as staging:
+            (staging / "meta.json").write_text("partial")
+            raise RuntimeError
+    assert (path / "meta.json").read_text() == "1" and len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from recipeai.ai_pipeline.vector_store import IngredientVectors, _opened, load_vectors, save_vectors
+from recipeai.application.knowledge_base import get_knowledge_base
+from recipeai.scripts.build_vectors import build
+
+
+def test_round_trip_is_memory_mapped_and_read_only(tmp_path):
+    names = ["tofu", "oat milk", "chicken", "jalapeño"]
+    vectors = np.arange(12, dtype=np.float64).reshape(4, 3)
+    save_vectors(tmp_path / "vectors", names, vectors)
+
+    store = IngredientVectors(tmp_path / "vectors")
+    assert len(store) == 4 and store.dim == 3
+    assert isinstance(store.vectors, np.memmap) and not store.vectors.flags.writeable
+    assert list(store.names()) == names
+    assert store.row(" Chicken ") == 2 and "jalapeño" in store and "beef" not in store
+    np.testing.assert_array_equal(store.vector("oat milk"), [3, 4, 5])
+    assert store.rows(["tofu", "beef"]).tolist() == [0, -1]
+    assert store.matrix(["beef", "chicken"]).shape == (1, 3)
+
+
+def test_rebuild_swaps_store_and_shared_handle_follows(tmp_path):
+    path = tmp_path / "vectors"
+    save_vectors(path, ["a"], np.ones((1, 2)))
+    first = load_vectors(path)
+    assert load_vectors(path) is first
+
+    save_vectors(path, ["a", "b"], np.ones((2, 2)))
+    assert len(load_vectors(path)) == 2
+    assert not path.with_name("vectors.old").exists()
+    assert [key for key in _opened if key.parent == tmp_path] == [path]
+
+
+def test_save_rejects_mismatched_shapes(tmp_path):
+    with pytest.raises(ValueError):
+        save_vectors(tmp_path / "bad", ["a", "b"], np.ones((3, 2)))
+
+
+def test_build_covers_knowledge_vocabulary():
+    kb = get_knowledge_base()
+    names, vectors = build(kb, dim=16)
+    assert names == list(kb.vocabulary())
+    assert vectors.shape == (len(names), 16)
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-6)